@@ -0,0 +1,49 @@
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from core.artifact_store import artifact_store
+from utils.offload import run_blocking
+
+router = APIRouter()
+
+# 같은 ID 라도 삭제 후 다시 만들면 내용이 달라질 수 있으므로 immutable 대신 짧게 보관 후 재검증
+ARTIFACT_CACHE_CONTROL = "private, max-age=3600, must-revalidate"
+
+# 확장자별 다운로드 파일 이름 접두어
+_DOWNLOAD_PREFIXES = {".pptx": "presentation"}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+@router.api_route("/artifacts/{artifact_id}", methods=["GET", "HEAD"])
+async def download_artifact(artifact_id: str, request: Request):
+    """
+    생성된 결과물(PPT 등) 다운로드
+
+    Range 요청(이어받기, 부분 다운로드)과 If-Range 를 지원하고,
+    ETag 로 조건부 요청(If-None-Match)에 304 를 반환합니다.
+    """
+    artifact = await artifact_store.get(artifact_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="결과물을 찾을 수 없습니다.")
+
+    headers = {"ETag": artifact.etag, "Cache-Control": ARTIFACT_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, artifact.etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        stat_result = await run_blocking("artifacts", os.stat, artifact.path)
+    except FileNotFoundError:
+        # 조회 직후 삭제된 경우
+        raise HTTPException(status_code=404, detail="결과물을 찾을 수 없습니다.")
+
+    return FileResponse(
+        artifact.path,
+        stat_result=stat_result,
+        filename=f"{_DOWNLOAD_PREFIXES.get(artifact.suffix, 'artifact')}_{artifact.id[:12]}{artifact.suffix}",
+        headers=headers,
+    )
@@ -1,21 +1,48 @@
-from fastapi import APIRouter, Query, HTTPException, Body
+from fastapi import APIRouter, BackgroundTasks, Query, HTTPException, Body, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
-from typing import Optional
-from db.supabase import supabase
-from models.feedback import FeedbackCreate
-from models.feedback_stats import FeedbackStatsResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+from pydantic import ValidationError
+from config.logger import logger
+from core.alert_engine import alert_engine
+from core.feedback_tagger import feedback_tags
+from db.backend import FEEDBACK_PAGE_MAX, FEEDBACK_PAGE_SIZE
+from db.storage import storage
+from models.feedback import EmotionEnum, FeedbackCreate, FeedbackInDB
+from db.timeseries import BUCKETS, bucket_count
+from models.feedback_stats import FeedbackStatsResponse, FeedbackTimeseriesResponse
 import json
+import os
 
 router = APIRouter()
 
+# 일괄 제출 한 번에 받을 수 있는 최대 항목 수
+FEEDBACK_BULK_MAX_ITEMS = int(os.getenv("FEEDBACK_BULK_MAX_ITEMS", "10000"))
+
+# 시계열 조회 한 번에 만들 수 있는 최대 구간 수 (예: hour 단위로 1년은 초과)
+FEEDBACK_TIMESERIES_MAX_BUCKETS = int(os.getenv("FEEDBACK_TIMESERIES_MAX_BUCKETS", "2000"))
+
+# 비어 있는 emotion/keywords 를 서버에서 채울지 여부 (core/feedback_tagger.py)
+FEEDBACK_AUTO_TAG = os.getenv("FEEDBACK_AUTO_TAG", "true").lower() == "true"
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 # 피드백 제출 엔드포인트
 @router.post("/submit")
 async def submit_feedback(
+    background_tasks: BackgroundTasks,
     feedback: FeedbackCreate = Body(..., description="피드백 데이터")
 ) -> dict:
-    """새로운 피드백을 제출합니다."""
+    """
+    새로운 피드백을 제출합니다.
+
+    emotion/keywords 가 비어 있으면 먼저 저장해 응답한 뒤 백그라운드에서 태깅해 채웁니다.
+    """
     try:
-        result = await supabase.create_feedback(feedback)
+        result = await storage.create_feedback(feedback)
+        if FEEDBACK_AUTO_TAG and _needs_tags(feedback):
+            background_tasks.add_task(_tag_saved_feedback, result)
         return {
             "status": "success", 
             "message": "피드백이 성공적으로 저장되었습니다."
@@ -28,9 +55,182 @@ async def submit_feedback(
             detail="피드백 저장 중 오류가 발생했습니다."
         )
 
+# 피드백 일괄 제출 엔드포인트
+@router.post("/bulk")
+async def submit_feedbacks(request: Request) -> dict:
+    """
+    여러 피드백을 한 번에 제출합니다.
+
+    본문은 FeedbackCreate 객체의 JSON 배열, 또는 한 줄에 하나씩인 NDJSON
+    (Content-Type: application/x-ndjson, 스트리밍 업로드 가능) 입니다.
+    형식이 잘못된 항목과 저장에 실패한 항목은 입력 순서(index)와 함께 errors 로 반환합니다.
+    emotion/keywords 가 비어 있는 항목은 저장 전에 한꺼번에 태깅해 채웁니다.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_MEDIA_TYPES:
+        items = _ndjson_items(request)
+    else:
+        items = _json_array_items(request)
+
+    feedbacks: List[FeedbackCreate] = []
+    positions: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    received = 0
+
+    async for index, item in items:
+        received += 1
+        if received > FEEDBACK_BULK_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"한 번에 최대 {FEEDBACK_BULK_MAX_ITEMS}개까지 제출할 수 있습니다.")
+        try:
+            feedbacks.append(
+                FeedbackCreate.model_validate_json(item) if isinstance(item, (str, bytes))
+                else FeedbackCreate.model_validate(item)
+            )
+            positions.append(index)
+        except ValidationError as e:
+            errors.append({"index": index, "error": _validation_message(e)})
+
+    feedbacks = await _auto_tag(feedbacks)
+    try:
+        result = await storage.create_feedbacks(feedbacks) if feedbacks else {"inserted": 0, "errors": []}
+    except Exception:
+        raise HTTPException(status_code=500, detail="피드백 저장 중 오류가 발생했습니다.")
+
+    # create_feedbacks 의 index 는 유효한 항목 기준이므로 입력 순서로 되돌림
+    errors.extend({"index": positions[error["index"]], "error": error["error"]} for error in result["errors"])
+    errors.sort(key=lambda error: error["index"])
+
+    return {
+        "status": "success" if not errors else "partial",
+        "received": received,
+        "inserted": result["inserted"],
+        "failed": len(errors),
+        "errors": errors
+    }
+
+def _needs_tags(feedback: FeedbackCreate) -> bool:
+    return feedback.emotion is None or not feedback.keywords
+
+async def _tag_saved_feedback(feedback: FeedbackInDB) -> None:
+    """
+    저장된 단건 피드백의 비어 있는 emotion/keywords 를 채웁니다 (응답 후 백그라운드 작업).
+
+    같은 시기의 다른 제출과 묶어 태깅하며, 실패하면 태그 없이 둡니다.
+    """
+    try:
+        emotion, keywords = await feedback_tags.tag(feedback.content)
+        await storage.tag_feedback(
+            feedback,
+            emotion=emotion if feedback.emotion is None else None,
+            keywords=keywords if keywords and not feedback.keywords else None
+        )
+    except Exception as e:
+        logger.warning("피드백 자동 태깅 실패 (태그 없이 유지): %s", e)
+
+async def _auto_tag(feedbacks: List[FeedbackCreate]) -> List[FeedbackCreate]:
+    """
+    일괄 제출에서 emotion/keywords 가 비어 있는 피드백을 로컬 태거로 채웁니다 (클라이언트가 보낸 값은 유지).
+
+    저장 전에 한꺼번에 채우므로 일별 롤업과 통계에도 그대로 반영됩니다.
+    태깅에 실패해도 피드백은 태그 없이 저장합니다.
+    """
+    if not FEEDBACK_AUTO_TAG:
+        return feedbacks
+    targets = [i for i, feedback in enumerate(feedbacks) if _needs_tags(feedback)]
+    if not targets:
+        return feedbacks
+
+    texts = [feedbacks[i].content for i in targets]
+    try:
+        tags = await feedback_tags.tag_many(texts)
+    except Exception as e:
+        logger.warning("피드백 자동 태깅 실패 (%d건, 태그 없이 저장): %s", len(texts), e)
+        return feedbacks
+
+    tagged = list(feedbacks)
+    for i, (emotion, keywords) in zip(targets, tags):
+        update: Dict[str, Any] = {}
+        if tagged[i].emotion is None:
+            update["emotion"] = EmotionEnum(emotion)
+        if not tagged[i].keywords:
+            update["keywords"] = keywords
+        tagged[i] = tagged[i].model_copy(update=update)
+    return tagged
+
+async def _ndjson_items(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """NDJSON 본문을 받는 대로 한 줄씩 꺼냅니다 (빈 줄은 건너뜀)."""
+    buffer = b""
+    index = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, line
+                index += 1
+    if buffer.strip():
+        yield index, buffer
+
+async def _json_array_items(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 JSON 형식")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="피드백 객체의 배열이어야 합니다.")
+    for index, item in enumerate(body):
+        yield index, item
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+# 사용자 피드백 목록 엔드포인트 (마이페이지)
+@router.get("/users/{user_id}")
+async def list_user_feedbacks(
+    request: Request,
+    user_id: UUID,
+    limit: int = Query(FEEDBACK_PAGE_SIZE, ge=1, le=FEEDBACK_PAGE_MAX, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    fields: Optional[str] = Query(None, description="조회할 컬럼 (쉼표 구분, 예: id,content,created_at)"),
+    format: Optional[str] = Query(None, description="ndjson 이면 남은 전체 목록을 한 줄씩 스트리밍")
+):
+    """
+    사용자의 피드백을 최신순으로 조회합니다.
+
+    기본은 한 페이지와 다음 페이지 커서를 반환합니다.
+    format=ndjson (또는 Accept: application/x-ndjson) 이면 cursor 이후의 모든 피드백을
+    페이지 단위로 가져오면서 한 줄에 하나씩 스트리밍합니다.
+    """
+    columns = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    stream = format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", "")
+
+    try:
+        page = await storage.get_user_feedback_page(user_id, limit, cursor, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=500, detail="피드백 목록 조회 중 오류가 발생했습니다.")
+
+    if not stream:
+        return page
+
+    async def lines() -> AsyncIterator[str]:
+        for row in page["items"]:
+            yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        if page["next_cursor"]:
+            async for row in storage.iter_user_feedbacks(user_id, limit, columns, cursor=page["next_cursor"]):
+                yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 # 피드백 통계 조회 엔드포인트
 @router.get("/stats", response_model=FeedbackStatsResponse)
 async def get_feedback_stats(
+    request: Request,
+    response: Response,
     start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"),
     end_date: str = Query(..., description="종료일 (YYYY-MM-DD)"),
     user_id: Optional[str] = Query(None, description="사용자 ID (선택)")
@@ -45,11 +245,20 @@ async def get_feedback_stats(
             raise HTTPException(status_code=400, detail="잘못된 날짜 형식")
 
         # 통계 조회
-        stats = await supabase.get_feedback_stats(
+        entry = await storage.get_feedback_stats_entry(
             start_date=start,
             end_date=end,
             user_id=user_id
         )
+
+        # 대시보드 재조회 시 변경이 없으면 304
+        if entry.not_modified(request.headers):
+            return Response(status_code=304, headers=entry.headers())
+        response.headers.update(entry.headers())
+        stats = entry.value
+        # 전체 통계의 긍정 비율 규칙 평가 (사용자별 조회는 표본이 작아 제외)
+        if user_id is None:
+            await alert_engine.check_conditions("feedback_stats", stats)
         
         # 프론트엔드 형식에 맞게 데이터 변환
         recent_comments = [
@@ -72,9 +281,48 @@ async def get_feedback_stats(
             end_date=end_date
         )
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 피드백 시계열 통계 엔드포인트
+@router.get("/timeseries", response_model=FeedbackTimeseriesResponse)
+async def get_feedback_timeseries(
+    start_date: str = Query(..., description="시작일 (YYYY-MM-DD 또는 ISO 시각)"),
+    end_date: str = Query(..., description="종료일 (YYYY-MM-DD 또는 ISO 시각)"),
+    bucket: str = Query("day", description="구간 단위 (hour/day/week)"),
+    user_id: Optional[str] = Query(None, description="사용자 ID (선택)"),
+    fill_gaps: bool = Query(True, description="피드백이 없는 구간도 0 으로 채울지 여부")
+) -> FeedbackTimeseriesResponse:
+    """구간별 피드백 수, 긍정/부정 비율, 스킬별 건수를 한 번에 조회합니다 (차트용)."""
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"bucket 은 {', '.join(BUCKETS)} 중 하나여야 합니다.")
+    try:
+        start = datetime.fromisoformat(start_date)
+        end = datetime.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 날짜 형식")
+    if end < start:
+        raise HTTPException(status_code=400, detail="종료일이 시작일보다 앞섭니다.")
+    if bucket_count(start, end, bucket) > FEEDBACK_TIMESERIES_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"구간이 너무 많습니다 (최대 {FEEDBACK_TIMESERIES_MAX_BUCKETS}개). 기간을 줄이거나 더 큰 bucket 을 사용하세요."
+        )
+
+    try:
+        points = await storage.get_feedback_timeseries(start, end, bucket, user_id, fill_gaps)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return FeedbackTimeseriesResponse(
+        bucket=bucket,
+        start_date=start_date,
+        end_date=end_date,
+        points=points
+    )
+
 # 샘플 데이터 조회 엔드포인트
 @router.get("/sample", response_model=FeedbackStatsResponse)
 async def get_sample_stats() -> FeedbackStatsResponse:
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request, Response
 from datetime import datetime
 from typing import Optional
-from db.supabase import supabase
+from db.storage import storage
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -16,6 +16,8 @@ class FeedbackStatsResponse(BaseModel):
 
 @router.get("/stats", response_model=FeedbackStatsResponse)
 async def get_feedback_stats(
+    request: Request,
+    response: Response,
     start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"),
     end_date: str = Query(..., description="종료일 (YYYY-MM-DD)"),
     user_id: Optional[str] = Query(None, description="사용자 ID (선택)")
@@ -32,12 +34,18 @@ async def get_feedback_stats(
             raise HTTPException(status_code=400, detail="잘못된 날짜 형식")
 
         # 통계 조회
-        stats = await supabase.get_feedback_stats(
+        entry = await storage.get_feedback_stats_entry(
             start_date=start,
             end_date=end,
             user_id=user_id
         )
 
+        # 대시보드 재조회 시 변경이 없으면 304
+        if entry.not_modified(request.headers):
+            return Response(status_code=304, headers=entry.headers())
+        response.headers.update(entry.headers())
+        stats = entry.value
+
         # 프론트엔드 형식에 맞게 데이터 변환
         recent_comments = [
             {
@@ -57,5 +65,7 @@ async def get_feedback_stats(
             end_date=end_date
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,18 +1,47 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import asyncio
+import json
+import os
+import re
+import time
+from fastapi import FastAPI, HTTPException, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
-from config.logger import logger
+from config.logger import logger, throttled
 from api.feedback import router as feedback_router
 from api.feedback_stats import router as feedback_stats_router
 from api.summarize import router as summarize_router
+from api.artifacts import router as artifacts_router
 from core.prompt_engine import PromptEngine
+from core.alert_engine import alert_engine
+from core.base_skill import InvalidInput
+from core.loop_monitor import loop_monitor
+from core.tracing import start_span
+from core.deadline import (
+    TIMEOUT_HEADER, ClientDisconnected, DeadlineExceeded,
+    cancel_on_disconnect, deadline_scope, resolve_timeout
+)
+from core.transcription import TranscriptionBusy, UnknownTier, transcription_pool
+from core.transcript_cache import transcript_cache
+from core.ppt_render import ppt_render_pool
+from core.artifact_store import artifact_store
+from core.feedback_tagger import feedback_tags
+from utils.offload import pool_stats, shutdown_pools
+from utils.uploads import (
+    MULTIPART_OVERHEAD, UPLOAD_CHUNK_SIZE, VOICE_UPLOAD_MAX_BYTES, MalformedUpload, SpooledUpload,
+    UploadNotFound, UploadOffsetMismatch, UploadTooLarge, open_multipart_file, safe_suffix, spool_stream,
+    upload_sessions
+)
+from db.stats_cache import stats_cache
+from db.storage import storage
 from skills.summarizer import Summarizer
 from skills.ppt_writer import PPTWriter
 from skills.field_reporter import FieldReporter
 from skills.checklist_extractor import ChecklistExtractor
 from skills.voice_memo_summarizer import VoiceMemoSummarizer
-from skills.logis_summarizer import execute as logis_execute
+from skills.logis_summarizer import LogisSummarizer, drain_deliveries
 
 app = FastAPI()
 
@@ -25,10 +54,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+_TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청마다 상관관계 ID(트레이스 ID)를 만들고 루트 스팬으로 전체 처리 시간을 기록"""
+    incoming = request.headers.get("X-Request-ID", "").lower()
+    trace_id = incoming if _TRACE_ID_PATTERN.match(incoming) else None
+
+    with start_span(
+        f"{request.method} {request.url.path}",
+        trace_id=trace_id,
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            response.headers["X-Request-ID"] = span.trace_id
+        return response
+
+# 시작 시 음성 인식 워커를 미리 띄워 모델을 올려 둘지 여부
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "true").lower() == "true"
+# 시작 시 PPT 렌더링 워커를 미리 띄워 템플릿을 파싱해 둘지 여부
+PPT_PRELOAD = os.getenv("PPT_PRELOAD", "true").lower() == "true"
+
+@app.on_event("startup")
+async def start_monitoring():
+    """이벤트 루프 블로킹 감지 시작, 업로드 임시 파일/기간 지난 결과물 정리, 음성 인식/PPT 렌더링 워커 예열"""
+    loop_monitor.start()
+    # 지난 실행에서 남은 업로드 임시 파일 정리
+    upload_sessions.purge_expired(force=True)
+    await artifact_store.evict()
+    if WHISPER_PRELOAD:
+        asyncio.create_task(_warm_transcription_pool())
+    if PPT_PRELOAD:
+        asyncio.create_task(_warm_ppt_render_pool())
+
+async def _warm_transcription_pool():
+    try:
+        await transcription_pool.start()
+    except Exception as e:
+        logger.warning("음성 인식 워커 예열 실패 (첫 요청 시 다시 시도): %s", e)
+
+async def _warm_ppt_render_pool():
+    try:
+        await ppt_render_pool.start()
+    except Exception as e:
+        logger.warning("PPT 렌더링 워커 예열 실패 (첫 요청 시 다시 시도): %s", e)
+
+@app.on_event("shutdown")
+async def stop_monitoring():
+    await loop_monitor.stop()
+    # 스레드 풀을 닫기 전에 남은 물류 요약 시트/Slack 전달을 잠시 기다림
+    await drain_deliveries()
+    await storage.aclose()
+    shutdown_pools()
+    transcription_pool.shutdown()
+    transcript_cache.close()
+    ppt_render_pool.shutdown()
+
 # 라우터 추가
 app.include_router(feedback_router, prefix="/feedback", tags=["feedback"])
 app.include_router(feedback_stats_router, prefix="/feedback", tags=["feedback"])
 app.include_router(summarize_router, tags=["summarize"])
+app.include_router(artifacts_router, tags=["artifacts"])
 
 # PromptEngine 및 스킬 초기화
 prompt_engine = PromptEngine()
@@ -38,7 +127,7 @@ skills = {
     "field_reporter": FieldReporter(prompt_engine),
     "checklist_extractor": ChecklistExtractor(prompt_engine),
     "voice_memo_summarizer": VoiceMemoSummarizer(prompt_engine),
-    "logis_summarizer": None  # 기존 스킬은 별도로 처리
+    "logis_summarizer": LogisSummarizer(prompt_engine)
 }
 
 class ExecuteRequest(BaseModel):
@@ -52,7 +141,7 @@ class ExecuteResponse(BaseModel):
     status: str = "success"
 
 @app.post("/execute", response_model=ExecuteResponse)
-async def execute_skill(req: ExecuteRequest):
+async def execute_skill(req: ExecuteRequest, request: Request, stream: bool = False):
     """
     스킬 실행 엔드포인트
 
@@ -62,28 +151,30 @@ async def execute_skill(req: ExecuteRequest):
     - field_reporter: 현장 보고서 작성
     - checklist_extractor: 체크리스트 추출
     - voice_memo_summarizer: 음성 메모 요약
-    - logis_summarizer: 물류 요약 (레거시)
+    - logis_summarizer: 물류 요약 (additional_params.delivery: wait | background)
+
+    시간 예산은 X-Request-Timeout 헤더(초) 또는 스킬별 기본값을 사용하며,
+    클라이언트 연결이 끊기면 진행 중인 작업을 취소합니다.
+
+    stream=true 이면 중간 결과를 지원하는 스킬(ppt_writer 의 슬라이드, checklist_extractor 의 카테고리,
+    voice_memo_summarizer 의 구간 전사)은 완성되는 대로 한 줄씩(application/x-ndjson) 내보내고
+    마지막 줄에 {"event": "result", ...} 를 보냅니다.
 
     API 문서:
     - Swagger UI: /docs
     - ReDoc: /redoc
     """
-    logger.info(f"스킬 실행 요청 - skill: {req.skill}, user_id: {req.user_id}")
+    logger.info(
+        "스킬 실행 요청 - skill: %s, user_id: %s", req.skill, req.user_id,
+        extra={"skill": req.skill, "user_id": req.user_id, **throttled(50)}
+    )
     
+    timeout = resolve_timeout(request.headers.get(TIMEOUT_HEADER), req.skill)
+
     try:
-        if req.skill == "logis_summarizer":
-            # 기존 물류 요약 스킬 처리
-            result = logis_execute(req.user_id, req.text)
-            return ExecuteResponse(
-                result={
-                    "summary": result["summary"],
-                    "sheet_url": result["sheet_url"]
-                }
-            )
-        
         skill_instance = skills.get(req.skill)
         if not skill_instance:
-            logger.warning(f"알 수 없는 스킬: {req.skill}")
+            logger.warning("알 수 없는 스킬: %s", req.skill, extra=throttled(5))
             raise HTTPException(
                 status_code=400,
                 detail=f"Unknown skill: {req.skill}"
@@ -96,46 +187,275 @@ async def execute_skill(req: ExecuteRequest):
         if req.additional_params:
             input_data.update(req.additional_params)
 
-        # 스킬 실행
-        result = await skill_instance.process(input_data)
-        logger.info("스킬 실행 완료")
+        if stream and hasattr(skill_instance, "stream"):
+            # 응답을 시작하면 상태 코드를 바꿀 수 없으므로 입력 오류는 먼저 400 으로 거절
+            await skill_instance.ensure_valid(input_data)
+            return StreamingResponse(
+                _stream_skill(req.skill, skill_instance, input_data, timeout),
+                media_type="application/x-ndjson"
+            )
+
+        # 스킬 실행 (시간 예산 안에서, 연결이 끊기면 취소)
+        started = time.monotonic()
+        with deadline_scope(timeout), start_span("skill.run", skill=req.skill):
+            result = await cancel_on_disconnect(request, skill_instance.process(input_data))
+        # 실행 지표 기록 (오류율, 소요 시간 백분위 규칙 평가)과 결과 값 규칙 평가 (요약 길이, 슬라이드 수 등)
+        await alert_engine.record(req.skill, success=True, duration=time.monotonic() - started)
+        await alert_engine.check_conditions(req.skill, result)
+        logger.info("스킬 실행 완료", extra={"skill": req.skill, **throttled(50)})
         return ExecuteResponse(result=result)
+
+    except HTTPException:
+        raise
+    except TranscriptionBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (InvalidInput, UnknownTier) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DeadlineExceeded as e:
+        # timeout_rate 는 timeouts / events 이므로 실패 이벤트도 함께 기록
+        alert_engine.count(req.skill, "timeouts")
+        await alert_engine.record(req.skill, success=False)
+        logger.warning("스킬 시간 예산 초과 - skill: %s, 단계: %s", req.skill, e.operation)
+        raise HTTPException(status_code=504, detail=f"Skill timed out after {timeout:g}s")
+    except ClientDisconnected:
+        alert_engine.count(req.skill, "cancelled")
+        logger.info("클라이언트 연결 종료로 스킬 실행 취소 - skill: %s", req.skill)
+        raise HTTPException(status_code=499, detail="Client closed request")
             
     except Exception as e:
         logger.error(f"스킬 실행 중 오류 발생: {str(e)}")
+        await alert_engine.record(req.skill, success=False)
         raise HTTPException(
             status_code=500,
             detail=f"Error executing skill: {str(e)}"
         )
 
+async def _stream_skill(skill_name: str, skill_instance: Any, input_data: Dict[str, Any], timeout: float):
+    """스킬 이벤트를 NDJSON 줄로 내보냅니다 (연결이 끊기면 응답 생성이 멈추면서 스킬도 취소)."""
+    started = time.monotonic()
+    result = None
+    with deadline_scope(timeout):
+        try:
+            with start_span("skill.run", skill=skill_name, stream=True):
+                async for event in skill_instance.stream(input_data):
+                    if event.get("event") == "result":
+                        result = event.get("result")
+                    yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+            await alert_engine.record(skill_name, success=True, duration=time.monotonic() - started)
+            if result is not None:
+                await alert_engine.check_conditions(skill_name, result)
+            logger.info("스킬 실행 완료", extra={"skill": skill_name, **throttled(50)})
+        except DeadlineExceeded as e:
+            alert_engine.count(skill_name, "timeouts")
+            await alert_engine.record(skill_name, success=False)
+            logger.warning("스킬 시간 예산 초과 - skill: %s, 단계: %s", skill_name, e.operation)
+            yield json.dumps({"event": "error", "detail": f"Skill timed out after {timeout:g}s"}) + "\n"
+        except Exception as e:
+            # 응답이 이미 시작되어 상태 코드를 바꿀 수 없으므로 오류도 한 줄로 전달
+            logger.error(f"스킬 실행 중 오류 발생: {str(e)}")
+            await alert_engine.record(skill_name, success=False)
+            yield json.dumps({"event": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+
+@app.get("/metrics")
+async def get_metrics():
+    """스킬별 실행 지표, 이벤트 루프 지연/블로킹 기록, 오프로드 스레드 풀, 통계/사용자/음성 인식 캐시, 결과물 저장소 상태"""
+    return {
+        "skills": alert_engine.snapshot(),
+        "event_loop": loop_monitor.snapshot(),
+        "offload_pools": pool_stats(),
+        "stats_cache": stats_cache.snapshot(),
+        "user_cache": storage.known_users.snapshot(),
+        "transcription": transcription_pool.snapshot(),
+        "transcript_cache": transcript_cache.snapshot(),
+        "ppt_render": ppt_render_pool.snapshot(),
+        "artifacts": artifact_store.snapshot(),
+        "feedback_tagger": feedback_tags.snapshot(),
+    }
+
 @app.post("/upload_voice_memo")
 async def upload_voice_memo(
-    file: UploadFile = File(...),
-    user_id: str = None
+    request: Request,
+    user_id: str = None,
+    stream: bool = False,
+    filename: Optional[str] = None,
+    tier: Optional[str] = None
 ):
-    """음성 메모 파일을 업로드하고 처리하는 엔드포인트"""
+    """
+    음성 메모 파일을 업로드하고 처리하는 엔드포인트
+
+    multipart/form-data 의 file 필드, 또는 음성 바이트 그대로(Content-Type: audio/* 등,
+    확장자는 filename 쿼리로 전달)를 받습니다. 본문은 메모리에 모으지 않고 청크 단위로
+    임시 파일에 쓰며(multipart 도 받는 대로 파싱해 파일 내용만 씀), Content-Length 없이
+    보내더라도 VOICE_UPLOAD_MAX_BYTES 를 넘는 순간 413 으로 거절합니다.
+
+    stream=true 이면 구간별 전사가 끝나는 대로 한 줄씩(application/x-ndjson) 내보내고
+    마지막 줄에 전체 결과({"event": "result", ...})를 보냅니다.
+    tier 로 음성 인식 등급(예: tiny, small-int8)을 고를 수 있고, 없으면 음성 길이에 따라 고릅니다.
+    시간 예산(X-Request-Timeout 또는 스킬 기본값)은 업로드가 끝난 뒤 처리에만 적용합니다.
+    """
+    _check_tier(tier)
+    content_type = request.headers.get("content-type", "")
+    is_multipart = content_type.startswith("multipart/form-data")
+    length = request.headers.get("content-length", "")
+    allowed = VOICE_UPLOAD_MAX_BYTES + (MULTIPART_OVERHEAD if is_multipart else 0)
+    if length.isdigit() and int(length) > allowed:
+        raise HTTPException(status_code=413, detail="업로드 크기 제한을 초과했습니다.")
+
     try:
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        # 음성 메모 처리
-        skill_instance = skills["voice_memo_summarizer"]
-        result = await skill_instance.process({
-            "audio_path": temp_file_path,
-            "user_id": user_id
-        })
+        if is_multipart:
+            # 본문을 받는 대로 파싱해 파일 필드의 내용만 바로 임시 파일에 씀
+            upload_name, file_chunks = await open_multipart_file(request.stream(), content_type)
+            upload = await spool_stream(file_chunks, safe_suffix(upload_name))
+        else:
+            upload = await spool_stream(request.stream(), safe_suffix(filename))
+    except MalformedUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-        # 임시 파일 삭제
-        Path(temp_file_path).unlink()
+    return await _process_voice_memo(request, upload, user_id, stream, tier)
 
+@app.post("/upload_voice_memo/sessions", status_code=201)
+async def create_voice_memo_upload(
+    response: Response,
+    filename: Optional[str] = None,
+    length: Optional[int] = Header(None, alias="Upload-Length")
+):
+    """
+    이어 올리기가 가능한 분할 업로드를 시작합니다 (긴 녹음, 불안정한 모바일 네트워크용).
+
+    이후 PATCH 로 조각을 보내고(Upload-Offset 헤더), 끊기면 HEAD 로 현재 위치를 확인해
+    그 지점부터 다시 보낸 뒤 /complete 로 처리합니다.
+    """
+    try:
+        upload_id = upload_sessions.create(filename, length)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    response.headers["Location"] = f"/upload_voice_memo/sessions/{upload_id}"
+    return {"upload_id": upload_id, "offset": 0, "max_bytes": VOICE_UPLOAD_MAX_BYTES, "chunk_size": UPLOAD_CHUNK_SIZE}
+
+@app.head("/upload_voice_memo/sessions/{upload_id}")
+async def get_voice_memo_upload_offset(upload_id: str):
+    """현재까지 받은 위치(Upload-Offset 헤더)"""
+    status = _upload_status(upload_id)
+    headers = {"Upload-Offset": str(status["offset"]), "Cache-Control": "no-store"}
+    if status["length"] is not None:
+        headers["Upload-Length"] = str(status["length"])
+    return Response(status_code=200, headers=headers)
+
+@app.patch("/upload_voice_memo/sessions/{upload_id}")
+async def append_voice_memo_upload(
+    upload_id: str,
+    request: Request,
+    offset: int = Header(..., alias="Upload-Offset")
+):
+    """Upload-Offset 위치부터 본문을 이어 붙입니다. 위치가 다르면 409 와 서버의 현재 위치를 돌려줍니다."""
+    try:
+        position = await upload_sessions.append(upload_id, offset, request.stream())
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="업로드 세션이 없거나 만료되었습니다.")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)})
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return Response(status_code=204, headers={"Upload-Offset": str(position)})
+
+@app.post("/upload_voice_memo/sessions/{upload_id}/complete")
+async def complete_voice_memo_upload(
+    upload_id: str,
+    request: Request,
+    user_id: str = None,
+    stream: bool = False,
+    sha256: Optional[str] = None,
+    tier: Optional[str] = None
+):
+    """분할 업로드를 마치고 음성 메모를 처리합니다 (sha256 을 주면 받은 내용과 비교)."""
+    _check_tier(tier)
+    try:
+        upload = await upload_sessions.complete(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="업로드 세션이 없거나 만료되었습니다.")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)})
+
+    if sha256 and sha256.lower() != upload.sha256:
+        upload.cleanup()
+        raise HTTPException(status_code=400, detail="업로드한 파일의 sha256 이 일치하지 않습니다.")
+    return await _process_voice_memo(request, upload, user_id, stream, tier)
+
+@app.delete("/upload_voice_memo/sessions/{upload_id}", status_code=204)
+async def delete_voice_memo_upload(upload_id: str):
+    """분할 업로드를 취소하고 받은 조각을 삭제합니다."""
+    try:
+        upload_sessions.delete(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="업로드 세션이 없거나 만료되었습니다.")
+    return Response(status_code=204)
+
+def _upload_status(upload_id: str) -> Dict[str, Any]:
+    try:
+        return upload_sessions.status(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="업로드 세션이 없거나 만료되었습니다.")
+
+def _check_tier(tier: Optional[str]) -> None:
+    """업로드를 받기 전에 음성 인식 등급을 확인합니다."""
+    try:
+        transcription_pool.engine_for(tier)
+    except UnknownTier as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _process_voice_memo(
+    request: Request, upload: SpooledUpload, user_id: Optional[str], stream: bool, tier: Optional[str] = None
+):
+    """
+    디스크에 받은 음성 메모를 처리하고, 어떤 경우에도 임시 파일을 지웁니다.
+
+    /execute 와 같이 시간 예산 안에서 처리하고, 클라이언트 연결이 끊기면 처리를 취소합니다.
+    """
+    skill_name = "voice_memo_summarizer"
+    skill_instance = skills[skill_name]
+    input_data = {"audio_path": upload.path, "audio_sha256": upload.sha256, "user_id": user_id, "tier": tier}
+    timeout = resolve_timeout(request.headers.get(TIMEOUT_HEADER), skill_name)
+
+    if stream:
+        async def lines():
+            try:
+                async for line in _stream_skill(skill_name, skill_instance, input_data, timeout):
+                    yield line
+            finally:
+                upload.cleanup()
+
+        # 본문을 보내기 전에 연결이 끊겨 lines() 가 시작되지 않은 경우에도 지워지도록
+        return StreamingResponse(lines(), media_type="application/x-ndjson", background=BackgroundTask(upload.cleanup))
+
+    try:
+        # 음성 메모 처리 (시간 예산 안에서, 연결이 끊기면 취소)
+        started = time.monotonic()
+        with deadline_scope(timeout), start_span("skill.run", skill=skill_name):
+            result = await cancel_on_disconnect(request, skill_instance.process(input_data))
+        await alert_engine.record(skill_name, success=True, duration=time.monotonic() - started)
+        await alert_engine.check_conditions(skill_name, result)
         return ExecuteResponse(result=result)
 
+    except TranscriptionBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except DeadlineExceeded as e:
+        alert_engine.count(skill_name, "timeouts")
+        await alert_engine.record(skill_name, success=False)
+        logger.warning("스킬 시간 예산 초과 - skill: %s, 단계: %s", skill_name, e.operation)
+        raise HTTPException(status_code=504, detail=f"Skill timed out after {timeout:g}s")
+    except ClientDisconnected:
+        alert_engine.count(skill_name, "cancelled")
+        logger.info("클라이언트 연결 종료로 스킬 실행 취소 - skill: %s", skill_name)
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"음성 메모 처리 중 오류 발생: {str(e)}")
+        await alert_engine.record(skill_name, success=False)
         raise HTTPException(
             status_code=500,
             detail=f"Error processing voice memo: {str(e)}"
         )
+    finally:
+        # 임시 파일 삭제
+        upload.cleanup()
@@ -1,8 +1,13 @@
+import time
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from datetime import datetime
 from core.prompt_engine import run_gpt_summary
-from db.supabase import supabase
+from core.alert_engine import alert_engine
+from core.deadline import (
+    TIMEOUT_HEADER, ClientDisconnected, DeadlineExceeded,
+    cancel_on_disconnect, deadline_scope, resolve_timeout
+)
+from db.storage import storage
 
 router = APIRouter()
 
@@ -15,26 +20,38 @@ class SummarizeResponse(BaseModel):
     saved: bool
     summary_id: str | None = None
 
+async def _summarize_and_save(req: SummarizeRequest) -> SummarizeResponse:
+    summary = await run_gpt_summary(req.text)
+
+    # DB 저장
+    summary_id = await storage.create_summary(req.user_id, req.text, summary)
+
+    return SummarizeResponse(
+        summary=summary,
+        saved=True,
+        summary_id=summary_id
+    )
+
 @router.post("/summarize", response_model=SummarizeResponse)
-async def summarize(req: SummarizeRequest):
+async def summarize(req: SummarizeRequest, request: Request):
     if not req.text.strip():
         raise HTTPException(status_code=400, detail="요약할 텍스트가 필요합니다.")
 
+    timeout = resolve_timeout(request.headers.get(TIMEOUT_HEADER), "summarize")
+    started = time.monotonic()
+
     try:
-        summary = await run_gpt_summary(req.text)
-
-        # DB 저장
-        result = supabase.table("summaries").insert({
-            "user_id": req.user_id,
-            "input_text": req.text,
-            "summary": summary,
-            "created_at": datetime.utcnow().isoformat()
-        }).execute()
-
-        return SummarizeResponse(
-            summary=summary,
-            saved=True,
-            summary_id=result.data[0]["id"] if result.data else None
-        )
+        with deadline_scope(timeout):
+            response = await cancel_on_disconnect(request, _summarize_and_save(req))
+        await alert_engine.record("summarize", success=True, duration=time.monotonic() - started)
+        return response
+    except DeadlineExceeded:
+        alert_engine.count("summarize", "timeouts")
+        await alert_engine.record("summarize", success=False)
+        raise HTTPException(status_code=504, detail=f"요약 시간 예산({timeout:g}초)을 초과했습니다.")
+    except ClientDisconnected:
+        alert_engine.count("summarize", "cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
+        await alert_engine.record("summarize", success=False)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,137 @@
+import json
+import os
+from typing import Any, Dict, List
+
+from config.logger import logger
+
+# 알림 규칙 정의
+#
+# kind 별 의미:
+# - value: 실행 결과 하나의 값(field)을 임계값과 비교 (measure="len" 이면 길이)
+# - rate: 최근 window 초 동안 전체 이벤트 대비 counter 의 비율 (예: errors)
+# - percentile: 최근 window 초 동안의 소요 시간 백분위 (q)
+# - series: 최근 size 개 표본의 평균 (예: 피드백 긍정 여부)
+#
+# skill 이 "*" 인 규칙은 모든 스킬에 적용됩니다.
+DEFAULT_ALERT_RULES: List[Dict[str, Any]] = [
+    {
+        "name": "summary_too_long",
+        "skill": "summarizer",
+        "kind": "value",
+        "field": "summary",
+        "measure": "len",
+        "op": ">",
+        "threshold": 1000,
+        "message": "요약이 너무 깁니다 ({value:.0f} 자)",
+    },
+    {
+        "name": "summary_too_short",
+        "skill": "summarizer",
+        "kind": "value",
+        "field": "summary",
+        "measure": "len",
+        "op": "<",
+        "threshold": 50,
+        "message": "요약이 너무 짧습니다 ({value:.0f} 자)",
+    },
+    {
+        "name": "too_few_slides",
+        "skill": "ppt_writer",
+        "kind": "value",
+        "field": "slide_count",
+        "op": "<",
+        "threshold": 3,
+        "message": "슬라이드 수가 너무 적습니다 ({value:.0f}장)",
+    },
+    {
+        "name": "too_many_slides",
+        "skill": "ppt_writer",
+        "kind": "value",
+        "field": "slide_count",
+        "op": ">",
+        "threshold": 20,
+        "message": "슬라이드 수가 너무 많습니다 ({value:.0f}장)",
+    },
+    {
+        "name": "voice_too_long",
+        "skill": "voice_memo_summarizer",
+        "kind": "value",
+        "field": "duration",
+        "op": ">",
+        "threshold": 600,
+        "message": "음성이 너무 깁니다 ({value:.1f}초)",
+    },
+    {
+        "name": "low_positive_rate",
+        "skill": "feedback_stats",
+        "kind": "value",
+        "field": "positive_rate",
+        "op": "<",
+        "threshold": 0.3,
+        "message": "긍정 비율이 낮습니다 ({value:.1%})",
+    },
+    {
+        "name": "high_error_rate",
+        "skill": "*",
+        "kind": "rate",
+        "counter": "errors",
+        "window": 300,
+        "op": ">",
+        "threshold": 0.05,
+        "min_events": 20,
+        "message": "오류율이 높습니다 ({value:.1%}, 최근 {window}초)",
+    },
+    {
+        "name": "high_timeout_rate",
+        "skill": "*",
+        "kind": "rate",
+        "counter": "timeouts",
+        "window": 300,
+        "op": ">",
+        "threshold": 0.05,
+        "min_events": 20,
+        "message": "시간 예산 초과 비율이 높습니다 ({value:.1%}, 최근 {window}초)",
+    },
+    {
+        "name": "slow_p95",
+        "skill": "*",
+        "kind": "percentile",
+        "q": 0.95,
+        "window": 300,
+        "op": ">",
+        "threshold": 20.0,
+        "min_events": 20,
+        "message": "p95 실행 시간이 깁니다 ({value:.1f}초, 최근 {window}초)",
+    },
+    {
+        "name": "feedback_positive_rate",
+        "skill": "feedback",
+        "kind": "series",
+        "series": "positive",
+        "size": 100,
+        "op": "<",
+        "threshold": 0.3,
+        "min_events": 100,
+        "message": "최근 피드백 {size}건의 긍정 비율이 낮습니다 ({value:.1%})",
+    },
+]
+
+
+def load_alert_rules() -> List[Dict[str, Any]]:
+    """
+    알림 규칙을 불러옵니다.
+
+    ALERT_RULES_PATH 환경 변수에 JSON 파일 경로가 지정되어 있으면 그 규칙을 사용합니다.
+    """
+    path = os.getenv("ALERT_RULES_PATH")
+    if not path:
+        return DEFAULT_ALERT_RULES
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            rules = json.load(f)
+        logger.info(f"알림 규칙 파일 로드 완료: {path} ({len(rules)}개)")
+        return rules
+    except Exception as e:
+        logger.error(f"알림 규칙 파일 로드 실패, 기본 규칙 사용: {str(e)}")
+        return DEFAULT_ALERT_RULES
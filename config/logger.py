@@ -1,16 +1,140 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Tuple
 
 # 기본 로거 설정
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text | json
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# LogRecord 기본 속성 (JSON 출력 시 extra 필드와 구분하기 위함)
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sample_rate", "rate_limit"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 로그를 출력합니다. extra 로 넘긴 필드도 함께 기록됩니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    호출 위치(파일, 줄)별 샘플링과 초당 건수 제한.
+
+    핫 패스에서 `logger.info("...", extra=sampled(0.1))` 또는
+    `extra=throttled(20)` 처럼 사용합니다. 버려지는 레코드는 큐에 들어가지 않습니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate is not None and random.random() >= sample_rate:
+            return False
+
+        rate_limit = getattr(record, "rate_limit", None)
+        if rate_limit is not None:
+            return self._take_token((record.pathname, record.lineno), rate_limit)
+
+        return True
+
+    def _take_token(self, key: Tuple[str, int], per_second: float) -> bool:
+        """호출 위치별 토큰 버킷에서 토큰 하나를 가져옵니다."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [per_second, now]
+                self._buckets[key] = bucket
+
+            tokens = min(per_second, bucket[0] + (now - bucket[1]) * per_second)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    호출 스레드에서는 레코드를 큐에 넣기만 하는 핸들러.
+
+    같은 프로세스 안의 큐이므로 메시지 포맷팅은 리스너 스레드에서 수행하고,
+    큐가 가득 차면 기다리지 않고 레코드를 버립니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def sampled(rate: float) -> Dict[str, float]:
+    """호출 위치별로 rate 비율만 기록하도록 하는 extra 값"""
+    return {"sample_rate": rate}
+
+
+def throttled(per_second: float) -> Dict[str, float]:
+    """호출 위치별로 초당 per_second 건까지만 기록하도록 하는 extra 값"""
+    return {"rate_limit": per_second}
+
 
 logger = logging.getLogger("standard-ai")
 logger.setLevel(LOG_LEVEL)
+logger.propagate = False
 
-formatter = logging.Formatter(
-    "[%(asctime)s][%(name)s][%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
-)
+if LOG_FORMAT == "json":
+    formatter = JsonFormatter()
+else:
+    formatter = logging.Formatter(
+        "[%(asctime)s][%(name)s][%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
+    )
 
+# 실제 출력은 백그라운드 리스너 스레드에서만 수행
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = NonBlockingQueueHandler(log_queue)
+logger.addHandler(queue_handler)
+logger.addFilter(SamplingFilter())
+
+listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
@@ -2,3 +2,8 @@
 import sys, os
 # 테스트 시 항상 프로젝트 루트가 경로에 포함되도록
 sys.path.insert(0, os.getcwd())
+
+# .env 가 없거나 Supabase 로 설정되어 있어도 테스트는 내장 SQLite(메모리)로 실행
+# (db.storage 를 import 하기 전에 설정해야 하며, load_dotenv 는 이미 있는 값을 덮어쓰지 않음)
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
@@ -1,87 +1,246 @@
-from typing import Any, Dict
+import operator
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 from utils.slack import slack
+from config.alert_rules import load_alert_rules
 from config.logger import logger
+from core.metrics_window import SkillMetrics
+from core.tracing import start_span
+
+# 규칙에서 사용할 수 있는 비교 연산자
+_OPS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# 이벤트마다 평가하는 창 기반 규칙 종류
+_WINDOW_KINDS = ("rate", "percentile", "series")
+
 
 class AlertEngine:
-    def __init__(self):
-        # 알림 조건 설정
-        self.conditions = {
-            "summarizer": {
-                "max_length": 1000,  # 요약 최대 길이
-                "min_length": 50,    # 요약 최소 길이
-            },
-            "ppt_writer": {
-                "min_slides": 3,     # 최소 슬라이드 수
-                "max_slides": 20,    # 최대 슬라이드 수
-            },
-            "voice_memo_summarizer": {
-                "max_duration": 600,  # 최대 음성 길이 (초)
-            },
-            "feedback_stats": {
-                "min_positive_rate": 0.3,  # 최소 긍정 비율
+    def __init__(self,
+                 rules: Optional[List[Dict[str, Any]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        # 알림 조건 설정 (config/alert_rules.py 또는 ALERT_RULES_PATH)
+        self.rules = rules if rules is not None else load_alert_rules()
+        self._clock = clock
+
+        # 규칙에서 필요한 시간 창과 표본 창만 만든다
+        self._windows = sorted({
+            rule["window"] for rule in self.rules if rule["kind"] in ("rate", "percentile")
+        })
+        self._series = sorted({
+            (rule["series"], rule["size"]) for rule in self.rules if rule["kind"] == "series"
+        })
+
+        self._metrics: Dict[str, SkillMetrics] = {}
+        self._rules_cache: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+        # 알림 기록 (중복 방지). 기록 순서대로 deque 에 쌓아 만료분만 앞에서 제거
+        self._alert_history: Dict[str, datetime] = {}
+        self._history_order: deque = deque()
+
+    def _rules_for(self, skill_name: str) -> Dict[str, List[Dict[str, Any]]]:
+        """스킬에 적용되는 규칙을 value / window 로 나누어 반환합니다 (캐시됨)."""
+        cached = self._rules_cache.get(skill_name)
+        if cached is None:
+            matched = [r for r in self.rules if r.get("skill", "*") in ("*", skill_name)]
+            cached = {
+                "value": [r for r in matched if r["kind"] == "value"],
+                "window": [r for r in matched if r["kind"] in _WINDOW_KINDS],
             }
-        }
-        
-        # 알림 기록 (중복 방지)
-        self._alert_history = {}
+            self._rules_cache[skill_name] = cached
+        return cached
 
-    async def check_conditions(self, skill_name: str, result: Dict[str, Any]) -> None:
-        """스킬 실행 결과가 알림 조건에 해당하는지 확인"""
-        if skill_name not in self.conditions:
+    def metrics(self, skill_name: str) -> SkillMetrics:
+        """스킬의 지표 창을 반환합니다 (없으면 생성)."""
+        metrics = self._metrics.get(skill_name)
+        if metrics is None:
+            metrics = SkillMetrics(self._windows, self._series, self._clock)
+            self._metrics[skill_name] = metrics
+        return metrics
+
+    async def record(self,
+                     skill_name: str,
+                     success: bool = True,
+                     duration: Optional[float] = None,
+                     values: Optional[Dict[str, float]] = None) -> None:
+        """
+        이벤트 하나를 지표 창에 기록하고 창 기반 규칙을 평가합니다.
+
+        Args:
+            skill_name: 스킬 이름 (피드백은 "feedback")
+            success: 성공 여부
+            duration: 소요 시간 (초)
+            values: 표본 창에 넣을 값 (예: {"positive": 1})
+        """
+        try:
+            metrics = self.metrics(skill_name)
+            metrics.record(success=success, duration=duration, values=values)
+            await self._evaluate_window_rules(skill_name, metrics)
+        except Exception as e:
+            logger.error(f"알림 지표 기록 중 오류 발생: {str(e)}")
+
+    async def record_many(self, skill_name: str, values: List[Dict[str, float]]) -> None:
+        """
+        성공 이벤트 여러 개를 기록하고 창 기반 규칙은 한 번만 평가합니다 (일괄 저장용).
+
+        Args:
+            skill_name: 스킬 이름
+            values: 이벤트별 표본 값 목록
+        """
+        if not values:
             return
+        try:
+            metrics = self.metrics(skill_name)
+            for item in values:
+                metrics.record(values=item)
+            await self._evaluate_window_rules(skill_name, metrics)
+        except Exception as e:
+            logger.error(f"알림 지표 기록 중 오류 발생: {str(e)}")
 
+    async def _evaluate_window_rules(self, skill_name: str, metrics: SkillMetrics) -> None:
+        """창 기반 규칙을 평가해 조건을 만족하면 알림을 보냅니다."""
         alerts = []
-        conditions = self.conditions[skill_name]
+        now = datetime.utcnow()
+        for rule in self._rules_for(skill_name)["window"]:
+            # 오늘 이미 보낸 규칙은 평가하지 않는다
+            if self._alert_key(skill_name, rule, now) in self._alert_history:
+                continue
+            message = self._evaluate_window_rule(rule, metrics)
+            if message:
+                alerts.append((rule, message))
+
+        if alerts:
+            await self._dispatch(skill_name, alerts, metrics.snapshot())
+
+    def count(self, skill_name: str, counter: str, amount: int = 1) -> None:
+        """이벤트 수와 별개인 카운터(timeouts, cancelled)를 증가시킵니다."""
+        try:
+            self.metrics(skill_name).count(counter, amount)
+        except Exception as e:
+            logger.error(f"알림 지표 기록 중 오류 발생: {str(e)}")
+
+    async def check_conditions(self, skill_name: str, result: Dict[str, Any]) -> None:
+        """스킬 실행 결과가 알림 조건에 해당하는지 확인"""
+        rules = self._rules_for(skill_name)["value"]
+        if not rules:
+            return
 
         try:
-            # 스킬별 조건 체크
-            if skill_name == "summarizer":
-                summary = result if isinstance(result, str) else result.get("summary", "")
-                if len(summary) > conditions["max_length"]:
-                    alerts.append(f"요약이 너무 깁니다 ({len(summary)} 자)")
-                elif len(summary) < conditions["min_length"]:
-                    alerts.append(f"요약이 너무 짧습니다 ({len(summary)} 자)")
-
-            elif skill_name == "ppt_writer":
-                if isinstance(result, dict) and "slide_count" in result:
-                    slides = result["slide_count"]
-                    if slides < conditions["min_slides"]:
-                        alerts.append(f"슬라이드 수가 너무 적습니다 ({slides}장)")
-                    elif slides > conditions["max_slides"]:
-                        alerts.append(f"슬라이드 수가 너무 많습니다 ({slides}장)")
-
-            elif skill_name == "voice_memo_summarizer":
-                if isinstance(result, dict) and "duration" in result:
-                    duration = result["duration"]
-                    if duration > conditions["max_duration"]:
-                        alerts.append(f"음성이 너무 깁니다 ({duration:.1f}초)")
-
-            elif skill_name == "feedback_stats":
-                if isinstance(result, dict) and "positive_rate" in result:
-                    pos_rate = result["positive_rate"]
-                    if pos_rate < conditions["min_positive_rate"]:
-                        alerts.append(f"긍정 비율이 낮습니다 ({pos_rate:.1%})")
-
-            # 알림 전송 (중복 방지)
-            if alerts:
-                alert_key = f"{skill_name}_{datetime.utcnow().strftime('%Y%m%d')}"
-                if alert_key not in self._alert_history:
-                    await self._send_alerts(skill_name, alerts, result)
-                    self._alert_history[alert_key] = datetime.utcnow()
-                    self._cleanup_history()
+            with start_span("alert.check_conditions", skill=skill_name):
+                alerts = []
+                for rule in rules:
+                    value = self._extract(result, rule["field"], rule.get("measure"))
+                    if value is None:
+                        continue
+                    if _OPS[rule["op"]](value, rule["threshold"]):
+                        alerts.append((rule, rule["message"].format(value=value, **rule)))
+
+                # 알림 전송 (중복 방지)
+                if alerts:
+                    await self._dispatch(skill_name, alerts, result)
 
         except Exception as e:
             logger.error(f"알림 조건 체크 중 오류 발생: {str(e)}")
 
+    async def send_alert(self, level: str, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        """규칙과 무관한 즉시 알림을 전송합니다 (스킬 오류 등)."""
+        try:
+            text = f"🚨 [{level}] {message}"
+            if context:
+                text += f"\n\n컨텍스트:\n```{str(context)[:500]}```"
+
+            await slack.send_message(
+                text=text,
+                channel="#alerts",
+                username="StandardAI Monitor",
+                emoji=":rotating_light:"
+            )
+        except Exception as e:
+            logger.error(f"알림 전송 중 오류 발생: {str(e)}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모든 스킬의 현재 지표 요약을 반환합니다."""
+        return {name: metrics.snapshot() for name, metrics in self._metrics.items()}
+
+    @staticmethod
+    def _extract(result: Any, field: str, measure: Optional[str]) -> Optional[float]:
+        """규칙이 참조하는 값을 실행 결과에서 꺼냅니다."""
+        if isinstance(result, dict):
+            value = result.get(field)
+        elif field == "summary" and isinstance(result, str):
+            value = result
+        else:
+            return None
+
+        if value is None:
+            return None
+        if measure == "len":
+            return float(len(value))
+        if isinstance(value, (int, float)):
+            return float(value)
+        return None
+
+    @staticmethod
+    def _evaluate_window_rule(rule: Dict[str, Any], metrics: SkillMetrics) -> Optional[str]:
+        """창 기반 규칙을 평가하고, 조건에 해당하면 알림 메시지를 반환합니다."""
+        min_events = rule.get("min_events", 1)
+        kind = rule["kind"]
+
+        if kind == "series":
+            series = metrics.series[(rule["series"], rule["size"])]
+            if len(series) < min_events:
+                return None
+            value = series.mean()
+        else:
+            window = metrics.windows[rule["window"]]
+            if kind == "rate":
+                if window.total("events") < min_events:
+                    return None
+                value = window.rate(rule["counter"])
+            else:
+                if window.sample_count() < min_events:
+                    return None
+                value = window.percentile(rule["q"])
+
+        if value is None or not _OPS[rule["op"]](value, rule["threshold"]):
+            return None
+        return rule["message"].format(value=value, **rule)
+
+    @staticmethod
+    def _alert_key(skill_name: str, rule: Dict[str, Any], now: datetime) -> str:
+        return f"{skill_name}_{rule['name']}_{now.strftime('%Y%m%d')}"
+
+    async def _dispatch(self, skill_name: str, alerts: list, result: Any) -> None:
+        """규칙별로 하루 한 번만 알림을 전송합니다."""
+        now = datetime.utcnow()
+        self._cleanup_history(now)
+
+        messages = []
+        for rule, message in alerts:
+            alert_key = self._alert_key(skill_name, rule, now)
+            if alert_key in self._alert_history:
+                continue
+            self._alert_history[alert_key] = now
+            self._history_order.append((now, alert_key))
+            messages.append(message)
+
+        if messages:
+            await self._send_alerts(skill_name, messages, result)
+
     async def _send_alerts(self, skill_name: str, alerts: list, result: Dict[str, Any]) -> None:
         """알림 메시지 전송"""
         message = f"⚠️ *{skill_name}* 실행 결과 주의 필요\n"
         message += "\n".join([f"- {alert}" for alert in alerts])
-        
+
         if isinstance(result, dict):
             message += f"\n\n실행 결과:\n```{str(result)[:500]}```"
-        
+
         await slack.send_message(
             text=message,
             channel="#alerts",
@@ -89,13 +248,12 @@ class AlertEngine:
             emoji=":warning:"
         )
 
-    def _cleanup_history(self) -> None:
-        """24시간 이상 지난 알림 기록 삭제"""
-        now = datetime.utcnow()
-        self._alert_history = {
-            k: v for k, v in self._alert_history.items()
-            if now - v < timedelta(days=1)
-        }
+    def _cleanup_history(self, now: Optional[datetime] = None) -> None:
+        """24시간 이상 지난 알림 기록 삭제 (오래된 것부터 순서대로 제거)"""
+        now = now or datetime.utcnow()
+        while self._history_order and now - self._history_order[0][0] >= timedelta(days=1):
+            _, key = self._history_order.popleft()
+            self._alert_history.pop(key, None)
 
 # 전역 AlertEngine 인스턴스
 alert_engine = AlertEngine()
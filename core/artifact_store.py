@@ -0,0 +1,323 @@
+"""
+생성 결과물(PPT 등) 저장소 (디스크, 내용 주소 방식).
+
+결과물은 입력(내용, 템플릿 등)의 SHA-256 을 ID 로 저장합니다. 같은 입력이 다시 오면 LLM 호출과
+렌더링 없이 저장된 파일을 그대로 돌려줍니다. 같은 ID 를 동시에 요청하면 한 번만 만들고 결과를 공유합니다.
+
+- 저장 위치: ARTIFACT_DIR 의 <ID><확장자> 와 메타데이터 <ID>.json (마지막 사용 시각은 메타데이터 파일 mtime)
+- 크기 제한: 파일 크기 합이 ARTIFACT_MAX_BYTES 를 넘으면 가장 오래 안 쓴 것부터 삭제
+- 보관 기간: ARTIFACT_MAX_AGE(초) 동안 쓰이지 않은 결과물은 삭제
+
+사용 예:
+    artifact_id = artifact_key("ppt", content=content, template=template)
+    artifact, created = await artifact_store.get_or_create(artifact_id, ".pptx", build)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config.logger import logger
+from utils.offload import run_blocking
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "output/artifacts")
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(1024 * 1024 * 1024)))
+ARTIFACT_MAX_AGE = float(os.getenv("ARTIFACT_MAX_AGE", str(7 * 86400)))
+
+# 크기 제한을 넘으면 이 비율까지 줄여 매 저장마다 삭제가 일어나지 않게 함
+_EVICT_TARGET = 0.9
+
+# 이 시간(초)보다 오래된 임시 파일은 중단된 생성으로 보고 시작 시 삭제
+_STALE_TMP_SECONDS = 3600
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_SUFFIX_PATTERN = re.compile(r"^\.[0-9a-z]{1,8}$")
+
+
+def artifact_key(kind: str, **parts: Any) -> str:
+    """결과물 종류와 입력값으로 만든 안정적인 ID (프로세스가 달라도 같음)"""
+    body = json.dumps({"kind": kind, **parts}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def is_artifact_id(value: str) -> bool:
+    return bool(_ID_PATTERN.match(value))
+
+
+class Artifact:
+    """저장된 결과물 파일과 메타데이터"""
+
+    __slots__ = ("id", "path", "suffix", "size", "created_at", "last_used", "metadata")
+
+    def __init__(self, artifact_id: str, path: str, suffix: str, size: int,
+                 created_at: float, last_used: float, metadata: Dict[str, Any]):
+        self.id = artifact_id
+        self.path = path
+        self.suffix = suffix
+        self.size = size
+        self.created_at = created_at
+        self.last_used = last_used
+        self.metadata = metadata
+
+    @property
+    def etag(self) -> str:
+        # 삭제 후 다시 만들면 내용이 달라질 수 있으므로 생성 시각까지 포함
+        return f'"{self.id[:32]}-{int(self.created_at * 1000):x}"'
+
+
+class ArtifactStore:
+    """
+    크기/보관 기간 제한이 있는 내용 주소 방식 결과물 저장소.
+
+    Args:
+        directory: 저장 디렉터리
+        max_bytes: 파일 크기 합의 최대값
+        max_age: 마지막 사용 후 보관 시간 (초)
+    """
+
+    def __init__(self,
+                 directory: str = ARTIFACT_DIR,
+                 max_bytes: int = ARTIFACT_MAX_BYTES,
+                 max_age: float = ARTIFACT_MAX_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._index: Optional[Dict[str, Artifact]] = None
+        self._loading: Optional[asyncio.Future] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _file_path(self, artifact_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, artifact_id + suffix)
+
+    def _meta_path(self, artifact_id: str) -> str:
+        return os.path.join(self.directory, artifact_id + ".json")
+
+    def _read(self, artifact_id: str) -> Optional[Artifact]:
+        """메타데이터 파일로 결과물 정보를 읽습니다 (블로킹, 없거나 깨졌으면 None)."""
+        meta_path = self._meta_path(artifact_id)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            path = self._file_path(artifact_id, meta["suffix"])
+            return Artifact(
+                artifact_id, path, meta["suffix"], os.path.getsize(path),
+                meta["created_at"], os.path.getmtime(meta_path), meta.get("metadata", {})
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("결과물 메타데이터 무시 (%s): %s", artifact_id, e)
+            return None
+
+    def _scan(self) -> Dict[str, Artifact]:
+        """디렉터리를 읽어 색인을 만들고, 오래된 임시 파일과 짝이 없는 파일은 지웁니다 (블로킹)."""
+        os.makedirs(self.directory, exist_ok=True)
+        index: Dict[str, Artifact] = {}
+        names = os.listdir(self.directory)
+        for name in names:
+            artifact_id, ext = os.path.splitext(name)
+            if ext == ".json" and is_artifact_id(artifact_id):
+                artifact = self._read(artifact_id)
+                if artifact is not None:
+                    index[artifact_id] = artifact
+
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            artifact_id = name.split(".", 1)[0]
+            try:
+                if name.endswith(".tmp"):
+                    # 다른 프로세스가 만들고 있는 파일일 수 있으므로 충분히 오래된 것만
+                    if now - os.path.getmtime(path) > _STALE_TMP_SECONDS:
+                        _unlink(path)
+                elif is_artifact_id(artifact_id) and artifact_id not in index:
+                    _unlink(path)
+            except FileNotFoundError:
+                pass
+        return index
+
+    async def _load(self) -> Dict[str, Artifact]:
+        if self._index is None:
+            if self._loading is None:
+                self._loading = asyncio.ensure_future(run_blocking("artifacts", self._scan))
+            try:
+                index = await asyncio.shield(self._loading)
+            except BaseException:
+                if self._loading.done():
+                    self._loading = None
+                raise
+            if self._index is None:
+                self._index = index
+                self.total_bytes = sum(artifact.size for artifact in index.values())
+        return self._index
+
+    async def get(self, artifact_id: str) -> Optional[Artifact]:
+        """저장된 결과물을 반환하고 마지막 사용 시각을 갱신합니다 (없거나 기간이 지났으면 None)."""
+        if not is_artifact_id(artifact_id):
+            return None
+        index = await self._load()
+        artifact = index.get(artifact_id)
+        if artifact is None:
+            # 같은 디렉터리를 쓰는 다른 워커 프로세스가 만든 결과물일 수 있음
+            artifact = await run_blocking("artifacts", self._read, artifact_id)
+            if artifact is None:
+                return None
+            if artifact_id not in index:
+                index[artifact_id] = artifact
+                self.total_bytes += artifact.size
+        now = time.time()
+        if now - artifact.last_used > self.max_age:
+            await self._remove([artifact])
+            return None
+        artifact.last_used = now
+        await run_blocking("artifacts", _touch, self._meta_path(artifact_id), now)
+        return artifact
+
+    async def get_or_create(self,
+                            artifact_id: str,
+                            suffix: str,
+                            build: Callable[[str], Awaitable[Dict[str, Any]]]) -> Tuple[Artifact, bool]:
+        """
+        저장된 결과물을 반환하거나, 없으면 (동시 요청 중 한 번만) 만들어 저장합니다.
+
+        Args:
+            artifact_id: artifact_key 로 만든 ID
+            suffix: 파일 확장자 (예: ".pptx")
+            build: 주어진 임시 경로에 파일을 만들고 함께 저장할 메타데이터를 반환하는 함수
+
+        Returns:
+            (결과물, 새로 만들었는지 여부)
+        """
+        if not is_artifact_id(artifact_id) or not _SUFFIX_PATTERN.match(suffix):
+            raise ValueError(f"잘못된 결과물 ID/확장자입니다: {artifact_id}{suffix}")
+
+        artifact = await self.get(artifact_id)
+        if artifact is not None:
+            self.hits += 1
+            return artifact, False
+
+        task = self._inflight.get(artifact_id)
+        created = task is None
+        if created:
+            self.misses += 1
+            task = asyncio.ensure_future(self._create(artifact_id, suffix, build))
+            self._inflight[artifact_id] = task
+            task.add_done_callback(lambda t, key=artifact_id: self._inflight.pop(key, None))
+
+        # 먼저 요청한 쪽이 취소되어도 함께 기다리는 요청을 위해 만들기는 계속 진행
+        return await asyncio.shield(task), created
+
+    async def _create(self,
+                      artifact_id: str,
+                      suffix: str,
+                      build: Callable[[str], Awaitable[Dict[str, Any]]]) -> Artifact:
+        index = await self._load()
+        await run_blocking("artifacts", os.makedirs, self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f"{artifact_id}.{uuid.uuid4().hex}{suffix}.tmp")
+        try:
+            metadata = await build(tmp_path)
+            now = time.time()
+            path = self._file_path(artifact_id, suffix)
+            size = await run_blocking("artifacts", self._commit, artifact_id, tmp_path, path, {
+                "suffix": suffix,
+                "created_at": now,
+                "metadata": metadata,
+            })
+        except BaseException:
+            await asyncio.shield(run_blocking("artifacts", _unlink, tmp_path))
+            raise
+
+        artifact = Artifact(artifact_id, path, suffix, size, now, now, metadata)
+        previous = index.get(artifact_id)
+        index[artifact_id] = artifact
+        self.total_bytes += size - (previous.size if previous else 0)
+        await self.evict(keep=artifact_id)
+        return artifact
+
+    def _commit(self, artifact_id: str, tmp_path: str, path: str, meta: Dict[str, Any]) -> int:
+        """임시 파일을 제자리로 옮기고 메타데이터를 씁니다 (블로킹, 둘 다 rename 으로 원자적)."""
+        os.replace(tmp_path, path)
+        meta_path = self._meta_path(artifact_id)
+        meta_tmp = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_tmp, meta_path)
+        return os.path.getsize(path)
+
+    async def evict(self, keep: Optional[str] = None) -> int:
+        """보관 기간이 지난 결과물과, 크기 제한을 넘는 만큼 가장 오래 안 쓴 결과물을 지웁니다."""
+        index = await self._load()
+        now = time.time()
+        expired = [a for a in index.values() if now - a.last_used > self.max_age and a.id != keep]
+        removed = set(a.id for a in expired)
+        victims = list(expired)
+
+        remaining = self.total_bytes - sum(a.size for a in expired)
+        if remaining > self.max_bytes:
+            target = self.max_bytes * _EVICT_TARGET
+            for artifact in sorted(index.values(), key=lambda a: a.last_used):
+                if remaining <= target:
+                    break
+                if artifact.id == keep or artifact.id in removed:
+                    continue
+                victims.append(artifact)
+                remaining -= artifact.size
+
+        if victims:
+            await self._remove(victims)
+            logger.info("결과물 %d건 삭제 (보관 기간 %.0fs, 크기 제한 %d bytes)",
+                        len(victims), self.max_age, self.max_bytes)
+        return len(victims)
+
+    async def _remove(self, artifacts: List[Artifact]) -> None:
+        index = await self._load()
+        paths = []
+        for artifact in artifacts:
+            if index.pop(artifact.id, None) is not None:
+                self.total_bytes -= artifact.size
+                self.evictions += 1
+                # 메타데이터를 먼저 지워 중간에 멈춰도 다음 시작 때 파일이 정리되게 함
+                paths += [self._meta_path(artifact.id), artifact.path]
+        if paths:
+            await run_blocking("artifacts", _unlink_all, paths)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "artifacts": len(self._index) if self._index is not None else None,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _touch(path: str, when: float) -> None:
+    try:
+        os.utime(path, (when, when))
+    except FileNotFoundError:
+        pass
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _unlink_all(paths: List[str]) -> None:
+    for path in paths:
+        _unlink(path)
+
+
+# 전역 결과물 저장소
+artifact_store = ArtifactStore()
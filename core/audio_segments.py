@@ -0,0 +1,100 @@
+"""
+음성 파형을 무음 구간 기준으로 나누는 도구 (구간별 병렬 음성 인식용).
+
+긴 음성 메모를 한 번의 transcribe 로 돌리면 워커 하나만 일하고, 끝날 때까지 아무 결과도 없습니다.
+여기서는 파형을 한 번만 디코딩한 뒤 프레임별 에너지(RMS)로 무음을 찾아 최대 길이 이하의
+구간으로 자르고, 각 구간을 음성 인식 워커들에 나눠 줄 수 있게 합니다.
+
+- 자르는 위치: VOICE_MIN_SILENCE 초 이상 이어진 무음의 가운데
+- 구간 길이: VOICE_SEGMENT_MAX_SECONDS 초 이하 (Whisper 입력 창 30초), 무음이 없으면 가장 조용한 프레임에서 자름
+- 너무 짧은 구간은 만들지 않음 (VOICE_SEGMENT_MIN_SECONDS, Whisper 는 30초 단위로 채워 처리하므로 짧은 구간은 낭비)
+"""
+import os
+from typing import Any, List, Tuple
+import numpy as np
+
+SAMPLE_RATE = 16000  # Whisper 입력 샘플링 주파수
+
+VOICE_SEGMENT_MAX_SECONDS = float(os.getenv("VOICE_SEGMENT_MAX_SECONDS", "30"))
+VOICE_SEGMENT_MIN_SECONDS = float(os.getenv("VOICE_SEGMENT_MIN_SECONDS", "10"))
+VOICE_MIN_SILENCE = float(os.getenv("VOICE_MIN_SILENCE", "0.3"))
+
+_FRAME_SECONDS = 0.03
+_SILENCE_FLOOR = 1e-3  # 이 RMS 미만은 항상 무음으로 봄
+
+
+def decode_audio(path: str) -> Any:
+    """음성 파일을 16kHz 모노 float32 파형으로 디코딩합니다 (ffmpeg 사용, 블로킹)."""
+    from whisper.audio import load_audio
+    return load_audio(path, sr=SAMPLE_RATE)
+
+
+def frame_energy(audio: np.ndarray, frame: int) -> np.ndarray:
+    """프레임별 RMS 에너지. 마지막 남는 샘플은 짧은 프레임 하나로 계산합니다."""
+    count = len(audio) // frame
+    energy = np.sqrt(np.mean(np.square(audio[:count * frame].reshape(count, frame), dtype=np.float64), axis=1))
+    if len(audio) % frame:
+        tail = audio[count * frame:]
+        energy = np.append(energy, np.sqrt(np.mean(np.square(tail, dtype=np.float64))))
+    return energy
+
+
+def _silence_cuts(energy: np.ndarray, min_frames: int) -> np.ndarray:
+    """min_frames 이상 이어진 무음 구간의 가운데 프레임 번호"""
+    # 배경 소음(하위 10%)의 2배, 단 말소리(상위 10%)의 1/10 을 넘지 않게 (쉼이 적은 녹음 대비)
+    noise, speech = np.percentile(energy, [10, 90])
+    threshold = max(_SILENCE_FLOOR, min(float(noise) * 2, float(speech) * 0.1))
+    silent = np.concatenate(([False], energy < threshold, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = (ends - starts) >= min_frames
+    return (starts[keep] + ends[keep]) // 2
+
+
+def split_on_silence(audio: np.ndarray,
+                     sample_rate: int = SAMPLE_RATE,
+                     max_seconds: float = VOICE_SEGMENT_MAX_SECONDS,
+                     min_seconds: float = VOICE_SEGMENT_MIN_SECONDS,
+                     min_silence: float = VOICE_MIN_SILENCE) -> List[Tuple[int, int]]:
+    """
+    파형을 무음 위치에서 잘라 (시작, 끝) 샘플 번호 목록을 반환합니다.
+
+    Args:
+        audio: 모노 파형
+        sample_rate: 샘플링 주파수
+        max_seconds: 구간 최대 길이 (초)
+        min_seconds: 무음에서 자를 때 구간 최소 길이 (초)
+        min_silence: 자르는 위치로 인정할 최소 무음 길이 (초)
+
+    Returns:
+        순서대로 이어지는 구간 목록 (빈 파형이면 빈 목록)
+    """
+    total = len(audio)
+    if total == 0:
+        return []
+    max_len = int(max_seconds * sample_rate)
+    if total <= max_len:
+        return [(0, total)]
+
+    frame = max(1, int(_FRAME_SECONDS * sample_rate))
+    energy = frame_energy(audio, frame)
+    cuts = _silence_cuts(energy, max(1, int(min_silence / _FRAME_SECONDS))) * frame
+    max_frames = max_len // frame
+    min_len = min(int(min_seconds * sample_rate), max_len // 2)
+
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    while total - start > max_len:
+        # 최대 길이 안에서 가장 늦은 무음 위치
+        window = cuts[(cuts > start + min_len) & (cuts <= start + max_len)]
+        if len(window):
+            cut = int(window[-1])
+        else:
+            # 무음이 없으면 뒤쪽 절반에서 가장 조용한 프레임 (같으면 가장 늦은 위치)
+            first = start // frame + max_frames // 2
+            last = start // frame + max_frames
+            cut = int(last - 1 - np.argmin(energy[first:last][::-1])) * frame
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, total))
+    return spans
@@ -3,8 +3,13 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from utils.sheet_writer import SheetWriter
 from utils.slack import SlackNotifier
-from core.alert_engine import AlertEngine
-from config.logger import logger
+from core.alert_engine import alert_engine
+from core.tracing import start_span
+from config.logger import logger, throttled
+
+class InvalidInput(ValueError):
+    """스킬 입력 데이터가 올바르지 않음 (API 에서 400 으로 응답)"""
+
 
 class BaseSkill(ABC):
     skill_name: str = None
@@ -15,7 +20,8 @@ class BaseSkill(ABC):
             
         self.sheet_writer = SheetWriter()
         self.slack = SlackNotifier()
-        self.alert_engine = AlertEngine()
+        # 지표 창과 알림 중복 방지 기록을 모든 스킬이 공유하도록 전역 인스턴스 사용
+        self.alert_engine = alert_engine
     
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -27,34 +33,41 @@ class BaseSkill(ABC):
         Returns:
             처리된 결과
         """
-        try:
-            # 실행 시작 로깅
-            logger.info(f"{self.skill_name} 실행 시작")
-            start_time = datetime.utcnow()
-            
-            # 입력 데이터 검증
-            if not await self.validate_input(input_data):
-                raise ValueError("잘못된 입력 데이터")
+        with start_span("skill.run", skill=self.skill_name):
+            try:
+                # 실행 시작 로깅
+                logger.info("%s 실행 시작", self.skill_name, extra={"skill": self.skill_name, **throttled(50)})
+                start_time = datetime.utcnow()
             
-            # 메인 프로세스 실행
-            result = await self._process_internal(input_data)
+                # 입력 데이터 검증
+                await self.ensure_valid(input_data)
             
-            # 결과 후처리
-            processed_result = await self._post_process(result)
+                # 메인 프로세스 실행
+                result = await self._process_internal(input_data)
             
-            # 실행 완료 처리
-            await self.on_after_run(processed_result, start_time)
+                # 결과 후처리
+                processed_result = await self._post_process(result)
             
-            return processed_result
+                duration = (datetime.utcnow() - start_time).total_seconds()
+
+                # 실행 완료 처리
+                await self.on_after_run(processed_result, start_time)
+
+                # 실행 지표 기록 (오류율, 소요 시간 백분위 규칙 평가)
+                await self.alert_engine.record(self.skill_name, success=True, duration=duration)
             
-        except Exception as e:
-            error_msg = f"{self.skill_name} 실행 중 오류 발생: {str(e)}"
-            logger.error(error_msg)
+                return processed_result
             
-            # 오류 알림 전송
-            await self._handle_error(error_msg, input_data)
-            raise
+            except Exception as e:
+                error_msg = f"{self.skill_name} 실행 중 오류 발생: {str(e)}"
+                logger.error(error_msg)
+
+                await self.alert_engine.record(self.skill_name, success=False)
             
+                # 오류 알림 전송
+                await self._handle_error(error_msg, input_data)
+                raise
+
     @abstractmethod
     async def _process_internal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -72,6 +85,8 @@ class BaseSkill(ABC):
         """
         입력 데이터의 유효성을 검사합니다.
         
+        이유를 전달하려면 False 대신 InvalidInput 을 발생시킬 수 있습니다.
+        
         Args:
             input_data: 검사할 입력 데이터
             
@@ -79,6 +94,16 @@ class BaseSkill(ABC):
             검사 결과
         """
         return True
+
+    async def ensure_valid(self, input_data: Dict[str, Any]) -> None:
+        """
+        입력 데이터를 검사하고, 올바르지 않으면 InvalidInput 을 발생시킵니다.
+        
+        Raises:
+            InvalidInput: validate_input 이 False 를 반환하거나 InvalidInput 을 발생시킨 경우
+        """
+        if not await self.validate_input(input_data):
+            raise InvalidInput(f"{self.skill_name}: 잘못된 입력 데이터")
         
     async def _post_process(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, Optional, TypeVar
+from config.logger import logger
+
+T = TypeVar("T")
+
+# 요청 기본 시간 예산 (초)과 헤더로 요청할 수 있는 최대값
+DEFAULT_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "60"))
+MAX_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT_MAX", "600"))
+
+# 스킬별 기본 시간 예산 (초)
+DEFAULT_SKILL_TIMEOUTS: Dict[str, float] = {
+    "summarize": 30,
+    "summarizer": 30,
+    "checklist_extractor": 45,
+    "field_reporter": 90,
+    "ppt_writer": 120,
+    "voice_memo_summarizer": 300,
+    "logis_summarizer": 30,
+}
+
+# 클라이언트가 시간 예산을 지정하는 헤더 (초 단위)
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def _load_skill_timeouts() -> Dict[str, float]:
+    """SKILL_TIMEOUTS="ppt_writer=180,summarizer=20" 형식의 환경 변수로 기본값을 덮어씁니다."""
+    timeouts = dict(DEFAULT_SKILL_TIMEOUTS)
+    raw = os.getenv("SKILL_TIMEOUTS", "")
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        try:
+            name, seconds = item.split("=", 1)
+            timeouts[name.strip()] = float(seconds)
+        except ValueError:
+            logger.warning("잘못된 SKILL_TIMEOUTS 항목 무시: %s", item)
+    return timeouts
+
+
+SKILL_TIMEOUTS = _load_skill_timeouts()
+
+# 현재 요청의 마감 시각 (time.monotonic 기준, 없으면 None)
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """요청의 시간 예산을 모두 사용했을 때 발생합니다."""
+
+    def __init__(self, operation: str):
+        super().__init__(f"시간 예산 초과: {operation}")
+        self.operation = operation
+
+
+class ClientDisconnected(Exception):
+    """클라이언트 연결이 끊겨 처리 중인 작업을 취소했을 때 발생합니다."""
+
+
+def resolve_timeout(header_value: Optional[str], name: str) -> float:
+    """헤더 값이 있으면 그 값을, 없으면 스킬별 기본값을 시간 예산으로 사용합니다."""
+    default = SKILL_TIMEOUTS.get(name, DEFAULT_TIMEOUT)
+    if not header_value:
+        return default
+    try:
+        requested = float(header_value)
+    except ValueError:
+        return default
+    return min(max(requested, 0.1), MAX_TIMEOUT)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    현재 컨텍스트에 시간 예산을 설정합니다.
+
+    이미 더 이른 마감 시각이 있으면 그 값을 유지합니다.
+    seconds 가 None 이면 마감 시각을 해제합니다 (백그라운드 작업용).
+    """
+    current = _deadline.get()
+    if seconds is None:
+        new_deadline = None
+    else:
+        new_deadline = time.monotonic() + seconds
+        if current is not None:
+            new_deadline = min(current, new_deadline)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 예산 (초). 예산이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str) -> None:
+    """예산을 이미 다 썼으면 DeadlineExceeded 를 발생시킵니다."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(operation)
+
+
+async def with_deadline(awaitable: Awaitable[T], operation: str) -> T:
+    """남은 시간 예산 안에서만 awaitable 을 기다립니다."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        # 시작하지 않은 코루틴 경고 방지
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(operation)
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded(operation) from e
+
+
+async def cancel_on_disconnect(request: Any, awaitable: Awaitable[T], poll_interval: float = 0.5) -> T:
+    """
+    클라이언트 연결이 끊기면 진행 중인 작업을 취소합니다.
+
+    Args:
+        request: is_disconnected() 를 제공하는 요청 객체 (starlette Request)
+        awaitable: 실행할 작업
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+                raise ClientDisconnected("클라이언트 연결이 끊어졌습니다.")
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
@@ -0,0 +1,385 @@
+"""
+피드백 감정/키워드 로컬 태거.
+
+클라이언트가 emotion/keywords 를 비워 보낸 피드백에 서버에서 태그를 채웁니다.
+항목마다 LLM 을 부르지 않고, 감정 사전 + 배치 단위 numpy 연산으로 CPU 에서 처리합니다.
+
+- 감정: 토큰 앞부분이 사전의 어간과 맞으면 가중치를 더함 (예: "좋아요" → "좋" +1).
+  "안/못" 은 다음 토큰, "않/없/아니" 는 앞 토큰의 부호를 뒤집음 ("좋지 않아요", "오류 없이")
+- 키워드: 조사/어미를 떼어 낸 2글자 이상 단어를 TF-IDF(배치 안 문서 빈도)로 골라 상위 N개
+
+같은 토큰은 배치 안에서 한 번만, 배치 사이에서도 캐시로 한 번만 분석하므로
+짧은 피드백 기준 초당 수만 건을 처리합니다.
+
+- 사전 추가: FEEDBACK_TAG_LEXICON (JSON 파일 경로, {"positive": {...} | [...], "negative": ..., "stopwords": [...]})
+- 키워드 수: FEEDBACK_TAG_MAX_KEYWORDS (기본값 5)
+
+단건 제출은 저장·응답 후 백그라운드에서 TagBatcher 가 몇 ms 동안 모아 한 번에 태깅 스레드 풀에서 처리하고
+(FEEDBACK_TAG_BATCH_*), 일괄 제출은 저장 전에 FEEDBACK_TAG_CHUNK_SIZE 단위로 나눠 처리합니다. 이벤트 루프에서는 태깅하지 않습니다.
+
+사용 예:
+    emotion, keywords = feedback_tagger.tag("PPT 생성이 빠르고 정확해요")
+    emotion, keywords = await feedback_tags.tag(text)       # 단건 (모아서 처리)
+    results = await feedback_tags.tag_many(texts)           # 일괄
+"""
+import asyncio
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from config.logger import logger
+from core.deadline import deadline_scope
+from utils.offload import run_blocking
+
+FEEDBACK_TAG_LEXICON = os.getenv("FEEDBACK_TAG_LEXICON", "")
+FEEDBACK_TAG_MAX_KEYWORDS = int(os.getenv("FEEDBACK_TAG_MAX_KEYWORDS", "5"))
+FEEDBACK_TAG_BATCH_SIZE = int(os.getenv("FEEDBACK_TAG_BATCH_SIZE", "256"))
+FEEDBACK_TAG_BATCH_WAIT = float(os.getenv("FEEDBACK_TAG_BATCH_WAIT_MS", "5")) / 1000
+# 일괄 제출을 태깅할 때 스레드 작업 하나에 넣는 항목 수 (사이사이 이벤트 루프가 GIL 을 받음)
+FEEDBACK_TAG_CHUNK_SIZE = int(os.getenv("FEEDBACK_TAG_CHUNK_SIZE", "2000"))
+
+# 태깅 전용 스레드 풀 (utils/offload.py)
+TAG_POOL = "tagging"
+
+POSITIVE = "positive"
+NEUTRAL = "neutral"
+NEGATIVE = "negative"
+
+# 어간(토큰 앞부분) → 가중치. 더 긴 어간이 우선 ("잘못" 은 "잘" 보다 먼저)
+_POSITIVE: Dict[str, float] = {
+    "좋": 1.0, "만족": 1.0, "정확": 1.0, "편리": 1.0, "편하": 1.0, "편해": 1.0, "도움": 1.0,
+    "훌륭": 1.0, "최고": 1.0, "감사": 1.0, "고마": 1.0, "고맙": 1.0, "빠르": 1.0, "빨라": 1.0,
+    "빠른": 1.0, "유용": 1.0, "깔끔": 1.0, "완벽": 1.0, "효율": 1.0, "추천": 1.0, "멋지": 1.0,
+    "멋져": 1.0, "대박": 1.0, "쉽": 1.0, "쉬워": 1.0, "간편": 1.0, "꼼꼼": 1.0, "잘": 0.5,
+    "good": 1.0, "great": 1.0, "love": 1.0, "helpful": 1.0, "useful": 1.0, "fast": 1.0,
+    "accurate": 1.0, "easy": 1.0, "excellent": 1.0, "perfect": 1.0, "thank": 1.0, "nice": 1.0,
+}
+_NEGATIVE: Dict[str, float] = {
+    "아쉽": 1.0, "아쉬": 1.0, "불편": 1.0, "느리": 1.0, "느려": 1.0, "늦": 1.0, "오류": 1.0,
+    "에러": 1.0, "버그": 1.0, "틀리": 1.0, "틀렸": 1.0, "틀려": 1.0, "부정확": 1.0, "별로": 1.0,
+    "실망": 1.0, "최악": 1.0, "불만": 1.0, "문제": 1.0, "어렵": 1.0, "어려": 1.0, "복잡": 1.0,
+    "답답": 1.0, "짜증": 1.0, "잘못": 1.0, "불안": 1.0, "누락": 1.0, "끊기": 1.0, "끊겨": 1.0,
+    "실패": 1.0, "엉망": 1.0, "개선": 0.5,
+    "bad": 1.0, "slow": 1.0, "bug": 1.0, "error": 1.0, "wrong": 1.0, "hate": 1.0, "poor": 1.0,
+    "broken": 1.0, "fail": 1.0, "issue": 0.5, "terrible": 1.0, "useless": 1.0,
+}
+
+# 다음 토큰을 부정 ("안 좋아요", "못 쓰겠어요") / 앞 토큰을 부정 ("좋지 않아요", "문제 없어요")
+_PRE_NEGATORS = frozenset({"안", "못", "not", "no", "never"})
+_POST_NEGATORS = ("않", "없", "아니")
+
+# 키워드에서 빼는 단어 (조사/어미를 뗀 뒤 기준)
+_STOPWORDS = frozenset({
+    "그리고", "그런데", "하지만", "그래서", "너무", "정말", "진짜", "아주", "매우", "조금", "많이",
+    "이번", "다음", "기능", "사용", "경우", "부분", "생각", "정도", "때문", "이거", "저거", "그거",
+    "그냥", "저희", "우리", "제가", "내가", "크게", "항상", "가끔", "모두", "전부", "계속", "바로",
+    "the", "and", "for", "with", "this", "that", "was", "are", "but", "you", "not", "very",
+    "its", "it's", "have", "has", "from", "just", "really",
+})
+
+# 단어 끝에서 떼어 낼 조사/어미 (긴 것부터 시도, 남는 부분이 2글자 이상일 때만)
+_SUFFIXES = tuple(sorted({
+    "했습니다", "합니다", "했어요", "해요", "하고", "하는", "하게", "해서", "했고", "하여", "하다",
+    "입니다", "이에요", "예요", "에서는", "에서", "으로는",
+    "으로", "까지", "부터", "처럼", "보다", "에게", "한테", "이랑", "이나", "이고", "이라", "랑",
+    "이", "가", "은", "는", "을", "를", "에", "의", "로", "와", "과", "도", "만", "들", "적",
+}, key=len, reverse=True))
+
+# 조사/어미를 떼지 못한 한글 단어가 이 글자로 끝나면 서술어로 보고 키워드에서 뺌 ("빠르고", "됩니다")
+_PREDICATE_ENDINGS = ("요", "다", "고", "게", "며", "면", "데", "야")
+# 감정 단어는 연결 어미도 서술어로 봄 ("좋지", "느려서")
+_SENTIMENT_ENDINGS = _PREDICATE_ENDINGS + ("지", "서", "니", "어", "아")
+
+_TOKEN = re.compile(r"[0-9A-Za-z가-힣]+(?:'[a-z]+)?")
+_HANGUL = re.compile(r"[가-힣]")
+
+# 토큰 분석 캐시 최대 크기 (넘으면 비움)
+_CACHE_MAX = 200_000
+
+
+def _stem(token: str) -> str:
+    """한글 단어 끝의 조사/어미를 떼어 냅니다."""
+    if _HANGUL.search(token):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                return token[:-len(suffix)]
+    return token
+
+
+def _is_predicate(token: str, term: str, weight: float) -> bool:
+    if term != token or not _HANGUL.search(token):
+        return False
+    return token.endswith(_SENTIMENT_ENDINGS if weight else _PREDICATE_ENDINGS)
+
+
+class FeedbackTagger:
+    """
+    감정 사전과 TF-IDF 로 피드백 감정/키워드를 매기는 로컬 태거.
+
+    Args:
+        positive: 긍정 어간 → 가중치 (기본 사전에 추가)
+        negative: 부정 어간 → 가중치 (기본 사전에 추가)
+        stopwords: 키워드에서 뺄 단어 (기본 목록에 추가)
+        max_keywords: 항목별 최대 키워드 수
+        threshold: 감정 점수가 이 값 이상이면 긍정, -threshold 이하이면 부정
+    """
+
+    def __init__(self,
+                 positive: Optional[Dict[str, float]] = None,
+                 negative: Optional[Dict[str, float]] = None,
+                 stopwords: Iterable[str] = (),
+                 max_keywords: int = FEEDBACK_TAG_MAX_KEYWORDS,
+                 threshold: float = 0.5):
+        weights = {stem: weight for stem, weight in _POSITIVE.items()}
+        weights.update({stem: -weight for stem, weight in _NEGATIVE.items()})
+        weights.update({stem.lower(): float(w) for stem, w in (positive or {}).items()})
+        weights.update({stem.lower(): -float(w) for stem, w in (negative or {}).items()})
+        # 긴 어간부터 맞춰 보기 위해 길이 내림차순
+        self._lexicon: List[Tuple[str, float]] = sorted(weights.items(), key=lambda item: len(item[0]), reverse=True)
+        self._stopwords = _STOPWORDS | {word.lower() for word in stopwords}
+        self.max_keywords = max(0, max_keywords)
+        self.threshold = threshold
+        # 토큰(소문자) → (감정 가중치, 부정어 종류, 키워드 후보)
+        self._cache: Dict[str, Tuple[float, int, Optional[str]]] = {}
+        self.tagged = 0
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls, path: str = FEEDBACK_TAG_LEXICON) -> "FeedbackTagger":
+        """FEEDBACK_TAG_LEXICON 의 사전 파일을 더한 태거 (파일이 없거나 잘못되면 기본 사전만 사용)"""
+        if not path:
+            return cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                extra = json.load(f)
+            return cls(
+                positive=_weights(extra.get("positive")),
+                negative=_weights(extra.get("negative")),
+                stopwords=extra.get("stopwords") or (),
+            )
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("감정 사전 파일을 읽지 못해 기본 사전을 사용합니다 (%s): %s", path, e)
+            return cls()
+
+    def tag(self, text: str) -> Tuple[str, List[str]]:
+        """피드백 하나의 (감정, 키워드 목록)"""
+        return self.tag_batch([text])[0]
+
+    def tag_batch(self, texts: Sequence[str]) -> List[Tuple[str, List[str]]]:
+        """
+        여러 피드백의 (감정, 키워드 목록)을 입력 순서대로 반환합니다.
+
+        배치가 클수록 토큰 분석과 IDF 가 공유되어 항목당 비용이 줄어듭니다.
+        """
+        n = len(texts)
+        if n == 0:
+            return []
+
+        # 1) 토큰화: 등장마다 (문서 번호, 배치 어휘 번호)
+        vocab: Dict[str, int] = {}
+        surfaces: List[str] = []
+        doc_ids: List[int] = []
+        token_ids: List[int] = []
+        for doc, text in enumerate(texts):
+            for surface in _TOKEN.findall(text):
+                token = surface.lower()
+                index = vocab.get(token)
+                if index is None:
+                    index = vocab[token] = len(surfaces)
+                    surfaces.append(surface)
+                doc_ids.append(doc)
+                token_ids.append(index)
+
+        # 2) 어휘별 분석 (캐시)
+        analyses = [self._analyze(token) for token in vocab]
+        weight = np.array([a[0] for a in analyses], dtype=np.float64)
+        negator = np.array([a[1] for a in analyses], dtype=np.int8)
+
+        docs = np.array(doc_ids, dtype=np.int64)
+        tokens = np.array(token_ids, dtype=np.int64)
+
+        # 3) 감정 점수: 부정어 앞/뒤 토큰의 부호를 뒤집어 문서별 합산
+        scores = np.zeros(n)
+        if len(tokens):
+            w = weight[tokens]
+            neg = negator[tokens]
+            same_doc = docs[1:] == docs[:-1]
+            flip = np.ones_like(w)
+            flip[:-1][(neg[1:] == 2) & same_doc] = -1.0   # "좋지 않아요": 앞 토큰
+            flip[1:][(neg[:-1] == 1) & same_doc] = -1.0   # "안 좋아요": 다음 토큰
+            scores = np.bincount(docs, weights=w * flip, minlength=n)
+
+        emotions = np.where(scores >= self.threshold, POSITIVE,
+                            np.where(scores <= -self.threshold, NEGATIVE, NEUTRAL))
+
+        keywords = self._keywords(n, docs, tokens, analyses, surfaces)
+
+        self.tagged += n
+        self.batches += 1
+        return [(str(emotions[i]), keywords[i]) for i in range(n)]
+
+    def _keywords(self,
+                  n: int,
+                  docs: np.ndarray,
+                  tokens: np.ndarray,
+                  analyses: List[Tuple[float, int, Optional[str]]],
+                  surfaces: List[str]) -> List[List[str]]:
+        """문서별 TF-IDF 상위 키워드 (같은 점수면 먼저 나온 단어)"""
+        result: List[List[str]] = [[] for _ in range(n)]
+        if not self.max_keywords or not len(tokens):
+            return result
+
+        # 어휘 번호 → 키워드 번호 (후보가 아니면 -1). 표시는 처음 나온 표기 (예: "PPT")
+        terms: Dict[str, int] = {}
+        display: List[str] = []
+        term_of_token = np.full(len(analyses), -1, dtype=np.int64)
+        for index, (_, _, term) in enumerate(analyses):
+            if term is None:
+                continue
+            term_id = terms.get(term)
+            if term_id is None:
+                term_id = terms[term] = len(display)
+                display.append(_stem(surfaces[index]))
+            term_of_token[index] = term_id
+
+        term_ids = term_of_token[tokens]
+        mask = term_ids >= 0
+        if not mask.any():
+            return result
+        t = len(display)
+        pairs = docs[mask] * t + term_ids[mask]
+        positions = np.flatnonzero(mask)
+
+        # (문서, 키워드) 쌍별 빈도와 첫 등장 위치
+        unique, first, counts = np.unique(pairs, return_index=True, return_counts=True)
+        pair_docs = unique // t
+        pair_terms = unique % t
+        df = np.bincount(pair_terms, minlength=t)
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+        score = counts * idf[pair_terms]
+
+        # 문서 오름차순 → 점수 내림차순 → 첫 등장 순
+        order = np.lexsort((positions[first], -score, pair_docs))
+        pair_docs = pair_docs[order]
+        pair_terms = pair_terms[order]
+        starts = np.searchsorted(pair_docs, np.arange(n), side="left")
+        ends = np.searchsorted(pair_docs, np.arange(n), side="right")
+        limit = self.max_keywords
+        for doc in np.flatnonzero(ends > starts):
+            start = starts[doc]
+            result[doc] = [display[term] for term in pair_terms[start:min(ends[doc], start + limit)]]
+        return result
+
+    def _analyze(self, token: str) -> Tuple[float, int, Optional[str]]:
+        """토큰 → (감정 가중치, 부정어 종류 0/1(다음 토큰)/2(앞 토큰), 키워드 후보)"""
+        cached = self._cache.get(token)
+        if cached is not None:
+            return cached
+
+        negator = 1 if token in _PRE_NEGATORS else 2 if token.startswith(_POST_NEGATORS) else 0
+        weight = 0.0
+        if not negator:
+            for stem, value in self._lexicon:
+                if token.startswith(stem):
+                    weight = value
+                    break
+
+        term: Optional[str] = _stem(token)
+        if (negator or len(term) < 2 or term.isdigit() or term in self._stopwords
+                or _is_predicate(token, term, weight) or (not _HANGUL.search(term) and len(term) < 3)):
+            term = None
+
+        if len(self._cache) >= _CACHE_MAX:
+            self._cache.clear()
+        result = self._cache[token] = (weight, negator, term)
+        return result
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"tagged": self.tagged, "batches": self.batches, "cached_tokens": len(self._cache)}
+
+
+def _weights(entries: Union[Dict[str, float], Sequence[str], None]) -> Dict[str, float]:
+    """사전 파일의 어간 목록(가중치 1) 또는 어간 → 가중치 dict"""
+    if not entries:
+        return {}
+    if isinstance(entries, dict):
+        return {str(stem): float(weight) for stem, weight in entries.items()}
+    return {str(stem): 1.0 for stem in entries}
+
+
+class TagBatcher:
+    """
+    단건 태깅 요청을 잠깐 모아 배치로 처리하는 백그라운드 배처.
+
+    요청은 max_wait 동안 또는 max_batch 개가 찰 때까지 모였다가 태깅 스레드 풀에서 한 번에 처리됩니다.
+    배치는 요청의 시간 예산과 무관하게 끝까지 실행하며, 기다리던 요청이 취소되어도 다른 요청에는 영향이 없습니다.
+
+    Args:
+        tagger: 사용할 태거
+        max_batch: 배치 최대 항목 수
+        max_wait: 첫 요청 후 배치를 모으는 최대 시간 (초)
+    """
+
+    def __init__(self,
+                 tagger: FeedbackTagger,
+                 max_batch: int = FEEDBACK_TAG_BATCH_SIZE,
+                 max_wait: float = FEEDBACK_TAG_BATCH_WAIT,
+                 chunk_size: int = FEEDBACK_TAG_CHUNK_SIZE):
+        self.tagger = tagger
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self.chunk_size = max(1, chunk_size)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def tag(self, text: str) -> Tuple[str, List[str]]:
+        """피드백 하나의 (감정, 키워드 목록). 같은 시기의 다른 요청과 묶어 처리합니다."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def tag_many(self, texts: Sequence[str]) -> List[Tuple[str, List[str]]]:
+        """여러 피드백의 (감정, 키워드 목록) (일괄 제출용, chunk_size 단위로 나눠 처리)"""
+        results: List[Tuple[str, List[str]]] = []
+        for start in range(0, len(texts), self.chunk_size):
+            results.extend(await run_blocking(TAG_POOL, self.tagger.tag_batch, texts[start:start + self.chunk_size]))
+        return results
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            # 배치를 시작한 요청의 시간 예산이 다른 요청의 결과를 끊지 않도록 해제
+            with deadline_scope(None):
+                results = await run_blocking(TAG_POOL, self.tagger.tag_batch, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"pending": len(self._pending), "running_batches": len(self._tasks), **self.tagger.snapshot()}
+
+
+# 전역 태거와 배처
+feedback_tagger = FeedbackTagger.from_env()
+feedback_tags = TagBatcher(feedback_tagger)
@@ -0,0 +1,301 @@
+"""
+LLM 스트리밍 응답용 점진적 JSON 파서.
+
+응답 조각을 받는 대로 넣으면, 지켜보는 경로(예: ("slides", "*"))의 값이 완성되는 즉시 돌려줍니다.
+전체 응답을 기다리지 않고 슬라이드/체크리스트 항목을 검증하고 클라이언트에 보낼 수 있습니다.
+
+LLM 이 흔히 내는 형식 오류는 응답을 버리지 않고 로컬에서 고칩니다.
+- JSON 앞뒤의 설명 문장과 코드 펜스(```json ... ```)는 무시
+  (설명 문장 속 괄호를 루트로 잡았다가 JSON 이 아니면 다음 괄호부터 다시 찾음)
+- 닫는 괄호 앞의 불필요한 쉼표 제거
+- 중간에 끊긴 응답은 마지막으로 완성된 값까지 살리고(끊긴 문자열은 닫아서) 괄호를 닫음
+
+사용 예:
+    parser = JsonStreamParser(watch=[("slides", "*")])
+    async for chunk in prompt_engine.stream_prompt(prompt):
+        for path, slide in parser.feed(chunk):
+            ...
+    document = parser.finish()
+"""
+import json
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+# 값의 위치: 객체 키(str)와 배열 인덱스(int)의 열. 루트 값은 ()
+JsonPath = Tuple[Union[str, int], ...]
+
+# 지켜보는 경로에서 배열의 모든 원소를 뜻하는 표시
+ANY_INDEX = "*"
+
+_DELIMITERS = frozenset(",}] \t\r\n")
+
+
+class _Frame:
+    """열려 있는 객체/배열과 그 안에서 현재 값의 위치"""
+
+    __slots__ = ("kind", "key", "index", "expect_key")
+
+    def __init__(self, kind: str):
+        self.kind = kind  # "{" 또는 "["
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = kind == "{"
+
+    @property
+    def slot(self) -> Union[str, int]:
+        return self.key if self.kind == "{" else self.index
+
+
+class JsonStreamParser:
+    """
+    조각 단위로 입력받는 JSON 파서.
+
+    Args:
+        watch: 완성되는 즉시 돌려받을 값의 경로 목록 ("*" 는 배열의 모든 원소)
+    """
+
+    def __init__(self, watch: Sequence[Sequence[Union[str, int]]] = ()):
+        self.watch = [tuple(path) for path in watch]
+        self.repaired = False
+        self._text = ""
+        self._pos = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._document: Any = None
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._primitive_start: Optional[int] = None
+        # 완성을 기다리는 지켜보는 값 (경로, 시작 위치, 깊이)
+        self._open: List[Tuple[JsonPath, int, int]] = []
+        # 닫는 괄호 바로 앞이라 지워야 하는 쉼표 위치
+        self._commas: List[int] = []
+        self._last_comma: Optional[int] = None
+        # 여기까지 자르고 괄호만 닫으면 올바른 JSON 이 되는 위치와 닫는 괄호
+        self._safe: Tuple[int, str] = (0, "")
+
+    @property
+    def done(self) -> bool:
+        """루트 값이 끝났는지 여부 (이후 입력은 무시)"""
+        return self._root_end is not None
+
+    def feed(self, chunk: str) -> List[Tuple[JsonPath, Any]]:
+        """응답 조각을 넣고, 이번에 완성된 지켜보는 값들을 (경로, 값) 목록으로 반환합니다."""
+        events: List[Tuple[JsonPath, Any]] = []
+        if self.done or not chunk:
+            return events
+        self._text += chunk
+        text = self._text
+        i, n = self._pos, len(text)
+
+        while i < n and self._root_end is None:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        self._stack[-1].key = _decode_string(text[self._string_start:i + 1])
+                    else:
+                        self._end_value(i + 1, events)
+                i += 1
+                continue
+
+            if self._primitive_start is not None:
+                if c not in _DELIMITERS:
+                    i += 1
+                    continue
+                # 숫자/true/false/null 이 끝남. 구분 문자는 아래에서 이어서 처리
+                start, self._primitive_start = self._primitive_start, None
+                if not _is_primitive(text[start:i]):
+                    i = self._restart()
+                    continue
+                self._end_value(i, events)
+
+            if self._root_start is None:
+                # JSON 앞의 설명 문장/코드 펜스 건너뛰기
+                if c not in "{[":
+                    i += 1
+                    continue
+                self._root_start = i
+            elif self._misplaced(c):
+                i = self._restart()
+                continue
+
+            if c in "{[":
+                self._begin_value(i)
+                self._stack.append(_Frame(c))
+                self._safe = (i + 1, self._closers())
+            elif c in "}]":
+                if self._last_comma is not None:
+                    self._commas.append(self._last_comma)
+                    self._last_comma = None
+                self._stack.pop()
+                self._end_value(i + 1, events)
+                if self.done:
+                    try:
+                        self._document = json.loads(self._slice(self._root_start, self._root_end))
+                    except ValueError:
+                        i = self._restart()
+                        continue
+            elif c == '"':
+                top = self._stack[-1]
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = top.kind == "{" and top.expect_key
+                if self._string_is_key:
+                    self._last_comma = None
+                else:
+                    self._begin_value(i)
+            elif c == ":":
+                self._stack[-1].expect_key = False
+            elif c == ",":
+                top = self._stack[-1]
+                if top.kind == "[":
+                    top.index += 1
+                else:
+                    top.expect_key = True
+                self._last_comma = i
+            elif not c.isspace():
+                self._begin_value(i)
+                self._primitive_start = i
+            i += 1
+
+        self._pos = i
+        return events
+
+    def finish(self) -> Any:
+        """
+        입력이 끝났을 때 전체 문서를 반환합니다. 끊긴 응답은 복구하고 repaired 를 True 로 둡니다.
+
+        Raises:
+            ValueError: JSON 이 없거나 복구할 수 없는 경우
+        """
+        if self._root_start is None:
+            raise ValueError("응답에서 JSON 을 찾을 수 없습니다")
+        if self._root_end is not None:
+            if self._commas:
+                self.repaired = True
+            return self._document
+
+        self.repaired = True
+        end = len(self._text)
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            # 끊긴 문자열 값은 닫아서 살림 (끝의 이스케이프 문자는 버림)
+            body = self._slice(self._root_start, end - 1 if self._escape else end)
+            candidates.append(body + '"' + self._closers())
+        elif self._primitive_start is not None:
+            candidates.append(self._slice(self._root_start, end) + self._closers())
+        safe_end, closers = self._safe
+        candidates.append(self._slice(self._root_start, safe_end) + closers)
+
+        for candidate in candidates:
+            try:
+                return json.loads(candidate)
+            except ValueError:
+                continue
+        raise ValueError("끊긴 JSON 응답을 복구할 수 없습니다")
+
+    def _misplaced(self, c: str) -> bool:
+        """열린 객체/배열 안에서 c 가 올 수 없는 자리인지 (후보 루트가 JSON 이 아님)"""
+        if c.isspace():
+            return False
+        top = self._stack[-1]
+        if c in "}]":
+            return c != ("}" if top.kind == "{" else "]")
+        if top.kind == "[":
+            return c == ":"
+        # 객체의 키 자리에는 문자열(또는 키 뒤의 콜론, 닫는 괄호)만 올 수 있음
+        return top.expect_key and c not in '":'
+
+    def _restart(self) -> int:
+        """
+        후보 루트를 버리고 그 다음 글자부터 루트를 다시 찾습니다 (다시 읽을 위치 반환).
+
+        설명 문장 속 괄호(예: "[참고]")를 루트로 잡은 경우입니다. 그 사이에 돌려준 지켜보는 값은 되돌리지 않습니다.
+        """
+        position = self._root_start + 1
+        self._root_start = self._root_end = None
+        self._stack = []
+        self._in_string = self._escape = False
+        self._primitive_start = None
+        self._open = []
+        self._commas = []
+        self._last_comma = None
+        self._safe = (0, "")
+        return position
+
+    def _path(self) -> JsonPath:
+        return tuple(frame.slot for frame in self._stack)
+
+    def _watched(self, path: JsonPath) -> bool:
+        for pattern in self.watch:
+            if len(pattern) == len(path) and all(
+                p == c or (p == ANY_INDEX and isinstance(c, int)) for p, c in zip(pattern, path)
+            ):
+                return True
+        return False
+
+    def _begin_value(self, start: int) -> None:
+        self._last_comma = None
+        if self.watch:
+            path = self._path()
+            if self._watched(path):
+                self._open.append((path, start, len(self._stack)))
+
+    def _end_value(self, end: int, events: List[Tuple[JsonPath, Any]]) -> None:
+        depth = len(self._stack)
+        if self._open and self._open[-1][2] == depth:
+            path, start, _ = self._open.pop()
+            try:
+                events.append((path, json.loads(self._slice(start, end))))
+            except ValueError:
+                # 형식이 깨진 값은 건너뜀 (전체 문서는 finish 에서 다시 판단)
+                pass
+        if depth == 0:
+            self._root_end = end
+        self._safe = (end, self._closers())
+
+    def _closers(self) -> str:
+        return "".join("}" if frame.kind == "{" else "]" for frame in reversed(self._stack))
+
+    def _slice(self, start: int, end: int) -> str:
+        """start~end 구간의 텍스트 (닫는 괄호 앞 쉼표는 제거)"""
+        text = self._text[start:end]
+        for position in reversed(self._commas):
+            if start <= position < end:
+                offset = position - start
+                text = text[:offset] + text[offset + 1:]
+        return text
+
+
+def _is_primitive(token: str) -> bool:
+    try:
+        json.loads(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _decode_string(literal: str) -> str:
+    try:
+        return json.loads(literal)
+    except ValueError:
+        return literal[1:-1]
+
+
+def parse_json(text: str) -> Any:
+    """
+    LLM 응답 전체를 JSON 으로 파싱합니다 (설명 문장, 코드 펜스, 불필요한 쉼표, 끊긴 응답 복구).
+
+    Raises:
+        ValueError: JSON 이 없거나 복구할 수 없는 경우
+    """
+    parser = JsonStreamParser()
+    parser.feed(text)
+    return parser.finish()
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+from config.logger import logger
+
+# 프로젝트 코드 경로 (블로킹 호출 위치를 찾을 때 라이브러리 프레임과 구분)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopMonitor:
+    """
+    이벤트 루프 지연(lag) 측정과 블로킹 호출 감지.
+
+    루프 안의 하트비트 태스크가 interval 마다 깨어나며 지연을 측정하고,
+    별도 감시 스레드는 하트비트가 threshold 이상 멈추면 루프 스레드의 스택을 캡처해
+    어떤 호출 위치가 루프를 막고 있는지 기록합니다.
+    """
+
+    def __init__(self,
+                 interval: float = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5")),
+                 threshold: float = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1")),
+                 history: int = 100):
+        self.interval = interval
+        self.threshold = threshold
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._last_beat = time.monotonic()
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._beats = 0
+        self._current_stall: Optional[Dict[str, Any]] = None
+        self.stalls: deque = deque(maxlen=history)
+
+    def start(self) -> None:
+        """현재 실행 중인 루프에 하트비트 태스크와 감시 스레드를 붙입니다."""
+        if self._task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+
+        self._task = self._loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info("이벤트 루프 모니터 시작 (interval=%.2fs, threshold=%.2fs)", self.interval, self.threshold)
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+
+            lag = max(0.0, now - started - self.interval)
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            self._beats += 1
+            self._last_beat = now
+
+            stall = self._current_stall
+            if stall is not None:
+                # 감시 스레드가 잡아둔 블로킹 구간을 실제 지연 값으로 마무리
+                stall["duration"] = round(lag, 3)
+                self._current_stall = None
+                logger.warning(
+                    "이벤트 루프가 %.3f초 동안 블로킹됨 - %s",
+                    lag, stall["call_site"],
+                    extra={"loop_lag": lag, "call_site": stall["call_site"]}
+                )
+            elif lag >= self.threshold:
+                # 감시 주기 사이에 끝난 짧은 블로킹 (호출 위치는 알 수 없음)
+                self.stalls.append({
+                    "started_at": time.time() - lag,
+                    "duration": round(lag, 3),
+                    "call_site": "unknown",
+                    "stack": [],
+                })
+
+    def _watch(self) -> None:
+        check_every = max(self.threshold / 2, 0.01)
+        while not self._stop.wait(check_every):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue < self.threshold or self._current_stall is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            stack = traceback.extract_stack(frame)
+            stall = {
+                "started_at": time.time() - overdue,
+                "duration": None,  # 루프가 돌아오면 하트비트가 채움
+                "call_site": self._find_call_site(stack),
+                "stack": [f"{f.filename}:{f.lineno} in {f.name}" for f in stack[-8:]],
+            }
+            self._current_stall = stall
+            self.stalls.append(stall)
+
+    @staticmethod
+    def _find_call_site(stack: List[traceback.FrameSummary]) -> str:
+        """스택에서 가장 안쪽의 프로젝트 코드 프레임을 호출 위치로 봅니다."""
+        for frame in reversed(stack):
+            if frame.filename.startswith(_PROJECT_ROOT) and "site-packages" not in frame.filename:
+                path = os.path.relpath(frame.filename, _PROJECT_ROOT)
+                return f"{path}:{frame.lineno} in {frame.name}"
+        last = stack[-1]
+        return f"{last.filename}:{last.lineno} in {last.name}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 루프 지연과 최근 블로킹 기록"""
+        return {
+            "last_lag": round(self._last_lag, 4),
+            "max_lag": round(self._max_lag, 4),
+            "beats": self._beats,
+            "blocked_now": self._current_stall is not None,
+            "stalls": list(self.stalls)[-20:],
+        }
+
+# 전역 LoopMonitor 인스턴스
+loop_monitor = LoopMonitor()
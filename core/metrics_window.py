@@ -0,0 +1,200 @@
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 시간 창에서 집계하는 카운터 이름 (슬롯마다 고정 배열로 보관)
+COUNTERS: Tuple[str, ...] = ("events", "errors", "timeouts", "cancelled")
+
+# 소요 시간 히스토그램 버킷 경계 (초, 로그 스케일). 마지막 버킷은 상한 없음
+DURATION_BUCKETS: Tuple[float, ...] = tuple(
+    round(0.01 * (2 ** (i / 2)), 4) for i in range(36)
+)
+
+
+def _bucket_index(value: float) -> int:
+    """소요 시간이 속하는 히스토그램 버킷 번호를 반환합니다."""
+    if value <= DURATION_BUCKETS[0]:
+        return 0
+    # 경계가 2^(1/2) 배씩 증가하므로 로그로 바로 계산
+    idx = math.ceil(2 * math.log2(value / DURATION_BUCKETS[0]) - 1e-9)
+    return min(idx, len(DURATION_BUCKETS))
+
+
+class RollingWindow:
+    """
+    초 단위 슬롯을 가진 고정 크기 링 버퍼 시간 창.
+
+    슬롯이 만료될 때 해당 슬롯의 값을 누적 합계에서 빼므로
+    이벤트 기록과 비율 조회가 모두 O(1)이고, 백분위 조회는 버킷 수에만 비례합니다.
+    """
+
+    def __init__(self, seconds: int, clock: Callable[[], float] = time.monotonic):
+        if seconds <= 0:
+            raise ValueError("시간 창 크기는 1초 이상이어야 합니다.")
+
+        self.seconds = seconds
+        self._clock = clock
+        n_buckets = len(DURATION_BUCKETS) + 1
+
+        self._counts: List[List[int]] = [[0] * len(COUNTERS) for _ in range(seconds)]
+        self._hist: List[List[int]] = [[0] * n_buckets for _ in range(seconds)]
+        self._totals: List[int] = [0] * len(COUNTERS)
+        self._hist_totals: List[int] = [0] * n_buckets
+        self._last_tick = int(self._clock())
+
+    def _advance(self) -> int:
+        """현재 시각까지 만료된 슬롯을 비우고 현재 슬롯 번호를 반환합니다."""
+        now = int(self._clock())
+        elapsed = now - self._last_tick
+        if elapsed > 0:
+            # 창 전체가 지났으면 모든 슬롯만 비우면 됨
+            for tick in range(self._last_tick + 1, self._last_tick + 1 + min(elapsed, self.seconds)):
+                self._clear_slot(tick % self.seconds)
+            self._last_tick = now
+        return now % self.seconds
+
+    def _clear_slot(self, slot: int) -> None:
+        counts = self._counts[slot]
+        for i, value in enumerate(counts):
+            if value:
+                self._totals[i] -= value
+                counts[i] = 0
+
+        hist = self._hist[slot]
+        for i, value in enumerate(hist):
+            if value:
+                self._hist_totals[i] -= value
+                hist[i] = 0
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        """카운터 값을 현재 슬롯에 더합니다."""
+        slot = self._advance()
+        idx = COUNTERS.index(counter)
+        self._counts[slot][idx] += amount
+        self._totals[idx] += amount
+
+    def observe_duration(self, seconds: float) -> None:
+        """소요 시간을 히스토그램에 기록합니다."""
+        slot = self._advance()
+        idx = _bucket_index(seconds)
+        self._hist[slot][idx] += 1
+        self._hist_totals[idx] += 1
+
+    def total(self, counter: str) -> int:
+        """시간 창 전체의 카운터 합계를 반환합니다."""
+        self._advance()
+        return self._totals[COUNTERS.index(counter)]
+
+    def rate(self, numerator: str, denominator: str = "events") -> Optional[float]:
+        """두 카운터의 비율을 반환합니다 (분모가 0이면 None)."""
+        denom = self.total(denominator)
+        if denom == 0:
+            return None
+        return self.total(numerator) / denom
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        소요 시간 백분위 값을 반환합니다.
+
+        값은 해당 히스토그램 버킷의 상한이므로 최대 약 41% 까지 과대 추정될 수 있습니다.
+        마지막 경계를 넘는 값은 마지막 경계로 보고합니다.
+        """
+        self._advance()
+        count = sum(self._hist_totals)
+        if count == 0:
+            return None
+
+        rank = max(1, math.ceil(q * count))
+        seen = 0
+        for idx, value in enumerate(self._hist_totals):
+            seen += value
+            if seen >= rank:
+                return DURATION_BUCKETS[min(idx, len(DURATION_BUCKETS) - 1)]
+        return DURATION_BUCKETS[-1]
+
+    def sample_count(self) -> int:
+        """시간 창에 기록된 소요 시간 표본 수를 반환합니다."""
+        self._advance()
+        return sum(self._hist_totals)
+
+
+class CountWindow:
+    """최근 N개 값의 합계를 유지하는 링 버퍼 (예: 최근 피드백 100개의 긍정 여부)."""
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("표본 크기는 1 이상이어야 합니다.")
+
+        self.size = size
+        self._values: List[float] = [0.0] * size
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def add(self, value: float) -> None:
+        if self._count == self.size:
+            self._sum -= self._values[self._pos]
+        else:
+            self._count += 1
+        self._values[self._pos] = value
+        self._sum += value
+        self._pos = (self._pos + 1) % self.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def mean(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        return self._sum / self._count
+
+
+class SkillMetrics:
+    """스킬 하나의 시간 창과 표본 창 묶음."""
+
+    def __init__(self,
+                 windows: Iterable[int],
+                 series: Iterable[Tuple[str, int]],
+                 clock: Callable[[], float] = time.monotonic):
+        self.windows: Dict[int, RollingWindow] = {
+            seconds: RollingWindow(seconds, clock) for seconds in set(windows)
+        }
+        self.series: Dict[Tuple[str, int], CountWindow] = {
+            (name, size): CountWindow(size) for name, size in set(series)
+        }
+
+    def record(self,
+               success: bool = True,
+               duration: Optional[float] = None,
+               values: Optional[Dict[str, float]] = None) -> None:
+        """이벤트 하나를 모든 창에 기록합니다."""
+        for window in self.windows.values():
+            window.add("events")
+            if not success:
+                window.add("errors")
+            if duration is not None:
+                window.observe_duration(duration)
+
+        if values:
+            for (name, _), series in self.series.items():
+                if name in values:
+                    series.add(float(values[name]))
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """이벤트 수와 무관한 카운터만 증가시킵니다."""
+        for window in self.windows.values():
+            window.add(counter, amount)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """모니터링 조회용 현재 지표 요약."""
+        result: Dict[str, Dict[str, Optional[float]]] = {}
+        for seconds, window in sorted(self.windows.items()):
+            entry: Dict[str, Optional[float]] = {name: window.total(name) for name in COUNTERS}
+            entry["error_rate"] = window.rate("errors")
+            entry["timeout_rate"] = window.rate("timeouts")
+            entry["p50_duration"] = window.percentile(0.5)
+            entry["p95_duration"] = window.percentile(0.95)
+            result[f"{seconds}s"] = entry
+        for (name, size), series in self.series.items():
+            result[f"last_{size}_{name}"] = {"mean": series.mean(), "count": len(series)}
+        return result
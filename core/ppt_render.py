@@ -0,0 +1,270 @@
+"""
+PPT 렌더링 전용 프로세스 풀.
+
+python-pptx 는 순수 파이썬이라 스레드에서 돌려도 GIL 을 오래 잡아 이벤트 루프와 다른 요청이 느려집니다.
+여기서는 별도 워커 프로세스에서 슬라이드를 만들고 파일로 저장합니다.
+
+템플릿은 워커마다 한 번만 읽어 파싱해 두고(파일이 바뀌면 다시 읽음) 매 렌더링에 재사용합니다.
+렌더링 후에는 추가한 슬라이드를 떼어 내 템플릿을 처음 상태로 되돌리므로, 덱마다 템플릿 파일을
+다시 열거나 파싱하지 않습니다. 제목+본문 레이아웃과 본문 자리표시자도 템플릿별로 한 번만 찾습니다.
+
+- 템플릿: PPT_TEMPLATE_DIR 의 <이름>.pptx (요청의 template 으로 선택, 없으면 python-pptx 기본 템플릿)
+- 워커 수: PPT_WORKERS (기본값 2)
+
+사용 예:
+    await ppt_render_pool.render(slides_data, "output/deck.pptx", template="corporate")
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config.logger import logger
+from core.deadline import check_deadline, with_deadline
+
+PPT_TEMPLATE_DIR = os.getenv("PPT_TEMPLATE_DIR", "templates/ppt")
+PPT_WORKERS = int(os.getenv("PPT_WORKERS", "2"))
+
+DEFAULT_TEMPLATE = "default"  # python-pptx 기본 템플릿 (파일 없음)
+
+_TEMPLATE_NAME_PATTERN = re.compile(r"^[\w-]{1,64}$")
+
+
+def template_path(name: str, directory: str = PPT_TEMPLATE_DIR) -> Optional[Path]:
+    """템플릿 이름 → 파일 경로 (기본 템플릿이면 None)"""
+    if name == DEFAULT_TEMPLATE:
+        return None
+    if not _TEMPLATE_NAME_PATTERN.match(name):
+        raise ValueError(f"잘못된 템플릿 이름입니다: {name}")
+    path = Path(directory) / f"{name}.pptx"
+    if not path.is_file():
+        raise ValueError(f"템플릿을 찾을 수 없습니다: {name}")
+    return path
+
+
+def available_templates(directory: str = PPT_TEMPLATE_DIR) -> List[str]:
+    """사용 가능한 템플릿 이름 목록 (기본 템플릿 포함)"""
+    names = sorted(path.stem for path in Path(directory).glob("*.pptx") if _TEMPLATE_NAME_PATTERN.match(path.stem))
+    return [DEFAULT_TEMPLATE] + names
+
+
+class _LoadedTemplate:
+    """워커 안에서 파싱해 둔 템플릿과 미리 찾아 둔 레이아웃 정보"""
+
+    def __init__(self, name: str, path: Optional[Path]):
+        from pptx import Presentation
+
+        self.name = name
+        self.mtime = path.stat().st_mtime if path else None
+        self.presentation = Presentation(str(path)) if path else Presentation()
+        # 회사 템플릿에 들어 있는 예시 슬라이드는 빼고 시작
+        _remove_slides(self.presentation)
+        self.layout, self.body_idx = _content_layout(self.presentation)
+
+
+def _content_layout(prs) -> Tuple[Any, Optional[int]]:
+    """제목과 본문 자리표시자가 모두 있는 첫 레이아웃과 본문 자리표시자 idx"""
+    from pptx.enum.shapes import PP_PLACEHOLDER
+
+    body_types = (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT)
+    for layout in prs.slide_layouts:
+        types = {ph.placeholder_format.type: ph.placeholder_format.idx for ph in layout.placeholders}
+        has_title = PP_PLACEHOLDER.TITLE in types or PP_PLACEHOLDER.CENTER_TITLE in types
+        body = next((types[t] for t in body_types if t in types), None)
+        if has_title and body is not None:
+            return layout, body
+    # 알맞은 레이아웃이 없으면 기존 동작(두 번째 레이아웃, 자리표시자 1)
+    layouts = prs.slide_layouts
+    return layouts[1 if len(layouts) > 1 else 0], 1
+
+
+def _remove_slides(prs) -> None:
+    """모든 슬라이드를 떼어 냅니다 (관계를 끊으면 저장 시 슬라이드 파트도 빠짐)."""
+    slide_ids = prs.slides._sldIdLst
+    for slide_id in list(slide_ids):
+        prs.part.drop_rel(slide_id.rId)
+        slide_ids.remove(slide_id)
+
+
+# 워커 프로세스 안에서만 사용하는 상태 (템플릿 이름 → 파싱해 둔 템플릿)
+_templates: Dict[str, _LoadedTemplate] = {}
+_template_dir = PPT_TEMPLATE_DIR
+
+
+def _get_template(name: str) -> _LoadedTemplate:
+    path = template_path(name, _template_dir)
+    loaded = _templates.get(name)
+    if loaded is None or (path is not None and loaded.mtime != path.stat().st_mtime):
+        loaded = _templates[name] = _LoadedTemplate(name, path)
+    return loaded
+
+
+def _init_worker(directory: str) -> None:
+    """워커 시작 시 모든 템플릿을 미리 파싱해 둡니다."""
+    global _template_dir
+    _template_dir = directory
+    for name in available_templates(directory):
+        try:
+            _get_template(name)
+        except Exception as e:
+            logger.warning("PPT 템플릿 로드 실패 (%s): %s", name, e)
+
+
+def render_deck(slides_data: Dict[str, Any], file_path: str, template: str = DEFAULT_TEMPLATE) -> None:
+    """워커 프로세스에서 실행: 슬라이드 데이터로 PPT 파일을 만들어 저장합니다."""
+    loaded = _get_template(template)
+    prs = loaded.presentation
+    try:
+        for slide in slides_data["slides"]:
+            current_slide = prs.slides.add_slide(loaded.layout)
+
+            # 제목 설정
+            if current_slide.shapes.title is not None:
+                current_slide.shapes.title.text = slide["title"]
+
+            # 내용 추가 (첫 항목은 자리표시자에 이미 있는 빈 문단 사용)
+            body = _placeholder(current_slide, loaded.body_idx)
+            if body is not None:
+                tf = body.text_frame
+                for i, bullet in enumerate(slide["bullets"]):
+                    p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+                    p.text = bullet
+                    p.level = 0
+
+            # 노트 추가 (있는 경우)
+            if slide.get("notes"):
+                current_slide.notes_slide.notes_text_frame.text = slide["notes"]
+
+        prs.save(file_path)
+        _remove_slides(prs)
+    except BaseException:
+        # 템플릿 상태가 꼬였을 수 있으므로 다음 렌더링에서 다시 파싱
+        _templates.pop(template, None)
+        raise
+
+
+def _placeholder(slide, idx: Optional[int]):
+    for shape in slide.placeholders:
+        if shape.placeholder_format.idx == idx:
+            return shape
+    return None
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class RenderPool:
+    """
+    템플릿을 미리 파싱해 둔 PPT 렌더링 워커 프로세스 풀.
+
+    Args:
+        workers: 워커 프로세스 수
+        template_dir: 템플릿 디렉터리
+    """
+
+    def __init__(self, workers: int = PPT_WORKERS, template_dir: str = PPT_TEMPLATE_DIR):
+        self.workers = max(1, workers)
+        self.template_dir = template_dir
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self.inflight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.template_dir,),
+            )
+            logger.info("PPT 렌더링 워커 풀 시작: workers=%d, templates=%s", self.workers, self.template_dir)
+        return self._executor
+
+    async def start(self) -> None:
+        """워커를 모두 띄우고 템플릿 파싱이 끝날 때까지 기다립니다 (앱 시작 시)."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.workers)))
+
+    def check_template(self, template: str) -> None:
+        """
+        요청한 템플릿이 있는지 확인합니다.
+
+        Raises:
+            ValueError: 이름이 잘못되었거나 파일이 없는 경우
+        """
+        template_path(template, self.template_dir)
+
+    def template_digest(self, template: str) -> str:
+        """
+        템플릿 파일 내용의 SHA-256 (결과물 ID 에 포함해 템플릿이 바뀌면 새로 만들게 함).
+
+        파일 크기/수정 시각이 같으면 이전에 계산한 값을 재사용합니다.
+        """
+        path = template_path(template, self.template_dir)
+        if path is None:
+            return DEFAULT_TEMPLATE
+        stat = path.stat()
+        cached = self._digests.get(template)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if cached is None or cached[0] != version:
+            # 템플릿은 작고 바뀔 때만 다시 읽으므로 이벤트 루프에서 바로 계산
+            cached = self._digests[template] = (version, hashlib.sha256(path.read_bytes()).hexdigest())
+        return cached[1]
+
+    async def render(self, slides_data: Dict[str, Any], file_path: str, template: str = DEFAULT_TEMPLATE) -> None:
+        """
+        슬라이드 데이터를 PPT 파일로 렌더링합니다.
+
+        Raises:
+            ValueError: 템플릿이 없는 경우
+            DeadlineExceeded: 요청 시간 예산을 넘긴 경우 (아직 시작하지 않은 작업은 취소)
+        """
+        check_deadline("pptx")
+        self.check_template(template)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        self.inflight += 1
+        try:
+            await with_deadline(loop.run_in_executor(executor, render_deck, slides_data, file_path, template), "pptx")
+            self.completed += 1
+        except BrokenProcessPool:
+            self.failed += 1
+            if self._executor is executor:
+                logger.error("PPT 렌더링 워커가 비정상 종료되어 풀을 다시 시작합니다.")
+                self._reset()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.inflight -= 1
+
+    def _reset(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """워커 프로세스를 종료합니다 (앱 종료 시)."""
+        self._reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "inflight": self.inflight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# 전역 PPT 렌더링 풀
+ppt_render_pool = RenderPool()
@@ -1,9 +1,11 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional
 import openai
 import asyncio
 from config.logger import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
+from core.tracing import start_span
+from core.deadline import DeadlineExceeded, remaining, with_deadline
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 class PromptEngine:
     def __init__(self, model: str = "gpt-4"):
@@ -21,7 +23,11 @@ class PromptEngine:
         if default_params:
             self.default_params[skill_name] = default_params
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_not_exception_type(DeadlineExceeded)  # 시간 예산을 다 쓴 경우 재시도하지 않음
+    )
     async def run_prompt(self, 
                         prompt: str, 
                         temperature: float = 1.0,
@@ -41,16 +47,14 @@ class PromptEngine:
             Exception: API 호출 중 오류 발생 시
         """
         try:
-            params: Dict[str, Any] = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature
-            }
-            
-            if max_tokens:
-                params["max_tokens"] = max_tokens
+            params = self._chat_params(prompt, temperature, max_tokens)
                 
-            response = await openai.ChatCompletion.acreate(**params)
+            with start_span("llm.chat_completion", model=self.model, prompt_chars=len(prompt)) as span:
+                response = await with_deadline(openai.ChatCompletion.acreate(**params), "llm.chat_completion")
+                usage = getattr(response, "usage", None)
+                if span is not None and usage:
+                    span.set_attribute("llm.prompt_tokens", usage.get("prompt_tokens", 0))
+                    span.set_attribute("llm.completion_tokens", usage.get("completion_tokens", 0))
             
             if not response.choices:
                 raise Exception("응답에 선택지가 없습니다.")
@@ -59,9 +63,67 @@ class PromptEngine:
             
         except Exception as e:
             logger.error(f"프롬프트 실행 중 오류 발생: {str(e)}")
-            logger.debug(f"프롬프트: {prompt[:200]}...")
+            logger.debug("프롬프트: %.200s...", prompt)
             raise
 
+    def _chat_params(self, prompt: str, temperature: float, max_tokens: Optional[int]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature
+        }
+        
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+
+        # 요청의 남은 시간 예산을 HTTP 타임아웃으로 전달
+        budget = remaining()
+        if budget is not None:
+            params["request_timeout"] = max(budget, 0.1)
+        return params
+
+    async def stream_prompt(self,
+                            prompt: str,
+                            temperature: float = 1.0,
+                            max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        프롬프트를 스트리밍으로 실행하고 응답 텍스트를 받는 대로 조각 단위로 내보냅니다.
+        
+        응답 일부를 이미 내보낸 뒤에는 다시 시도할 수 없으므로 run_prompt 와 달리 재시도하지 않습니다.
+        소비하는 쪽이 중간에 멈추면(aclose) 연결을 닫아 남은 토큰 생성을 멈춥니다.
+        
+        Raises:
+            DeadlineExceeded: 요청 시간 예산을 넘긴 경우
+        """
+        params = self._chat_params(prompt, temperature, max_tokens)
+        params["stream"] = True
+
+        with start_span("llm.chat_completion", model=self.model, prompt_chars=len(prompt), stream=True) as span:
+            completion_chars = 0
+            response = None
+            try:
+                response = await with_deadline(openai.ChatCompletion.acreate(**params), "llm.chat_completion")
+                while True:
+                    try:
+                        chunk = await with_deadline(response.__anext__(), "llm.chat_completion")
+                    except StopAsyncIteration:
+                        break
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.get("content")
+                    if text:
+                        completion_chars += len(text)
+                        yield text
+            except Exception as e:
+                logger.error(f"프롬프트 스트리밍 중 오류 발생: {str(e)}")
+                logger.debug("프롬프트: %.200s...", prompt)
+                raise
+            finally:
+                if span is not None:
+                    span.set_attribute("llm.completion_chars", completion_chars)
+                if response is not None and hasattr(response, "aclose"):
+                    await response.aclose()
+
     async def generate_prompt(self, skill_name: str, params: Optional[Dict[str, Any]] = None) -> str:
         """주어진 스킬과 매개변수로 프롬프트를 생성합니다."""
         if skill_name not in self.prompt_templates:
@@ -87,15 +149,18 @@ async def run_gpt_summary(text: str) -> str:
     """
 
     try:
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 전문 요약 비서입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
+        with start_span("llm.chat_completion", model="gpt-3.5-turbo", prompt_chars=len(prompt)):
+            response = await with_deadline(openai.ChatCompletion.acreate(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "당신은 전문 요약 비서입니다."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=500
+            ), "llm.chat_completion")
         return response.choices[0].message.content.strip()
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise RuntimeError(f"요약 실패: {str(e)}")
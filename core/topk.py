@@ -0,0 +1,168 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """
+    고정 메모리 상위 K 빈도 추정 (Space-Saving, Metwally et al.).
+
+    최대 capacity 개의 항목만 추적합니다. 추적하지 않는 항목이 들어오면 가장 작은 카운터를
+    물려받으며, 물려받은 값은 그 항목의 최대 오차(error)로 남습니다.
+    실제 빈도는 항상 [count - error, count] 범위에 있고, error 는 전체 건수 / capacity 이하입니다.
+
+    같은 방식의 요약끼리 merge 할 수 있으므로 일별/구간별 결과를 합치는 데 사용합니다.
+    """
+
+    __slots__ = ("capacity", "_counts", "_errors", "_heap", "_floor", "total")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity 는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # (count, item) 최소 힙. 카운트가 바뀐 항목은 꺼낼 때 현재 값과 비교해 버림 (지연 삭제)
+        self._heap: List[Tuple[int, Hashable]] = []
+        # 추적하지 않는 항목의 빈도 상한 (잘린 요약을 합친 경우)
+        self._floor = 0
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls,
+                    counts: Dict[Hashable, int],
+                    capacity: Optional[int] = None,
+                    truncated: bool = False) -> "SpaceSaving":
+        """
+        정확한 빈도 dict 로 요약을 만듭니다.
+
+        Args:
+            counts: 항목별 빈도
+            capacity: 요약 크기 (기본값 len(counts))
+            truncated: counts 가 상위 N개만 잘라낸 결과인지 여부.
+                True 이면 빠진 항목의 빈도는 counts 의 최솟값 이하로 간주합니다.
+        """
+        sketch = cls(max(capacity or len(counts), 1))
+        for item, count in counts.items():
+            sketch._counts[item] = int(count)
+            sketch._errors[item] = 0
+            sketch.total += int(count)
+        if truncated and counts:
+            sketch._floor = min(sketch._counts.values())
+        sketch._rebuild_heap()
+        if capacity and len(counts) > capacity:
+            sketch._truncate(capacity)
+        return sketch
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counts
+
+    @property
+    def full(self) -> bool:
+        return len(self._counts) >= self.capacity
+
+    def bound(self) -> int:
+        """추적하지 않는 항목이 가질 수 있는 최대 빈도"""
+        return max(self._floor, self._min_count() if self.full else 0)
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+            heapq.heappush(self._heap, (self._counts[item], item))
+            # 지연 삭제로 쌓인 항목이 많아지면 힙을 다시 만들어 메모리를 capacity 에 비례하게 유지
+            if len(self._heap) > 4 * self.capacity + 16:
+                self._rebuild_heap()
+            return
+
+        if len(self._counts) < self.capacity:
+            self._counts[item] = self._floor + count
+            self._errors[item] = self._floor
+            heapq.heappush(self._heap, (self._floor + count, item))
+            return
+
+        # 가장 작은 카운터를 교체
+        smallest, evicted = self._pop_min()
+        del self._counts[evicted]
+        del self._errors[evicted]
+        self._counts[item] = smallest + count
+        self._errors[item] = smallest
+        heapq.heappush(self._heap, (smallest + count, item))
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        다른 요약을 합칩니다 (mergeable summaries 방식).
+
+        한쪽에만 있는 항목은 다른 쪽에서 가능한 최대 빈도(bound)를 더하고 오차에도 반영한 뒤
+        상위 capacity 개만 남깁니다.
+        """
+        own_bound, other_bound = self.bound(), other.bound()
+        counts: Dict[Hashable, int] = {}
+        errors: Dict[Hashable, int] = {}
+        for item in set(self._counts) | set(other._counts):
+            counts[item] = self._counts.get(item, own_bound) + other._counts.get(item, other_bound)
+            errors[item] = self._errors.get(item, own_bound) + other._errors.get(item, other_bound)
+
+        self._counts, self._errors = counts, errors
+        self._floor = own_bound + other_bound
+        self.total += other.total
+        self._rebuild_heap()
+        self._truncate(self.capacity)
+        return self
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int, int]]:
+        """빈도 상위 k개의 (항목, 추정 빈도, 최대 오차). 빈도가 같으면 오차가 작은 항목 우선"""
+        ranked = sorted(self._counts.items(), key=lambda kv: (-kv[1], self._errors[kv[0]], str(kv[0])))
+        if k is not None:
+            ranked = ranked[:k]
+        return [(item, count, self._errors[item]) for item, count in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "floor": self._floor,
+            "items": [[item, count, self._errors[item]] for item, count, _ in self.top()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["capacity"])
+        sketch.total = data.get("total", 0)
+        sketch._floor = data.get("floor", 0)
+        for item, count, error in data["items"]:
+            sketch._counts[item] = count
+            sketch._errors[item] = error
+        sketch._rebuild_heap()
+        return sketch
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+    def _min_count(self) -> int:
+        while self._heap:
+            count, item = self._heap[0]
+            if self._counts.get(item) == count:
+                return count
+            heapq.heappop(self._heap)
+        return 0
+
+    def _truncate(self, capacity: int) -> None:
+        self.capacity = capacity
+        while len(self._counts) > capacity:
+            _, item = self._pop_min()
+            del self._counts[item]
+            del self._errors[item]
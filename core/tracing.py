@@ -0,0 +1,275 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from config.logger import logger
+
+# 트레이싱 설정
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))           # 헤드 샘플링 비율
+TRACE_TAIL_LATENCY_MS = float(os.getenv("TRACE_TAIL_LATENCY_MS", "2000"))  # 이보다 느린 요청은 항상 보관
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")                     # OTLP JSON lines 파일 (비우면 기록 안 함, 회전 없음)
+TRACE_EXPORT_URL = os.getenv("TRACE_EXPORT_URL")                           # OTLP/HTTP 수집기 (예: http://collector:4318/v1/traces)
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "500"))                 # 트레이스당 최대 스팬 수
+
+SERVICE_NAME = "standard-ai"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """하나의 작업 구간. 시간은 ns 단위 epoch 로 기록합니다."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes",
+                 "start_ns", "end_ns", "error")
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+        self.trace.has_error = True
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _Trace:
+    """루트 스팬이 끝날 때까지 스팬을 모아두는 버퍼 (테일 샘플링용)."""
+
+    __slots__ = ("trace_id", "spans", "head_sampled", "has_error", "dropped", "finished", "kept")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        self.head_sampled = random.random() < TRACE_SAMPLE_RATE
+        self.has_error = False
+        self.dropped = 0
+        # 루트 스팬이 끝나 내보내기 여부가 정해졌는지, 그 결과
+        self.finished = False
+        self.kept = False
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) < TRACE_MAX_SPANS:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class SpanExporter:
+    """내보낼 트레이스를 큐에 넣고 백그라운드 스레드에서 파일/수집기로 전송합니다."""
+
+    def __init__(self, path: Optional[str], url: Optional[str], max_queue: int = 1000):
+        self.path = path
+        self.url = url
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            # 큐에 쌓인 트레이스를 한 번에 묶어서 전송
+            batch = [spans]
+            while len(batch) < 100:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    self._write(batch)
+                    return
+                batch.append(more)
+            self._write(batch)
+
+    def _write(self, batch: List[List[Span]]) -> None:
+        payloads = [_otlp_payload(spans) for spans in batch]
+        try:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for payload in payloads:
+                        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+            if self.url:
+                merged = {"resourceSpans": [rs for p in payloads for rs in p["resourceSpans"]]}
+                request = urllib.request.Request(
+                    self.url,
+                    data=json.dumps(merged).encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                    method="POST"
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            logger.warning("트레이스 전송 실패: %s", e)
+
+
+def _otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+_exporter: Optional[SpanExporter] = None
+if TRACING_ENABLED and (TRACE_EXPORT_PATH or TRACE_EXPORT_URL):
+    _exporter = SpanExporter(TRACE_EXPORT_PATH or None, TRACE_EXPORT_URL)
+    atexit.register(_exporter.shutdown)
+
+
+def _finish_trace(root: Span) -> None:
+    """
+    루트 스팬 종료 시 헤드/테일 샘플링 결과에 따라 트레이스를 내보냅니다.
+
+    아직 끝나지 않은 자식 스팬(스트리밍 응답 본문 등)은 빼고 끝난 스팬만 복사해 넘기며,
+    늦게 끝나는 스팬은 끝날 때 따로 내보냅니다 (_finish_late_span).
+    """
+    trace = root.trace
+    trace.finished = True
+    trace.kept = trace.head_sampled or trace.has_error or root.duration_ms >= TRACE_TAIL_LATENCY_MS
+    if trace.kept and _exporter is not None:
+        if trace.dropped:
+            root.set_attribute("trace.dropped_spans", trace.dropped)
+        _exporter.export([span for span in trace.spans if span.end_ns is not None])
+
+
+def _finish_late_span(span: Span) -> None:
+    """트레이스를 내보낸 뒤에 끝난 스팬을 같은 트레이스 ID 로 따로 내보냅니다."""
+    if (span.trace.kept or span.error) and _exporter is not None:
+        _exporter.export([span])
+
+
+@contextmanager
+def start_span(name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    스팬을 시작합니다. 현재 스팬이 없으면 새 트레이스의 루트 스팬이 됩니다.
+
+    Args:
+        name: 스팬 이름 (예: "llm.chat_completion", "db.supabase")
+        trace_id: 루트 스팬일 때 사용할 트레이스(상관관계) ID
+        attributes: 스팬 속성
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    detached = parent is not None and parent.end_ns is not None
+    if parent is None:
+        trace = _Trace(trace_id or secrets.token_hex(16))
+        span = Span(trace, name, None, attributes)
+    elif detached:
+        # 부모 스팬이 이미 끝나 트레이스를 내보낸 경우 (스트리밍 응답 본문 등):
+        # 같은 트레이스 ID 로 따로 모아 이 스팬이 끝날 때 내보냄
+        trace = _Trace(parent.trace_id)
+        trace.head_sampled = parent.trace.head_sampled
+        span = Span(trace, name, parent.span_id, attributes)
+    else:
+        span = Span(parent.trace, name, parent.span_id, attributes)
+    span.trace.add(span)
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        if parent is None or detached:
+            _finish_trace(span)
+        elif span.trace.finished:
+            _finish_late_span(span)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+class _TraceIdFilter(logging.Filter):
+    """로그 레코드에 현재 트레이스 ID를 붙입니다 (JSON 로그에서 상관관계 조회용)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current_span.get()
+        if span is not None:
+            record.trace_id = span.trace_id
+        return True
+
+
+logger.addFilter(_TraceIdFilter())
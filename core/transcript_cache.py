@@ -0,0 +1,160 @@
+"""
+음성 인식 결과 캐시 (디스크, SQLite 파일).
+
+같은 녹음이 여러 번 올라오는 경우(회의 참석자 여러 명, 클라이언트 재시도)에 디코딩과 음성 인식을
+다시 하지 않도록 (음성 SHA-256, 모델, 언어) 별로 구간 전사 결과를 저장합니다.
+
+- 저장 위치: TRANSCRIPT_CACHE_PATH (비우면 캐시 사용 안 함)
+- 크기 제한: 저장된 결과 크기 합이 TRANSCRIPT_CACHE_MAX_BYTES 를 넘으면 가장 오래 안 쓴 것부터 삭제
+- 연결 하나를 전용 스레드(offload 풀 "transcripts", 크기 1)에서만 사용
+
+사용 예:
+    cached = await transcript_cache.get(sha256, "base", None)
+    await transcript_cache.put(sha256, "base", None, {"results": [...], "duration": 61.2})
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+from config.logger import logger
+from utils.offload import run_blocking
+
+TRANSCRIPT_CACHE_PATH = os.getenv("TRANSCRIPT_CACHE_PATH", "data/transcripts.db")
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 크기 제한을 넘으면 이 비율까지 줄여 매 저장마다 삭제가 일어나지 않게 함
+_EVICT_TARGET = 0.9
+
+SCHEMA = """
+create table if not exists transcripts (
+    key text primary key,
+    payload text not null,
+    size integer not null,
+    created_at real not null,
+    last_used real not null
+);
+
+create index if not exists transcripts_last_used_idx on transcripts (last_used);
+"""
+
+
+def cache_key(audio_sha256: str, model: str, language: Optional[str]) -> str:
+    """(음성 해시, 모델, 언어) 키. 언어를 지정하지 않은 경우(자동 감지)는 auto"""
+    return f"{audio_sha256}:{model}:{language or 'auto'}"
+
+
+class TranscriptCache:
+    """
+    크기 제한이 있는 디스크 기반 음성 인식 결과 캐시.
+
+    Args:
+        path: SQLite 파일 경로 (빈 문자열이면 사용 안 함, ":memory:" 가능)
+        max_bytes: 저장된 결과 크기 합의 최대값
+    """
+
+    def __init__(self, path: str = TRANSCRIPT_CACHE_PATH, max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 처음 사용할 때 열어 import 만으로 파일이 생기지 않게 함
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                conn.execute("pragma journal_mode = wal")
+                conn.execute("pragma synchronous = normal")
+            conn.executescript(SCHEMA)
+            self.total_bytes = conn.execute("select coalesce(sum(size), 0) from transcripts").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    async def get(self, audio_sha256: str, model: str, language: Optional[str]) -> Optional[Dict[str, Any]]:
+        """저장된 결과를 반환합니다 (없으면 None)."""
+        if not self.enabled:
+            return None
+        key = cache_key(audio_sha256, model, language)
+
+        def select() -> Optional[str]:
+            conn = self._connect()
+            row = conn.execute("select payload from transcripts where key = ?", (key,)).fetchone()
+            if row is not None:
+                with conn:
+                    conn.execute("update transcripts set last_used = ? where key = ?", (time.time(), key))
+            return row[0] if row else None
+
+        payload = await run_blocking("transcripts", select)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(payload)
+
+    async def put(self, audio_sha256: str, model: str, language: Optional[str], value: Dict[str, Any]) -> None:
+        """결과를 저장하고, 크기 제한을 넘으면 가장 오래 안 쓴 항목부터 지웁니다."""
+        if not self.enabled:
+            return
+        key = cache_key(audio_sha256, model, language)
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        def upsert() -> int:
+            conn = self._connect()
+            now = time.time()
+            with conn:
+                previous = conn.execute("select size from transcripts where key = ?", (key,)).fetchone()
+                conn.execute(
+                    "insert or replace into transcripts (key, payload, size, created_at, last_used)"
+                    " values (?, ?, ?, ?, ?)",
+                    (key, payload, size, now, now)
+                )
+                self.total_bytes += size - (previous[0] if previous else 0)
+                return self._evict(conn) if self.total_bytes > self.max_bytes else 0
+
+        evicted = await run_blocking("transcripts", upsert)
+        if evicted:
+            self.evictions += evicted
+            logger.info("음성 인식 캐시 %d건 삭제 (크기 제한 %d bytes)", evicted, self.max_bytes)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        target = self.max_bytes * _EVICT_TARGET
+        removed = []
+        for key, size in conn.execute("select key, size from transcripts order by last_used").fetchall():
+            if self.total_bytes <= target:
+                break
+            removed.append((key,))
+            self.total_bytes -= size
+        conn.executemany("delete from transcripts where key = ?", removed)
+        return len(removed)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# 전역 음성 인식 결과 캐시
+transcript_cache = TranscriptCache()
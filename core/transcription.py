@@ -0,0 +1,411 @@
+"""
+음성 인식(Whisper) 전용 프로세스 풀.
+
+Whisper 추론은 CPU 작업이라 API 프로세스의 스레드에서 돌리면 GIL 때문에 코어 하나만 쓰고
+다른 요청도 느려집니다. 여기서는 모델을 미리 올려 둔 워커 프로세스 여러 개에 작업을 나눠 주고,
+API 프로세스는 결과를 비동기로 기다리기만 합니다.
+
+- 워커 수: WHISPER_WORKERS (기본값 CPU 수 / 2)
+- 대기열: 실행 중인 작업 외에 WHISPER_QUEUE_SIZE 개까지 대기하고, 그 이상은 바로 거절 (TranscriptionBusy)
+- 워커당 연산 스레드: WHISPER_THREADS_PER_WORKER (기본값 CPU 수 / 워커 수, 과다 구독 방지)
+
+긴 음성은 구간으로 나눠(core/audio_segments.py) transcribe_segments 로 여러 워커에 동시에 보내고,
+끝나는 구간부터 받아 볼 수 있습니다. 구간 작업은 요청 하나로 치고 대기열 검사도 한 번만 합니다.
+
+음성 인식 엔진은 등급(tier)으로 고릅니다. 등급마다 엔진 사양 "<backend>:<model>[:<compute_type>]" 이 있습니다.
+- whisper:base                → openai-whisper (PyTorch, fp32)
+- faster-whisper:small:int8   → faster-whisper (CTranslate2, int8 양자화, CPU 에서 더 빠르고 메모리도 적음)
+
+등급 목록은 TRANSCRIPTION_TIERS, 기본 등급은 TRANSCRIPTION_DEFAULT_TIER 로 설정합니다.
+요청에서 등급을 지정하지 않으면 TRANSCRIPTION_TIER_BY_DURATION 규칙(음성 길이별)으로 고릅니다 (select_tier).
+등급별 실시간 배율(RTF = 처리 시간 / 음성 길이)은 snapshot 에, 단어 오류율(WER)은
+core/transcription_eval.py 로 측정합니다.
+
+사용 예:
+    result = await transcription_pool.transcribe(audio_path, tier="small-int8")
+
+    async for segment in transcription_pool.transcribe_segments(audio, spans):
+        ...
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from config.logger import logger
+from core.deadline import check_deadline, with_deadline
+
+_CPU_COUNT = os.cpu_count() or 1
+
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", str(max(1, _CPU_COUNT // 2))))
+WHISPER_QUEUE_SIZE = int(os.getenv("WHISPER_QUEUE_SIZE", "8"))
+WHISPER_THREADS_PER_WORKER = int(os.getenv("WHISPER_THREADS_PER_WORKER", "0"))
+
+DEFAULT_TIERS = (
+    "tiny=whisper:tiny,base=whisper:base,small=whisper:small,"
+    "base-int8=faster-whisper:base:int8,small-int8=faster-whisper:small:int8"
+)
+
+
+def _parse_pairs(raw: str) -> List[Tuple[str, str]]:
+    """"a=b,c=d" 형식을 [(a, b), (c, d)] 로 바꿉니다."""
+    pairs = []
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        name, _, value = item.partition("=")
+        if not value:
+            raise ValueError(f"잘못된 설정 항목입니다 (이름=값 형식): {item}")
+        pairs.append((name.strip(), value.strip()))
+    return pairs
+
+
+def parse_engine(spec: str) -> Tuple[str, str, Optional[str]]:
+    """엔진 사양 "<backend>:<model>[:<compute_type>]" → (backend, model, compute_type)"""
+    backend, _, rest = spec.partition(":")
+    model, _, compute_type = rest.partition(":")
+    if backend not in ("whisper", "faster-whisper") or not model:
+        raise ValueError(f"지원하지 않는 음성 인식 엔진입니다: {spec}")
+    return backend, model, compute_type or None
+
+
+# 등급 이름 → 엔진 사양
+TRANSCRIPTION_TIERS: Dict[str, str] = dict(_parse_pairs(os.getenv("TRANSCRIPTION_TIERS", DEFAULT_TIERS)))
+for _spec in TRANSCRIPTION_TIERS.values():
+    parse_engine(_spec)
+
+# 이전 설정(WHISPER_MODEL) 도 기본 등급으로 인정
+TRANSCRIPTION_DEFAULT_TIER = os.getenv("TRANSCRIPTION_DEFAULT_TIER") or os.getenv("WHISPER_MODEL", "base")
+
+# 음성 길이별 등급 규칙: "120=small-int8,*=base-int8" → 120초 이하는 small-int8, 그 외 base-int8
+TRANSCRIPTION_TIER_BY_DURATION: List[Tuple[float, str]] = [
+    (float("inf") if limit == "*" else float(limit), tier)
+    for limit, tier in _parse_pairs(os.getenv("TRANSCRIPTION_TIER_BY_DURATION", ""))
+]
+for _limit, _tier in TRANSCRIPTION_TIER_BY_DURATION:
+    if _tier not in TRANSCRIPTION_TIERS:
+        raise ValueError(f"TRANSCRIPTION_TIER_BY_DURATION 의 등급이 등급 목록에 없습니다: {_tier}")
+
+
+class TranscriptionBusy(Exception):
+    """대기열이 가득 차 음성 인식 작업을 받을 수 없을 때 발생합니다 (잠시 후 재시도)."""
+
+
+class UnknownTier(ValueError):
+    """설정에 없는 음성 인식 등급을 요청했을 때 발생합니다."""
+
+
+def select_tier(requested: Optional[str] = None,
+                duration: Optional[float] = None,
+                tiers: Dict[str, str] = TRANSCRIPTION_TIERS,
+                rules: Sequence[Tuple[float, str]] = TRANSCRIPTION_TIER_BY_DURATION,
+                default: str = TRANSCRIPTION_DEFAULT_TIER) -> str:
+    """
+    사용할 등급을 고릅니다. 요청한 등급 > 음성 길이별 규칙 > 기본 등급 순입니다.
+
+    Raises:
+        UnknownTier: 요청한 등급이 설정에 없는 경우
+    """
+    if requested:
+        if requested not in tiers:
+            raise UnknownTier(f"알 수 없는 음성 인식 등급입니다: {requested} (사용 가능: {', '.join(tiers)})")
+        return requested
+    if duration is not None:
+        for limit, tier in rules:
+            if duration <= limit:
+                return tier
+    return default
+
+
+# 워커 프로세스 안에서만 사용하는 상태 (엔진 사양 → 로드된 모델, 워커당 연산 스레드 수)
+_models: Dict[str, Any] = {}
+_threads = 1
+
+
+def _load_engine(spec: str) -> Any:
+    backend, model_name, compute_type = parse_engine(spec)
+    if backend == "faster-whisper":
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_name, device="cpu", compute_type=compute_type or "int8", cpu_threads=_threads)
+    import whisper
+    return whisper.load_model(model_name)
+
+
+def _init_worker(spec: str, threads: int) -> None:
+    """워커 시작 시 기본 등급 모델을 미리 올려 둡니다 (첫 요청 지연 제거). 다른 등급은 처음 쓸 때 올림."""
+    global _threads
+    _threads = threads
+    if parse_engine(spec)[0] == "whisper":
+        import torch
+        torch.set_num_threads(threads)
+    _models[spec] = _load_engine(spec)
+
+
+def _transcribe(audio: Any, spec: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    워커 프로세스에서 실행: 음성 파일 경로(또는 파형 배열)를 텍스트로 변환합니다.
+
+    엔진과 관계없이 whisper transcribe 결과 형태(text, segments, language)로 반환하고,
+    워커 안에서 잰 처리 시간(processing_time, 초)을 덧붙입니다.
+    """
+    model = _models.get(spec)
+    if model is None:
+        model = _models[spec] = _load_engine(spec)
+
+    started = time.perf_counter()
+    if parse_engine(spec)[0] == "faster-whisper":
+        segments, info = model.transcribe(audio, **options)
+        segments = [{"start": seg.start, "end": seg.end, "text": seg.text} for seg in segments]
+        result = {
+            "text": "".join(seg["text"] for seg in segments).strip(),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration,
+        }
+    else:
+        result = model.transcribe(audio, **options)
+    result["processing_time"] = time.perf_counter() - started
+    return result
+
+
+def _ping(hold: float) -> int:
+    """예열용: 잠시 붙잡고 있어 다른 워커들도 작업을 받게 합니다."""
+    time.sleep(hold)
+    return os.getpid()
+
+
+class TranscriptionPool:
+    """
+    모델을 미리 올려 둔 음성 인식 워커 프로세스 풀.
+
+    Args:
+        workers: 워커 프로세스 수
+        queue_size: 실행 중인 작업 외에 대기할 수 있는 작업 수
+        tiers: 등급 이름 → 엔진 사양
+        default_tier: 등급을 지정하지 않은 작업에 쓰고 워커가 미리 올려 둘 등급
+        threads_per_worker: 워커당 연산 스레드 수 (0 이면 CPU 수 / 워커 수)
+    """
+
+    def __init__(self,
+                 workers: int = WHISPER_WORKERS,
+                 queue_size: int = WHISPER_QUEUE_SIZE,
+                 tiers: Optional[Dict[str, str]] = None,
+                 default_tier: str = TRANSCRIPTION_DEFAULT_TIER,
+                 threads_per_worker: int = WHISPER_THREADS_PER_WORKER):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.tiers = dict(tiers or TRANSCRIPTION_TIERS)
+        if default_tier not in self.tiers:
+            raise UnknownTier(f"기본 음성 인식 등급이 등급 목록에 없습니다: {default_tier}")
+        self.default_tier = default_tier
+        self.threads_per_worker = threads_per_worker or max(1, _CPU_COUNT // self.workers)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.inflight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        # 등급별 처리량 (작업 수, 음성 길이 합, 워커 처리 시간 합)
+        self._tier_stats: Dict[str, Dict[str, float]] = {}
+
+    def engine_for(self, tier: Optional[str] = None) -> str:
+        """등급의 엔진 사양 (캐시 키 등에 사용)"""
+        return self.tiers[select_tier(tier, tiers=self.tiers, rules=(), default=self.default_tier)]
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # torch 는 fork 후 스레드 상태가 꼬일 수 있으므로 spawn 으로 시작
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.tiers[self.default_tier], self.threads_per_worker),
+            )
+            logger.info("음성 인식 워커 풀 시작: workers=%d, tier=%s (%s)",
+                        self.workers, self.default_tier, self.tiers[self.default_tier])
+        return self._executor
+
+    async def start(self) -> None:
+        """워커를 모두 띄우고 모델 로드가 끝날 때까지 기다립니다 (앱 시작 시)."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        # 유휴 워커가 없을 때 제출해야 워커가 새로 뜨므로 한꺼번에 제출
+        pids = await asyncio.gather(*(loop.run_in_executor(executor, _ping, 0.2) for _ in range(self.workers)))
+        logger.info("음성 인식 워커 준비 완료: %d/%d개 프로세스", len(set(pids)), self.workers)
+
+    async def transcribe(self, audio: Any, tier: Optional[str] = None, **options: Any) -> Dict[str, Any]:
+        """
+        음성을 텍스트로 변환합니다 (whisper transcribe 결과 dict).
+
+        Args:
+            audio: 음성 파일 경로 또는 16kHz 파형 배열
+            tier: 사용할 등급 (기본값: default_tier)
+            options: 엔진 transcribe 옵션 (language 등)
+
+        Raises:
+            TranscriptionBusy: 대기열이 가득 찬 경우
+            UnknownTier: 없는 등급을 요청한 경우
+            DeadlineExceeded: 요청 시간 예산을 넘긴 경우 (아직 시작하지 않은 작업은 취소)
+        """
+        tier = tier or self.default_tier
+        self.engine_for(tier)
+        self._admit()
+        return await self._submit(audio, tier, options)
+
+    async def transcribe_segments(self,
+                                  audio: Any,
+                                  spans: Sequence[Tuple[int, int]],
+                                  sample_rate: int = 16000,
+                                  tier: Optional[str] = None,
+                                  **options: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        파형의 구간들을 워커 수만큼 동시에 변환하고, 끝나는 순서대로 결과를 내보냅니다.
+
+        각 결과의 start/end 와 segments 의 시각은 원본 음성 기준(초)으로 옮겨져 있습니다.
+        대기열 검사는 처음 한 번만 하고, 이후 구간은 거절하지 않고 차례를 기다립니다.
+        도중에 반복을 멈추면(연결 종료 등) 아직 시작하지 않은 구간은 취소됩니다.
+
+        Args:
+            audio: 16kHz 모노 파형 배열
+            spans: (시작, 끝) 샘플 번호 목록 (split_on_silence 결과)
+            tier: 사용할 등급 (기본값: default_tier)
+
+        Yields:
+            {"index", "start", "end", "text", "language", "segments"}
+
+        Raises:
+            TranscriptionBusy: 대기열이 가득 찬 경우 (첫 구간을 보내기 전)
+            UnknownTier: 없는 등급을 요청한 경우
+        """
+        tier = tier or self.default_tier
+        self.engine_for(tier)
+        self._admit()
+        # 한 요청이 워커를 모두 차지하지 않도록, 동시에 보내는 구간은 워커 수까지만
+        gate = asyncio.Semaphore(self.workers)
+
+        async def run(index: int, start: int, end: int) -> Dict[str, Any]:
+            async with gate:
+                result = await self._submit(audio[start:end], tier, options)
+            offset = start / sample_rate
+            return {
+                "index": index,
+                "start": round(offset, 3),
+                "end": round(end / sample_rate, 3),
+                "text": result.get("text", "").strip(),
+                "language": result.get("language"),
+                "segments": [
+                    {**seg, "start": seg["start"] + offset, "end": seg["end"] + offset}
+                    for seg in result.get("segments", [])
+                ],
+            }
+
+        tasks = [asyncio.ensure_future(run(i, start, end)) for i, (start, end) in enumerate(spans)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _admit(self) -> None:
+        check_deadline("whisper")
+        if self.inflight >= self.capacity:
+            self.rejected += 1
+            raise TranscriptionBusy(f"음성 인식 대기열이 가득 찼습니다 (최대 {self.capacity}건).")
+
+    async def _submit(self, audio: Any, tier: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            job = executor.submit(_transcribe, audio, self.tiers[tier], options)
+            # 시간 초과로 기다리기를 그만둬도 워커는 계속 돌므로, 작업이 실제로 끝날 때 줄임
+            self.inflight += 1
+            job.add_done_callback(lambda _: self._release(loop))
+            result = await with_deadline(asyncio.wrap_future(job, loop=loop), "whisper")
+            self.completed += 1
+            self._record(tier, audio, result)
+            return result
+        except BrokenProcessPool:
+            # 워커가 비정상 종료(메모리 부족 등)하면 풀을 새로 만듦
+            self.failed += 1
+            if self._executor is executor:
+                logger.error("음성 인식 워커가 비정상 종료되어 풀을 다시 시작합니다.")
+                self._reset()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        """작업 완료 콜백 (executor 관리 스레드에서 불림) → 이벤트 루프에서 inflight 감소"""
+        def release() -> None:
+            self.inflight -= 1
+
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘 (종료 중)
+            pass
+
+    def _record(self, tier: str, audio: Any, result: Dict[str, Any]) -> None:
+        if isinstance(audio, (str, os.PathLike)):
+            segments = result.get("segments") or []
+            duration = result.get("duration") or (segments[-1]["end"] if segments else 0)
+        else:
+            duration = len(audio) / 16000
+        stats = self._tier_stats.setdefault(tier, {"jobs": 0, "audio_seconds": 0.0, "processing_seconds": 0.0})
+        stats["jobs"] += 1
+        stats["audio_seconds"] += duration
+        stats["processing_seconds"] += result.get("processing_time", 0.0)
+
+    def _reset(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """워커 프로세스를 종료합니다 (앱 종료 시)."""
+        self._reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "default_tier": self.default_tier,
+            "inflight": self.inflight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            # 실시간 배율(rtf): 워커 처리 시간 / 음성 길이 (1 미만이면 실시간보다 빠름)
+            "tiers": {
+                tier: {
+                    "engine": self.tiers[tier],
+                    "jobs": int(stats["jobs"]),
+                    "audio_seconds": round(stats["audio_seconds"], 1),
+                    "rtf": round(stats["processing_seconds"] / stats["audio_seconds"], 3) if stats["audio_seconds"] else None,
+                }
+                for tier, stats in self._tier_stats.items()
+            },
+        }
+
+
+def stitch_segments(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """구간별 결과(transcribe_segments)를 시간 순서로 이어 하나의 transcribe 결과 형태로 만듭니다."""
+    ordered = sorted(results, key=lambda r: r["index"])
+    languages = Counter(r["language"] for r in ordered if r.get("language"))
+    return {
+        "text": " ".join(r["text"] for r in ordered if r["text"]),
+        "segments": [seg for r in ordered for seg in r["segments"]],
+        "language": languages.most_common(1)[0][0] if languages else "unknown",
+        "duration": ordered[-1]["end"] if ordered else 0,
+    }
+
+
+# 전역 음성 인식 풀
+transcription_pool = TranscriptionPool()
@@ -0,0 +1,103 @@
+"""
+음성 인식 등급별 속도/정확도 측정 (오프라인).
+
+정답 전사가 있는 음성 목록(JSON lines: {"audio": 경로, "reference": 정답 텍스트})으로
+등급마다 실시간 배율(RTF = 처리 시간 / 음성 길이)과 단어 오류율(WER), 글자 오류율(CER)을 잽니다.
+한국어는 띄어쓰기 차이가 WER 에 크게 반영되므로 CER 도 함께 봅니다.
+
+짧은 음성 메모와 긴 회의 녹음의 표본을 나눠 돌려 보고 TRANSCRIPTION_TIER_BY_DURATION 을 정하면 됩니다.
+
+실행:
+    python -m core.transcription_eval samples.jsonl --tiers tiny,base,small-int8
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Any, Dict, List, Sequence
+from core.audio_segments import SAMPLE_RATE, decode_audio
+from core.transcription import TRANSCRIPTION_TIERS, TranscriptionPool
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize(text: str) -> str:
+    """비교용 정규화: 소문자, 문장부호 제거, 공백 정리"""
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def edit_distance(reference: Sequence[str], hypothesis: Sequence[str]) -> int:
+    """두 토큰 열의 편집 거리 (치환/삽입/삭제 각 1)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i]
+        for j, hyp in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref != hyp)))
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    words = normalize(reference).split()
+    return edit_distance(words, normalize(hypothesis).split()) / max(1, len(words))
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    chars = normalize(reference).replace(" ", "")
+    return edit_distance(chars, normalize(hypothesis).replace(" ", "")) / max(1, len(chars))
+
+
+async def evaluate(samples: List[Dict[str, Any]], tiers: Sequence[str], language: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    등급마다 표본 전체를 변환하고 RTF/WER/CER 을 계산합니다.
+
+    워커 하나로 순서대로 돌려 등급 간 처리 시간을 공정하게 비교합니다 (모델 로드 시간은 제외).
+    """
+    audios = [decode_audio(sample["audio"]) for sample in samples]
+    total_seconds = sum(len(audio) for audio in audios) / SAMPLE_RATE
+    options = {"language": language} if language else {}
+    report = {}
+
+    for tier in tiers:
+        pool = TranscriptionPool(workers=1, queue_size=len(samples), tiers=TRANSCRIPTION_TIERS, default_tier=tier)
+        try:
+            await pool.start()
+            errors = {"wer": 0.0, "cer": 0.0}
+            started = time.perf_counter()
+            for sample, audio in zip(samples, audios):
+                result = await pool.transcribe(audio, **options)
+                errors["wer"] += word_error_rate(sample["reference"], result["text"])
+                errors["cer"] += character_error_rate(sample["reference"], result["text"])
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+
+        report[tier] = {
+            "engine": TRANSCRIPTION_TIERS[tier],
+            "samples": len(samples),
+            "audio_seconds": round(total_seconds, 1),
+            "rtf": round(elapsed / total_seconds, 3) if total_seconds else None,
+            "wer": round(errors["wer"] / len(samples), 4),
+            "cer": round(errors["cer"] / len(samples), 4),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="음성 인식 등급별 RTF/WER 측정")
+    parser.add_argument("manifest", help='JSON lines 파일 ({"audio": 경로, "reference": 정답 텍스트})')
+    parser.add_argument("--tiers", default=",".join(TRANSCRIPTION_TIERS), help="측정할 등급 (쉼표 구분)")
+    parser.add_argument("--language", default=None, help="언어 고정 (예: ko)")
+    args = parser.parse_args()
+
+    with open(args.manifest, encoding="utf-8") as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    tiers = [tier.strip() for tier in args.tiers.split(",") if tier.strip()]
+
+    report = asyncio.run(evaluate(samples, tiers, args.language))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+저장소 백엔드 인터페이스 (StorageBackend) 와 백엔드 공통 도우미.
+
+사용자/피드백/요약 저장과 조회, 피드백 통계를 정의합니다. 통계 캐시, 키워드 상위 K,
+페이지 순회처럼 백엔드와 무관한 부분은 여기서 구현하고 각 백엔드는 저장/조회/집계만 구현합니다.
+구현은 db/supabase.py (SupabaseClient), db/sqlite.py (SQLiteStorage) 이고
+사용할 백엔드는 db/storage.py 에서 고릅니다.
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+from core.alert_engine import alert_engine
+from core.topk import SpaceSaving
+from db.stats_cache import CacheEntry, make_key, stats_cache
+from db.user_cache import KnownUserCache
+from models.feedback import EmotionEnum, FeedbackCreate, FeedbackInDB, UserCreate, UserInDB
+
+USER_NOT_FOUND = "존재하지 않는 사용자입니다."
+
+# 사용자 피드백 목록: 기본/최대 페이지 크기와 조회할 수 있는 컬럼
+FEEDBACK_PAGE_SIZE = 50
+FEEDBACK_PAGE_MAX = 500
+LIST_FEEDBACK_COLUMNS = ("id", "user_id", "content", "skill", "emotion", "keywords", "created_at")
+
+# 통계 응답의 상위 키워드 수 (기본/최대)와 집계에 쓰는 상위 K 요약 크기.
+# 요약 크기가 클수록 상위 키워드의 빈도 오차가 작아집니다.
+FEEDBACK_KEYWORD_TOP_K = int(os.getenv("FEEDBACK_KEYWORD_TOP_K", "20"))
+FEEDBACK_KEYWORD_TOP_K_MAX = 100
+KEYWORD_SKETCH_SIZE = int(os.getenv("KEYWORD_SKETCH_SIZE", "200"))
+
+# 통계 응답에 포함되는 최근 피드백 수
+RECENT_FEEDBACK_LIMIT = 5
+
+
+class StorageBackend(ABC):
+    """사용자/피드백/요약 저장소 인터페이스"""
+
+    def __init__(self):
+        # 존재가 확인된 사용자 (조회 생략용, /metrics 에 노출)
+        self.known_users = KnownUserCache()
+
+    async def aclose(self) -> None:
+        """연결을 닫습니다 (앱 종료 시)."""
+
+    # 사용자
+
+    @abstractmethod
+    async def create_user(self, user: UserCreate) -> UserInDB:
+        """새로운 사용자를 생성합니다."""
+
+    @abstractmethod
+    async def get_user(self, user_id: UUID) -> Optional[UserInDB]:
+        """사용자 정보를 조회합니다. 없으면 None"""
+
+    # 피드백
+
+    @abstractmethod
+    async def create_feedback(self, feedback: FeedbackCreate) -> FeedbackInDB:
+        """
+        새로운 피드백을 저장합니다.
+
+        Raises:
+            ValueError: 사용자가 존재하지 않는 경우 (USER_NOT_FOUND)
+        """
+
+    @abstractmethod
+    async def create_feedbacks(self, feedbacks: List[FeedbackCreate]) -> Dict[str, Any]:
+        """
+        여러 피드백을 한 번에 저장합니다.
+
+        Returns:
+            {"inserted": 저장된 수, "failed": 실패 수, "errors": [{"index": 입력 순서, "error": 사유}]}
+        """
+
+    @abstractmethod
+    async def tag_feedback(self,
+                           feedback: FeedbackInDB,
+                           emotion: Optional[str] = None,
+                           keywords: Optional[List[str]] = None) -> None:
+        """
+        저장된 피드백의 비어 있던 감정/키워드를 채웁니다 (단건 제출 후 자동 태깅).
+        None 인 값은 바꾸지 않으며, 롤업/통계 캐시/알림 지표에도 반영합니다.
+        """
+
+    @abstractmethod
+    async def get_user_feedback_page(self,
+                                     user_id: UUID,
+                                     limit: int = FEEDBACK_PAGE_SIZE,
+                                     cursor: Optional[str] = None,
+                                     columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        사용자의 피드백을 최신순으로 한 페이지 조회합니다 ((created_at, id) 키셋 페이지네이션).
+
+        Returns:
+            {"items": 행 목록, "next_cursor": 다음 페이지 커서 또는 None}
+
+        Raises:
+            ValueError: 커서나 컬럼이 잘못된 경우
+        """
+
+    async def iter_user_feedbacks(self,
+                                  user_id: UUID,
+                                  page_size: int = FEEDBACK_PAGE_SIZE,
+                                  columns: Optional[List[str]] = None,
+                                  cursor: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """사용자의 피드백을 최신순으로 페이지 단위로 가져오며 한 행씩 내보냅니다 (스트리밍 응답용)."""
+        while True:
+            page = await self.get_user_feedback_page(user_id, page_size, cursor, columns)
+            for row in page["items"]:
+                yield row
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
+    async def get_user_feedbacks(self, user_id: UUID) -> List[FeedbackInDB]:
+        """특정 사용자의 모든 피드백을 조회합니다 (많을 수 있으면 iter_user_feedbacks 사용)."""
+        return [
+            FeedbackInDB(**item)
+            async for item in self.iter_user_feedbacks(user_id, page_size=FEEDBACK_PAGE_MAX)
+        ]
+
+    async def _after_feedbacks_saved(self, rows: List[Dict[str, Any]], created_at: datetime) -> None:
+        """저장된 피드백을 통계 캐시와 알림 지표에 반영합니다 (저장 한 번에 한 번)."""
+        stats_cache.invalidate_many((created_at, user_id) for user_id in {str(row["user_id"]) for row in rows})
+
+        # 최근 피드백 긍정 비율 지표 기록
+        await alert_engine.record_many("feedback", [
+            {"positive": row["emotion"] == EmotionEnum.POSITIVE.value}
+            for row in rows if row.get("emotion")
+        ])
+
+    async def _after_feedback_tagged(self, feedback: FeedbackInDB, emotion: Optional[str]) -> None:
+        """태그를 채운 피드백의 통계 캐시를 무효화하고, 새로 정해진 감정을 알림 지표에 기록합니다."""
+        stats_cache.invalidate_many([(feedback.created_at, str(feedback.user_id))])
+        if emotion:
+            await alert_engine.record_many("feedback", [{"positive": emotion == EmotionEnum.POSITIVE.value}])
+
+    # 통계
+
+    async def get_feedback_stats(self,
+                                 start_date: datetime,
+                                 end_date: datetime,
+                                 user_id: Optional[UUID] = None,
+                                 keyword_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        주어진 기간 동안의 피드백 통계를 조회합니다 (캐시 사용).
+
+        keyword_stats / keyword_top 에는 빈도 상위 keyword_k 개 키워드만 담깁니다
+        (기본값 FEEDBACK_KEYWORD_TOP_K, 최대 FEEDBACK_KEYWORD_TOP_K_MAX).
+        """
+        entry = await self.get_feedback_stats_entry(start_date, end_date, user_id, keyword_k)
+        return entry.value
+
+    async def get_feedback_stats_entry(self,
+                                       start_date: datetime,
+                                       end_date: datetime,
+                                       user_id: Optional[UUID] = None,
+                                       keyword_k: Optional[int] = None) -> CacheEntry:
+        """통계와 함께 ETag/Last-Modified 검증자를 담은 캐시 항목을 반환합니다 (db/stats_cache.py)."""
+        keyword_k = max(1, min(keyword_k or FEEDBACK_KEYWORD_TOP_K, FEEDBACK_KEYWORD_TOP_K_MAX))
+        return await stats_cache.get_or_compute(
+            make_key(start_date, end_date, user_id, keyword_k),
+            lambda: self._compute_feedback_stats(start_date, end_date, user_id, keyword_k)
+        )
+
+    @abstractmethod
+    async def _compute_feedback_stats(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      user_id: Optional[UUID],
+                                      keyword_k: int) -> Dict[str, Any]:
+        """캐시를 거치지 않고 통계를 계산합니다. 응답 형식은 build_stats 를 따릅니다."""
+
+    @abstractmethod
+    async def get_feedback_timeseries(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      bucket: str = "day",
+                                      user_id: Optional[UUID] = None,
+                                      fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """기간을 hour/day/week 구간으로 나눈 피드백 건수, 긍정/부정 비율, 스킬별 건수를 조회합니다."""
+
+    async def rebuild_rollups(self, start_day: date, end_day: date) -> int:
+        """일별 롤업을 다시 계산합니다. 롤업을 쓰지 않는 백엔드는 아무것도 하지 않고 0 을 반환합니다."""
+        return 0
+
+    # 요약
+
+    @abstractmethod
+    async def create_summary(self, user_id: Optional[str], input_text: str, summary: str) -> Optional[str]:
+        """요약 결과를 저장하고 생성된 요약 ID를 반환합니다."""
+
+
+def sketch_size_for(keyword_k: int) -> int:
+    """상위 K 를 정확히 뽑을 수 있도록 요약 크기는 K 보다 넉넉하게"""
+    return max(KEYWORD_SKETCH_SIZE, keyword_k * 5)
+
+
+def feedback_row(feedback: FeedbackCreate, created_at: datetime) -> Dict[str, Any]:
+    """FeedbackCreate 를 feedbacks 테이블 행으로 변환합니다."""
+    return {
+        "user_id": str(feedback.user_id),
+        "content": feedback.content,
+        "skill": feedback.skill,
+        "emotion": feedback.emotion,
+        "keywords": feedback.keywords,
+        "created_at": created_at.isoformat()
+    }
+
+
+def list_columns(columns: Optional[List[str]]) -> List[str]:
+    """요청 컬럼을 검증하고 커서에 필요한 created_at, id 를 포함시킵니다."""
+    if not columns:
+        return list(LIST_FEEDBACK_COLUMNS)
+    unknown = set(columns) - set(LIST_FEEDBACK_COLUMNS)
+    if unknown:
+        raise ValueError(f"조회할 수 없는 컬럼입니다: {', '.join(sorted(unknown))}")
+    return list(dict.fromkeys([*columns, "created_at", "id"]))
+
+
+def hide_cursor_columns(rows: List[Dict[str, Any]], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """커서용으로만 조회한 컬럼(id, created_at)은 응답에서 제외합니다."""
+    hidden = {"id", "created_at"} - set(columns or LIST_FEEDBACK_COLUMNS)
+    if hidden:
+        rows = [{k: v for k, v in row.items() if k not in hidden} for row in rows]
+    return rows
+
+
+def build_stats(aggregates: Dict[str, Any],
+                recent_feedbacks: List[Dict[str, Any]],
+                keywords: SpaceSaving,
+                keyword_k: int) -> Dict[str, Any]:
+    """
+    집계 결과를 get_feedback_stats 응답 형식으로 맞춥니다.
+
+    keyword_top 의 error 는 추정 빈도의 최대 오차입니다 (실제 빈도는 count - error 이상 count 이하).
+    """
+    total_count = aggregates.get("total_count", 0) or 0
+    emotion_stats = aggregates.get("emotion_stats") or {}
+    top_keywords = keywords.top(keyword_k)
+
+    return {
+        "total_count": total_count,
+        "emotion_stats": emotion_stats,
+        "skill_stats": aggregates.get("skill_stats") or {},
+        "keyword_stats": {keyword: count for keyword, count, _ in top_keywords},
+        "keyword_top": [
+            {"keyword": keyword, "count": count, "error": error}
+            for keyword, count, error in top_keywords
+        ],
+        "keyword_k": keyword_k,
+        "positive_rate": emotion_stats.get(EmotionEnum.POSITIVE.value, 0) / total_count if total_count else 0.0,
+        "negative_rate": emotion_stats.get(EmotionEnum.NEGATIVE.value, 0) / total_count if total_count else 0.0,
+        "recent_feedbacks": recent_feedbacks
+    }
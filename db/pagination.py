@@ -0,0 +1,31 @@
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from db.timeseries import parse_timestamp
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """마지막 행의 (created_at, id) 를 다음 페이지 커서 문자열로 만듭니다."""
+    raw = json.dumps([str(row["created_at"]), str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """커서 문자열을 (created_at, id) 로 되돌립니다. 형식이 잘못되면 ValueError"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValueError("잘못된 커서입니다.")
+    # 저장소 쿼리에 그대로 넣으므로 시각과 UUID 형식인지 확인 (DB 오류 대신 400 으로 응답)
+    try:
+        parse_timestamp(created_at)
+        UUID(row_id)
+    except ValueError as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    return created_at, row_id
@@ -0,0 +1,188 @@
+"""
+httpx.AsyncClient 기반 비동기 PostgREST 클라이언트.
+
+supabase-py 의 동기 쿼리 빌더와 같은 형태(table().select().eq()..., rpc())로 쿼리를 만들고
+`await query.execute()` 로 실행합니다. 연결은 클라이언트 하나의 커넥션 풀에서 재사용됩니다.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import httpx
+
+
+class APIResponse:
+    """쿼리 실행 결과 (supabase-py 의 APIResponse 와 같은 data 속성)"""
+
+    __slots__ = ("data", "status_code")
+
+    def __init__(self, data: Any, status_code: int):
+        self.data = data
+        self.status_code = status_code
+
+
+class PostgrestError(Exception):
+    """PostgREST 오류 응답. code 는 PostgreSQL 오류 코드 (예: 23503 외래 키 위반)"""
+
+    def __init__(self, status_code: int, code: Optional[str], message: str,
+                 details: Optional[str] = None, hint: Optional[str] = None):
+        super().__init__(f"[{status_code}] {code or ''} {message}".strip())
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+
+def quote(value: Any) -> str:
+    """in/or 필터 값: 쉼표/괄호가 들어 있어도 안전하도록 큰따옴표로 감쌉니다."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+class Query:
+    """실행 전까지 요청 정보를 모아두는 쿼리 빌더"""
+
+    def __init__(self, client: "AsyncPostgrest", method: str, path: str,
+                 json: Any = None, prefer: Optional[str] = None):
+        self._client = client
+        self._method = method
+        self._path = path
+        self._json = json
+        self._prefer = prefer
+        # 같은 컬럼에 여러 조건(gte + lte)이 붙을 수 있으므로 튜플 목록으로 보관
+        self._params: List[Tuple[str, str]] = []
+
+    def _filter(self, column: str, operator: str, value: Any) -> "Query":
+        self._params.append((column, f"{operator}.{value}"))
+        return self
+
+    def select(self, columns: str = "*") -> "Query":
+        self._params.append(("select", columns))
+        return self
+
+    def eq(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "lte", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "Query":
+        return self._filter(column, "in", "(" + ",".join(quote(v) for v in values) + ")")
+
+    def or_(self, filters: str) -> "Query":
+        """논리 조건 (예: "created_at.lt.X,and(created_at.eq.X,id.lt.Y)")"""
+        self._params.append(("or", f"({filters})"))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "Query":
+        """정렬 조건을 추가합니다. 여러 번 호출하면 앞의 정렬이 우선합니다."""
+        term = f"{column}.{'desc' if desc else 'asc'}"
+        for i, (key, value) in enumerate(self._params):
+            if key == "order":
+                self._params[i] = ("order", f"{value},{term}")
+                return self
+        self._params.append(("order", term))
+        return self
+
+    def limit(self, count: int) -> "Query":
+        self._params.append(("limit", str(count)))
+        return self
+
+    async def execute(self) -> APIResponse:
+        return await self._client.request(self._method, self._path, self._params, self._json, self._prefer)
+
+
+class TableQuery:
+    """client.table(name) 의 결과. select/insert/upsert/update/delete 로 쿼리를 시작합니다."""
+
+    def __init__(self, client: "AsyncPostgrest", table: str):
+        self._client = client
+        self._path = f"/{table}"
+
+    def select(self, columns: str = "*") -> Query:
+        return Query(self._client, "GET", self._path).select(columns)
+
+    def insert(self, rows: Union[Dict[str, Any], List[Dict[str, Any]]], returning: bool = True) -> Query:
+        prefer = "return=representation" if returning else "return=minimal"
+        return Query(self._client, "POST", self._path, json=rows, prefer=prefer)
+
+    def upsert(self, rows: Union[Dict[str, Any], List[Dict[str, Any]]], returning: bool = True) -> Query:
+        prefer = "resolution=merge-duplicates," + ("return=representation" if returning else "return=minimal")
+        return Query(self._client, "POST", self._path, json=rows, prefer=prefer)
+
+    def update(self, values: Dict[str, Any], returning: bool = True) -> Query:
+        return Query(self._client, "PATCH", self._path, json=values,
+                     prefer="return=representation" if returning else "return=minimal")
+
+    def delete(self, returning: bool = True) -> Query:
+        return Query(self._client, "DELETE", self._path,
+                     prefer="return=representation" if returning else "return=minimal")
+
+
+class AsyncPostgrest:
+    """
+    Supabase REST(PostgREST) 엔드포인트용 비동기 클라이언트.
+
+    Args:
+        url: Supabase 프로젝트 URL (https://xxx.supabase.co)
+        key: API 키 (service role)
+        max_connections: 동시에 열 수 있는 최대 연결 수
+        max_keepalive: 재사용을 위해 유지하는 유휴 연결 수
+        timeout: 요청 전체(읽기/쓰기/풀 대기) 제한 시간 (초)
+        connect_timeout: 연결 수립 제한 시간 (초)
+        transport: httpx 전송 계층 (테스트용)
+    """
+
+    def __init__(self, url: str, key: str,
+                 max_connections: int = 20,
+                 max_keepalive: int = 10,
+                 timeout: float = 10.0,
+                 connect_timeout: float = 3.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._http = httpx.AsyncClient(
+            base_url=url.rstrip("/") + "/rest/v1",
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            transport=transport,
+        )
+
+    def table(self, name: str) -> TableQuery:
+        return TableQuery(self, name)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Query:
+        return Query(self, "POST", f"/rpc/{function}", json=params or {})
+
+    async def request(self, method: str, path: str, params: List[Tuple[str, str]],
+                      json: Any = None, prefer: Optional[str] = None) -> APIResponse:
+        headers = {"Prefer": prefer} if prefer else None
+        response = await self._http.request(method, path, params=params, json=json, headers=headers)
+
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {"message": response.text}
+            raise PostgrestError(
+                response.status_code,
+                error.get("code"),
+                error.get("message") or response.reason_phrase,
+                error.get("details"),
+                error.get("hint"),
+            )
+
+        data = response.json() if response.content else None
+        return APIResponse(data, response.status_code)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
@@ -0,0 +1,190 @@
+"""
+일별 피드백 롤업 (feedback_daily_rollups) 관련 도우미와 백필/재계산 명령.
+
+롤업 행은 (day, user_id, skill) 단위로 전체/긍정/부정 건수와
+감정별, 키워드별 건수를 가집니다. 테이블과 DB 함수는 db/sql/feedback_rollups.sql 에 있습니다.
+재계산은 최근 구간부터 실행해, 오늘까지 이어진 범위만큼 백필 워터마크(complete_from)가 앞당겨집니다.
+
+사용 예:
+    python -m db.rollups rebuild --start 2025-01-01 --end 2025-06-30
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.topk import SpaceSaving
+from models.feedback import EmotionEnum
+
+# 재계산은 이 일수 단위로 나누어 실행 (DB 함수 한 번의 실행 시간 제한)
+REBUILD_CHUNK_DAYS = 31
+
+_EPSILON = timedelta(microseconds=1)
+
+
+def _day_of(created_at: Any) -> str:
+    """created_at (ISO 문자열 또는 datetime) 에서 UTC 기준 날짜를 꺼냅니다."""
+    if isinstance(created_at, datetime):
+        return created_at.date().isoformat()
+    return str(created_at)[:10]
+
+
+def build_rollup_deltas(feedbacks: Iterable[Dict[str, Any]], count: bool = True) -> List[Dict[str, Any]]:
+    """
+    피드백 행들을 (day, user_id, skill) 별 증가분으로 묶습니다.
+
+    같은 키가 한 번의 upsert 에 두 번 나오지 않도록 여기서 미리 합칩니다.
+    count=False 이면 건수(total)는 더하지 않습니다 (이미 저장된 피드백에 태그만 채운 경우).
+    """
+    deltas: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    for feedback in feedbacks:
+        key = (_day_of(feedback["created_at"]), str(feedback["user_id"]), feedback.get("skill") or "")
+        delta = deltas.get(key)
+        if delta is None:
+            delta = {
+                "day": key[0],
+                "user_id": key[1],
+                "skill": key[2],
+                "total": 0,
+                "positive": 0,
+                "negative": 0,
+                "emotion_counts": {},
+                "keyword_counts": {},
+            }
+            deltas[key] = delta
+
+        if count:
+            delta["total"] += 1
+
+        emotion = feedback.get("emotion")
+        if emotion:
+            emotion = getattr(emotion, "value", emotion)
+            delta["emotion_counts"][emotion] = delta["emotion_counts"].get(emotion, 0) + 1
+            if emotion == EmotionEnum.POSITIVE.value:
+                delta["positive"] += 1
+            elif emotion == EmotionEnum.NEGATIVE.value:
+                delta["negative"] += 1
+
+        for keyword in feedback.get("keywords") or []:
+            delta["keyword_counts"][keyword] = delta["keyword_counts"].get(keyword, 0) + 1
+
+    return list(deltas.values())
+
+
+def split_full_days(start: datetime, end: datetime) -> Tuple[Optional[Tuple[date, date]], List[Tuple[datetime, datetime]]]:
+    """
+    [start, end] 기간을 롤업으로 합산할 수 있는 온전한 날짜 구간과 나머지 시간 구간으로 나눕니다.
+
+    Returns:
+        (롤업 날짜 구간 (양 끝 포함) 또는 None, 원본에서 집계해야 할 [시작, 끝] 시각 구간 목록)
+    """
+    first_full = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    # end 는 포함 경계이므로 end 가 속한 날은 그날 23:59:59.999999 일 때만 온전한 날
+    last_full = end.date() if end.time() == time.max else end.date() - timedelta(days=1)
+
+    if first_full > last_full:
+        return None, [(start, end)]
+
+    edges = []
+    first_full_start = datetime.combine(first_full, time.min, tzinfo=start.tzinfo)
+    if start < first_full_start:
+        edges.append((start, first_full_start - _EPSILON))
+    after_last_full = datetime.combine(last_full + timedelta(days=1), time.min, tzinfo=end.tzinfo)
+    if end >= after_last_full:
+        edges.append((after_last_full, end))
+    return (first_full, last_full), edges
+
+
+def split_at_watermark(full_days: Tuple[date, date],
+                       complete_from: Optional[date],
+                       tzinfo: Any = None) -> Tuple[Optional[Tuple[date, date]], Optional[Tuple[datetime, datetime]]]:
+    """
+    온전한 날짜 구간을 백필 워터마크 기준으로 나눕니다 (워터마크 전 날짜의 롤업은 비어 있을 수 있음).
+
+    Returns:
+        (롤업으로 합산할 날짜 구간 또는 None, 원본에서 집계할 [시작, 끝] 시각 구간 또는 None)
+    """
+    first, last = full_days
+    if complete_from is None or complete_from > last:
+        raw_last = last
+    elif complete_from <= first:
+        return full_days, None
+    else:
+        raw_last = complete_from - timedelta(days=1)
+
+    raw = (datetime.combine(first, time.min, tzinfo=tzinfo), datetime.combine(raw_last, time.max, tzinfo=tzinfo))
+    if raw_last == last:
+        return None, raw
+    return (complete_from, last), raw
+
+
+def keyword_sketch(aggregates: Dict[str, Any], limit: int) -> SpaceSaving:
+    """
+    집계 결과의 키워드 빈도를 상위 K 요약으로 바꿉니다.
+
+    DB 함수는 상위 limit 개만 돌려주므로, limit 개가 꽉 찼으면 잘린 결과로 보고
+    빠진 키워드의 빈도 상한을 남겨 둡니다.
+    """
+    sketch = aggregates.get("keyword_sketch")
+    if sketch is not None:
+        return sketch
+    counts = aggregates.get("keyword_stats") or {}
+    return SpaceSaving.from_counts(counts, capacity=limit, truncated=len(counts) >= limit)
+
+
+def merge_aggregates(parts: Iterable[Dict[str, Any]], keyword_limit: int) -> Dict[str, Any]:
+    """feedback_stats 형태의 집계 결과 여러 개를 합칩니다. 키워드는 상위 K 요약끼리 병합합니다."""
+    merged: Dict[str, Any] = {"total_count": 0, "emotion_stats": {}, "skill_stats": {}}
+    sketch = SpaceSaving(keyword_limit)
+    for part in parts:
+        merged["total_count"] += part.get("total_count") or 0
+        for field in ("emotion_stats", "skill_stats"):
+            counts = merged[field]
+            for key, count in (part.get(field) or {}).items():
+                counts[key] = counts.get(key, 0) + count
+        sketch.merge(keyword_sketch(part, keyword_limit))
+    merged["keyword_sketch"] = sketch
+    return merged
+
+
+def day_chunks(start: date, end: date, days: int = REBUILD_CHUNK_DAYS) -> List[Tuple[date, date]]:
+    """[start, end] 기간을 days 일 단위 구간으로 나눕니다 (양 끝 포함)."""
+    chunks = []
+    current = start
+    while current <= end:
+        chunk_end = min(current + timedelta(days=days - 1), end)
+        chunks.append((current, chunk_end))
+        current = chunk_end + timedelta(days=1)
+    return chunks
+
+
+async def _rebuild(start: date, end: date) -> None:
+    from db.storage import storage
+
+    total = 0
+    try:
+        # 최근 구간부터 (워터마크가 끊김 없이 앞당겨지도록)
+        for chunk_start, chunk_end in reversed(day_chunks(start, end)):
+            rows = await storage.rebuild_rollups(chunk_start, chunk_end)
+            total += rows
+            print(f"{chunk_start} ~ {chunk_end}: 롤업 {rows}행 재계산")
+    finally:
+        await storage.aclose()
+    print(f"완료: 총 {total}행")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일별 피드백 롤업 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = sub.add_parser("rebuild", help="기간의 롤업을 원본 피드백으로 다시 계산 (백필 포함)")
+    rebuild.add_argument("--start", required=True, type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    rebuild.add_argument("--end", type=date.fromisoformat, default=date.today(), help="종료일 (YYYY-MM-DD, 기본값 오늘)")
+
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        asyncio.run(_rebuild(args.start, args.end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+-- 사용자 피드백 목록 키셋 페이지네이션 (SupabaseClient.get_user_feedback_page)
+--
+-- user_id 조건 + (created_at, id) 내림차순 정렬/비교를 인덱스 하나로 처리합니다.
+--
+-- 적용: `psql "$SUPABASE_DB_URL" -f db/sql/feedback_listing.sql`
+
+create index if not exists feedbacks_user_id_created_at_id_idx
+    on feedbacks (user_id, created_at desc, id desc);
@@ -0,0 +1,190 @@
+-- 일별 피드백 롤업 (FEEDBACK_STATS_MODE=rollup)
+--
+-- (day, user_id, skill) 단위 카운터를 피드백 저장 시 증분 반영하고,
+-- 통계 조회는 기간 내 롤업 행을 합산합니다. 원본과 어긋나면 rebuild 로 다시 계산합니다.
+--
+-- 적용한 뒤에는 증분만 쌓이므로 그 전 날짜의 롤업은 비어 있습니다. 백필(rebuild)이 오늘까지
+-- 끝나면 feedback_rollup_state.complete_from (워터마크)이 설정되고, 통계는 그 날짜부터만
+-- 롤업을 쓰며 그 전 날짜는 원본에서 집계합니다 (워터마크가 없으면 롤업을 쓰지 않음).
+--
+-- 적용: `psql "$SUPABASE_DB_URL" -f db/sql/feedback_rollups.sql`
+-- 백필: `python -m db.rollups rebuild --start 2025-01-01`
+
+create table if not exists feedback_daily_rollups (
+    day date not null,
+    user_id uuid not null,
+    skill text not null default '',
+    total integer not null default 0,
+    positive integer not null default 0,
+    negative integer not null default 0,
+    emotion_counts jsonb not null default '{}'::jsonb,
+    keyword_counts jsonb not null default '{}'::jsonb,
+    primary key (day, user_id, skill)
+);
+
+create index if not exists feedback_daily_rollups_user_day_idx
+    on feedback_daily_rollups (user_id, day);
+
+-- 백필 워터마크 (한 행). complete_from 날짜부터(포함) 롤업이 원본과 맞음
+create table if not exists feedback_rollup_state (
+    id boolean primary key default true check (id),
+    complete_from date
+);
+
+insert into feedback_rollup_state (id) values (true) on conflict (id) do nothing;
+
+-- {"a": 1} + {"a": 2, "b": 1} = {"a": 3, "b": 1}
+create or replace function jsonb_add_counts(a jsonb, b jsonb)
+returns jsonb
+language sql
+immutable
+as $$
+    select coalesce(jsonb_object_agg(key, n), '{}'::jsonb)
+    from (
+        select key, sum(value::bigint) as n
+        from (
+            select * from jsonb_each_text(coalesce(a, '{}'::jsonb))
+            union all
+            select * from jsonb_each_text(coalesce(b, '{}'::jsonb))
+        ) t
+        group by key
+    ) s;
+$$;
+
+-- 증분 반영. deltas 는 (day, user_id, skill) 이 중복되지 않는 증가분 배열
+create or replace function apply_feedback_rollups(deltas jsonb)
+returns void
+language sql
+as $$
+    insert into feedback_daily_rollups as r
+        (day, user_id, skill, total, positive, negative, emotion_counts, keyword_counts)
+    select
+        (d->>'day')::date,
+        (d->>'user_id')::uuid,
+        coalesce(d->>'skill', ''),
+        coalesce((d->>'total')::int, 0),
+        coalesce((d->>'positive')::int, 0),
+        coalesce((d->>'negative')::int, 0),
+        coalesce(d->'emotion_counts', '{}'::jsonb),
+        coalesce(d->'keyword_counts', '{}'::jsonb)
+    from jsonb_array_elements(deltas) as d
+    on conflict (day, user_id, skill) do update set
+        total = r.total + excluded.total,
+        positive = r.positive + excluded.positive,
+        negative = r.negative + excluded.negative,
+        emotion_counts = jsonb_add_counts(r.emotion_counts, excluded.emotion_counts),
+        keyword_counts = jsonb_add_counts(r.keyword_counts, excluded.keyword_counts);
+$$;
+
+-- 기간의 롤업을 원본 feedbacks 로 다시 계산하고 생성된 행 수를 반환.
+-- 오늘(UTC)까지 이어지는 재계산이면 워터마크를 start_day 로 설정하고, 워터마크 바로 앞까지
+-- 이어지는 재계산이면 워터마크를 start_day 로 당김 (db.rollups 는 최근 구간부터 실행)
+create or replace function rebuild_feedback_rollups(start_day date, end_day date)
+returns integer
+language plpgsql
+as $$
+declare
+    inserted integer;
+begin
+    delete from feedback_daily_rollups where day between start_day and end_day;
+
+    with base as (
+        select
+            (created_at at time zone 'utc')::date as day,
+            user_id,
+            coalesce(skill, '') as skill,
+            emotion,
+            keywords
+        from feedbacks
+        where created_at >= start_day::timestamp at time zone 'utc'
+          and created_at < (end_day + 1)::timestamp at time zone 'utc'
+    ),
+    totals as (
+        select
+            day, user_id, skill,
+            count(*) as total,
+            count(*) filter (where emotion = 'positive') as positive,
+            count(*) filter (where emotion = 'negative') as negative
+        from base
+        group by day, user_id, skill
+    ),
+    emotions as (
+        select day, user_id, skill, jsonb_object_agg(emotion, n) as emotion_counts
+        from (
+            select day, user_id, skill, emotion, count(*) as n
+            from base
+            where emotion is not null
+            group by day, user_id, skill, emotion
+        ) e
+        group by day, user_id, skill
+    ),
+    keywords as (
+        select day, user_id, skill, jsonb_object_agg(keyword, n) as keyword_counts
+        from (
+            select day, user_id, skill, keyword, count(*) as n
+            from base, unnest(base.keywords) as keyword
+            group by day, user_id, skill, keyword
+        ) k
+        group by day, user_id, skill
+    )
+    insert into feedback_daily_rollups
+        (day, user_id, skill, total, positive, negative, emotion_counts, keyword_counts)
+    select
+        t.day, t.user_id, t.skill, t.total, t.positive, t.negative,
+        coalesce(e.emotion_counts, '{}'::jsonb),
+        coalesce(k.keyword_counts, '{}'::jsonb)
+    from totals t
+    left join emotions e using (day, user_id, skill)
+    left join keywords k using (day, user_id, skill);
+
+    get diagnostics inserted = row_count;
+
+    update feedback_rollup_state
+    set complete_from = start_day
+    where (complete_from is null and end_day >= (now() at time zone 'utc')::date)
+       or (complete_from is not null and start_day < complete_from and end_day + 1 >= complete_from);
+
+    return inserted;
+end;
+$$;
+
+-- 기간(양 끝 날짜 포함) 롤업 합산. feedback_stats() 와 같은 형태의 JSON 을 반환
+-- p_keyword_limit: 빈도 상위 N개 키워드만 반환 (null 이면 전체)
+drop function if exists feedback_rollup_stats(date, date, uuid);
+
+create or replace function feedback_rollup_stats(
+    start_day date,
+    end_day date,
+    p_user_id uuid default null,
+    p_keyword_limit integer default null
+)
+returns json
+language sql
+stable
+as $$
+    with r as (
+        select *
+        from feedback_daily_rollups
+        where day between start_day and end_day
+          and (p_user_id is null or user_id = p_user_id)
+    )
+    select json_build_object(
+        'total_count', coalesce((select sum(total) from r), 0),
+        'emotion_stats', coalesce(
+            (select json_object_agg(key, n)
+             from (select key, sum(value::bigint) as n from r, jsonb_each_text(r.emotion_counts) group by key) e),
+            '{}'::json
+        ),
+        'skill_stats', coalesce(
+            (select json_object_agg(skill, n)
+             from (select skill, sum(total) as n from r where skill <> '' group by skill) s),
+            '{}'::json
+        ),
+        'keyword_stats', coalesce(
+            (select json_object_agg(key, n)
+             from (select key, sum(value::bigint) as n from r, jsonb_each_text(r.keyword_counts)
+                   group by key order by n desc, key limit p_keyword_limit) k),
+            '{}'::json
+        )
+    );
+$$;
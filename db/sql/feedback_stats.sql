@@ -0,0 +1,54 @@
+-- 피드백 통계 집계 함수 (SupabaseClient.get_feedback_stats, FEEDBACK_STATS_MODE=rpc)
+--
+-- 기간(및 사용자) 내 피드백의 감정/스킬/키워드 건수를 DB 에서 집계해 JSON 하나로 반환합니다.
+-- 최근 피드백 목록은 클라이언트가 정렬/제한 쿼리로 따로 조회합니다.
+--
+-- 적용: Supabase SQL Editor 에서 실행하거나 `psql "$SUPABASE_DB_URL" -f db/sql/feedback_stats.sql`
+
+create index if not exists feedbacks_created_at_idx
+    on feedbacks (created_at desc);
+
+create index if not exists feedbacks_user_id_created_at_idx
+    on feedbacks (user_id, created_at desc);
+
+-- p_keyword_limit 를 추가하면서 이전 시그니처는 제거 (같은 이름의 오버로드 방지)
+drop function if exists feedback_stats(timestamptz, timestamptz, uuid);
+
+-- p_keyword_limit: 빈도 상위 N개 키워드만 반환 (null 이면 전체)
+create or replace function feedback_stats(
+    start_ts timestamptz,
+    end_ts timestamptz,
+    p_user_id uuid default null,
+    p_keyword_limit integer default null
+)
+returns json
+language sql
+stable
+as $$
+    with f as (
+        select skill, emotion, keywords
+        from feedbacks
+        where created_at >= start_ts
+          and created_at <= end_ts
+          and (p_user_id is null or user_id = p_user_id)
+    )
+    select json_build_object(
+        'total_count', (select count(*) from f),
+        'emotion_stats', coalesce(
+            (select json_object_agg(emotion, n)
+             from (select emotion, count(*) as n from f where emotion is not null group by emotion) e),
+            '{}'::json
+        ),
+        'skill_stats', coalesce(
+            (select json_object_agg(skill, n)
+             from (select skill, count(*) as n from f where skill is not null group by skill) s),
+            '{}'::json
+        ),
+        'keyword_stats', coalesce(
+            (select json_object_agg(keyword, n)
+             from (select keyword, count(*) as n from f, unnest(f.keywords) as keyword
+                   group by keyword order by n desc, keyword limit p_keyword_limit) k),
+            '{}'::json
+        )
+    );
+$$;
@@ -0,0 +1,44 @@
+-- 피드백 시계열 집계 함수 (SupabaseClient.get_feedback_timeseries, /feedback/timeseries)
+--
+-- 기간(및 사용자) 내 피드백을 hour/day/week 구간으로 묶어 구간별 전체/긍정/부정 건수와
+-- 스킬별 건수를 한 번의 group by 로 계산합니다. 빈 구간 채우기와 비율 계산은 클라이언트에서 합니다.
+-- 구간 경계는 UTC 기준이며 week 는 월요일 시작입니다.
+--
+-- 적용: `psql "$SUPABASE_DB_URL" -f db/sql/feedback_timeseries.sql`
+-- (feedbacks_created_at_idx / feedbacks_user_id_created_at_idx 는 feedback_stats.sql 에서 생성)
+
+create or replace function feedback_timeseries(
+    start_ts timestamptz,
+    end_ts timestamptz,
+    p_bucket text default 'day',
+    p_user_id uuid default null
+)
+returns json
+language sql
+stable
+as $$
+    with s as (
+        select
+            date_trunc(p_bucket, created_at at time zone 'UTC') as bucket,
+            skill,
+            count(*) as total,
+            count(*) filter (where emotion = 'positive') as positive,
+            count(*) filter (where emotion = 'negative') as negative
+        from feedbacks
+        where created_at >= start_ts
+          and created_at <= end_ts
+          and (p_user_id is null or user_id = p_user_id)
+        group by 1, 2
+    )
+    select coalesce(json_agg(b order by b.bucket), '[]'::json)
+    from (
+        select
+            bucket,
+            sum(total)::bigint as total,
+            sum(positive)::bigint as positive,
+            sum(negative)::bigint as negative,
+            coalesce(json_object_agg(skill, total) filter (where skill is not null), '{}'::json) as skills
+        from s
+        group by bucket
+    ) b;
+$$;
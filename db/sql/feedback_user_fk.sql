@@ -0,0 +1,30 @@
+-- feedbacks.user_id 외래 키 (USER_CHECK_MODE=cache, fk 모두 필요)
+--
+-- fk 모드에서는 피드백 저장 전에 사용자를 조회하지 않고, 이 제약의 위반(23503)을
+-- "존재하지 않는 사용자입니다." 오류로 변환합니다. cache 모드에서도 캐시에 남아 있는
+-- 삭제된 사용자(USER_CACHE_TTL 동안)의 피드백은 이 제약으로만 막을 수 있습니다.
+--
+-- on delete cascade 는 쓰지 않습니다. 피드백이 있는 사용자는 삭제되지 않으며, 피드백을
+-- DB 에서 직접 지우면 일별 롤업(feedback_daily_rollups)과 통계 캐시가 맞지 않게 됩니다.
+--
+-- 제약은 not valid 로 먼저 추가(기존 행 검사 없이 새 행부터 적용)한 뒤 validate 합니다.
+-- 사용자가 없는 기존 피드백이 있으면 validate 가 실패하므로 아래 쿼리로 확인해 정리한 뒤
+-- 다시 실행하세요.
+--   select f.id, f.user_id from feedbacks f left join users u on u.id = f.user_id where u.id is null;
+--
+-- 적용: `psql "$SUPABASE_DB_URL" -f db/sql/feedback_user_fk.sql`
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint where conname = 'feedbacks_user_id_fkey'
+    ) then
+        alter table feedbacks
+            add constraint feedbacks_user_id_fkey
+            foreign key (user_id) references users (id) not valid;
+    end if;
+end;
+$$;
+
+-- 이미 검사된 제약이면 아무 일도 하지 않음
+alter table feedbacks validate constraint feedbacks_user_id_fkey;
@@ -0,0 +1,367 @@
+"""
+내장 SQLite 저장소 백엔드 (STORAGE_BACKEND=sqlite).
+
+Supabase 없이 테스트, 벤치마크, 부하 테스트를 실제와 비슷한 데이터 양으로 돌릴 때 사용합니다.
+연결 하나를 전용 스레드(offload 풀 "sqlite", 크기 1)에서만 사용하므로 이벤트 루프를 막지 않고
+쓰기도 순서대로 처리됩니다. 파일 DB 는 WAL 모드로 엽니다.
+
+시각은 UTC 기준 naive ISO 문자열(마이크로초 자리 고정)로 저장해 문자열 비교가 시간 순서와 같습니다.
+"""
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from uuid import UUID
+from config.logger import logger, throttled
+from core.tracing import start_span
+from db.backend import (
+    FEEDBACK_PAGE_MAX,
+    FEEDBACK_PAGE_SIZE,
+    RECENT_FEEDBACK_LIMIT,
+    USER_NOT_FOUND,
+    StorageBackend,
+    build_stats,
+    feedback_row,
+    hide_cursor_columns,
+    list_columns,
+    sketch_size_for,
+)
+from db.pagination import decode_cursor, encode_cursor
+from db.rollups import keyword_sketch
+from db.timeseries import build_series
+from models.feedback import FeedbackCreate, FeedbackInDB, UserCreate, UserInDB
+from utils.offload import run_blocking
+
+T = TypeVar("T")
+
+# DB 파일 경로 (":memory:" 이면 메모리 DB)
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/standard_ai.db")
+
+# IN 목록 한 번에 넣는 값 수 (SQLite 변수 개수 제한 999 이하)
+SQLITE_IN_CHUNK_SIZE = 500
+
+SCHEMA = """
+create table if not exists users (
+    id text primary key,
+    name text not null,
+    created_at text not null
+);
+
+create table if not exists feedbacks (
+    id text primary key,
+    user_id text not null references users (id),
+    content text not null,
+    skill text,
+    emotion text,
+    keywords text not null default '[]',
+    created_at text not null
+);
+
+create index if not exists feedbacks_user_id_created_at_idx
+    on feedbacks (user_id, created_at desc, id desc);
+
+create index if not exists feedbacks_created_at_idx
+    on feedbacks (created_at desc);
+
+create table if not exists summaries (
+    id text primary key,
+    user_id text,
+    input_text text not null,
+    summary text not null,
+    created_at text not null
+);
+"""
+
+# 시계열 구간 시작 시각 (db/timeseries.py 의 bucket_start 와 같은 경계, week 는 월요일 시작)
+_BUCKET_EXPRESSIONS = {
+    "hour": "strftime('%Y-%m-%dT%H:00:00', created_at)",
+    "day": "strftime('%Y-%m-%dT00:00:00', created_at)",
+    "week": "strftime('%Y-%m-%dT00:00:00', created_at, '-6 days', 'weekday 1')",
+}
+
+
+def _ts(value: datetime) -> str:
+    """UTC 기준 naive ISO 문자열 (마이크로초 자리 고정)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+def _feedback_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """조회 행을 Supabase 응답과 같은 형태의 dict 로 바꿉니다 (keywords 는 목록)."""
+    item = dict(row)
+    if "keywords" in item:
+        item["keywords"] = json.loads(item["keywords"]) if item["keywords"] else []
+    return item
+
+
+def _range_where(start_date: datetime,
+                 end_date: datetime,
+                 user_id: Optional[UUID] = None) -> Tuple[str, List[Any]]:
+    """기간(및 사용자) 조건 SQL 과 바인딩 값"""
+    where = "created_at >= ? and created_at <= ?"
+    params: List[Any] = [_ts(start_date), _ts(end_date)]
+    if user_id:
+        where += " and user_id = ?"
+        params.append(str(user_id))
+    return where, params
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite 저장소 백엔드.
+
+    Args:
+        path: DB 파일 경로 (기본값 SQLITE_PATH, ":memory:" 가능)
+    """
+
+    def __init__(self, path: str = SQLITE_PATH):
+        super().__init__()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("pragma foreign_keys = on")
+        if path != ":memory:":
+            self.conn.execute("pragma journal_mode = wal")
+            self.conn.execute("pragma synchronous = normal")
+        self.conn.executescript(SCHEMA)
+        logger.info("SQLite 저장소 초기화 완료: %s", path)
+
+    async def _run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        """DB 작업을 전용 스레드에서 실행합니다."""
+        with start_span("db.sqlite", operation=operation):
+            return await run_blocking("sqlite", func, *args)
+
+    async def aclose(self) -> None:
+        await self._run("close", self.conn.close)
+
+    async def create_user(self, user: UserCreate) -> UserInDB:
+        """새로운 사용자를 생성합니다."""
+        user_id = str(uuid.uuid4())
+
+        def insert():
+            with self.conn:
+                self.conn.execute(
+                    "insert into users (id, name, created_at) values (?, ?, ?)",
+                    (user_id, user.name, _ts(datetime.utcnow()))
+                )
+
+        await self._run("users.insert", insert)
+        logger.info("새로운 사용자 생성 완료: name=%s", user.name)
+        self.known_users.add(user_id)
+        return UserInDB(id=user_id, name=user.name)
+
+    async def get_user(self, user_id: UUID) -> Optional[UserInDB]:
+        """사용자 정보를 조회합니다."""
+        row = await self._run(
+            "users.select",
+            lambda: self.conn.execute("select id, name from users where id = ?", (str(user_id),)).fetchone()
+        )
+        if row is None:
+            self.known_users.discard(user_id)
+            return None
+        self.known_users.add(user_id)
+        return UserInDB(**dict(row))
+
+    async def tag_feedback(self,
+                           feedback: FeedbackInDB,
+                           emotion: Optional[str] = None,
+                           keywords: Optional[List[str]] = None) -> None:
+        """저장된 피드백의 비어 있던 감정/키워드를 채웁니다 (통계는 원본에서 집계하므로 캐시만 무효화)."""
+        values: Dict[str, Any] = {}
+        if emotion is not None:
+            values["emotion"] = emotion
+        if keywords is not None:
+            values["keywords"] = json.dumps(keywords, ensure_ascii=False)
+        if not values:
+            return
+
+        def update():
+            with self.conn:
+                self.conn.execute(
+                    f"update feedbacks set {', '.join(f'{column} = :{column}' for column in values)} where id = :id",
+                    {**values, "id": str(feedback.id)}
+                )
+
+        await self._run("feedbacks.update_tags", update)
+        await self._after_feedback_tagged(feedback, emotion)
+
+    def _insert_feedbacks(self, rows: List[Dict[str, Any]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "insert into feedbacks (id, user_id, content, skill, emotion, keywords, created_at) "
+                "values (:id, :user_id, :content, :skill, :emotion, :keywords, :created_at)",
+                [{**row, "keywords": json.dumps(row["keywords"] or [], ensure_ascii=False)} for row in rows]
+            )
+
+    def _new_feedback_row(self, feedback: FeedbackCreate, created_at: datetime) -> Dict[str, Any]:
+        row = feedback_row(feedback, created_at)
+        row["id"] = str(uuid.uuid4())
+        row["created_at"] = _ts(created_at)
+        # enum 은 값 문자열로 저장
+        row["skill"] = getattr(row["skill"], "value", row["skill"])
+        row["emotion"] = getattr(row["emotion"], "value", row["emotion"])
+        return row
+
+    async def create_feedback(self, feedback: FeedbackCreate) -> FeedbackInDB:
+        """새로운 피드백을 생성합니다. 사용자 확인은 외래 키 제약으로 합니다."""
+        created_at = datetime.utcnow()
+        row = self._new_feedback_row(feedback, created_at)
+        try:
+            await self._run("feedbacks.insert", self._insert_feedbacks, [row])
+        except sqlite3.IntegrityError as e:
+            raise ValueError(USER_NOT_FOUND) from e
+
+        logger.info("새로운 피드백 저장 완료: user_id=%s", feedback.user_id, extra=throttled(20))
+        await self._after_feedbacks_saved([row], created_at)
+        return FeedbackInDB(**row)
+
+    async def create_feedbacks(self, feedbacks: List[FeedbackCreate]) -> Dict[str, Any]:
+        """여러 피드백을 한 트랜잭션으로 저장합니다. 존재하지 않는 사용자의 항목은 errors 로 반환합니다."""
+        created_at = datetime.utcnow()
+        user_ids = list({str(feedback.user_id) for feedback in feedbacks})
+
+        def existing_users():
+            existing = set()
+            for i in range(0, len(user_ids), SQLITE_IN_CHUNK_SIZE):
+                chunk = user_ids[i:i + SQLITE_IN_CHUNK_SIZE]
+                rows = self.conn.execute(
+                    f"select id from users where id in ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                existing.update(row["id"] for row in rows)
+            return existing
+
+        existing = await self._run("users.select_in", existing_users)
+
+        errors: List[Dict[str, Any]] = []
+        rows: List[Dict[str, Any]] = []
+        for index, feedback in enumerate(feedbacks):
+            if str(feedback.user_id) in existing:
+                rows.append(self._new_feedback_row(feedback, created_at))
+            else:
+                errors.append({"index": index, "error": USER_NOT_FOUND})
+
+        if rows:
+            await self._run("feedbacks.insert_bulk", self._insert_feedbacks, rows)
+            await self._after_feedbacks_saved(rows, created_at)
+
+        logger.info("피드백 일괄 저장 완료: 저장=%d, 실패=%d", len(rows), len(errors))
+        return {"inserted": len(rows), "failed": len(errors), "errors": errors}
+
+    async def get_user_feedback_page(self,
+                                     user_id: UUID,
+                                     limit: int = FEEDBACK_PAGE_SIZE,
+                                     cursor: Optional[str] = None,
+                                     columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """사용자의 피드백을 최신순으로 한 페이지 조회합니다 ((user_id, created_at, id) 인덱스 사용)."""
+        limit = max(1, min(limit, FEEDBACK_PAGE_MAX))
+        after = decode_cursor(cursor)
+        # 컬럼 이름은 LIST_FEEDBACK_COLUMNS 로 검증된 값만 사용
+        selected = list_columns(columns)
+
+        sql = f"select {', '.join(selected)} from feedbacks where user_id = ?"
+        params: List[Any] = [str(user_id)]
+        if after:
+            sql += " and (created_at < ? or (created_at = ? and id < ?))"
+            params.extend([after[0], after[0], after[1]])
+        # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회
+        sql += " order by created_at desc, id desc limit ?"
+        params.append(limit + 1)
+
+        rows = await self._run(
+            "feedbacks.select_page",
+            lambda: [_feedback_dict(row) for row in self.conn.execute(sql, params).fetchall()]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]) if has_more else None
+        return {"items": hide_cursor_columns(rows, columns), "next_cursor": next_cursor}
+
+    async def _compute_feedback_stats(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      user_id: Optional[UUID],
+                                      keyword_k: int) -> Dict[str, Any]:
+        """감정/스킬/키워드 건수를 group by 로 집계하고 최근 피드백은 인덱스 순서로 가져옵니다."""
+        sketch_size = sketch_size_for(keyword_k)
+        where, params = _range_where(start_date, end_date, user_id)
+
+        def aggregate():
+            conn = self.conn
+            total = conn.execute(f"select count(*) from feedbacks where {where}", params).fetchone()[0]
+            emotions = conn.execute(
+                f"select emotion, count(*) from feedbacks where {where} and emotion is not null group by emotion",
+                params
+            ).fetchall()
+            skills = conn.execute(
+                f"select skill, count(*) from feedbacks where {where} and skill is not null group by skill",
+                params
+            ).fetchall()
+            keywords = conn.execute(
+                f"select k.value, count(*) as n from feedbacks, json_each(feedbacks.keywords) as k "
+                f"where {where} group by k.value order by n desc, k.value limit ?",
+                [*params, sketch_size]
+            ).fetchall()
+            recent = conn.execute(
+                f"select id, user_id, content, skill, emotion, keywords, created_at from feedbacks "
+                f"where {where} order by created_at desc limit ?",
+                [*params, RECENT_FEEDBACK_LIMIT]
+            ).fetchall()
+
+            aggregates = {
+                "total_count": total,
+                "emotion_stats": {emotion: n for emotion, n in emotions},
+                "skill_stats": {skill: n for skill, n in skills},
+                "keyword_stats": {keyword: n for keyword, n in keywords},
+            }
+            return aggregates, [_feedback_dict(row) for row in recent]
+
+        aggregates, recent_feedbacks = await self._run("feedbacks.stats", aggregate)
+        return build_stats(aggregates, recent_feedbacks, keyword_sketch(aggregates, sketch_size), keyword_k)
+
+    async def get_feedback_timeseries(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      bucket: str = "day",
+                                      user_id: Optional[UUID] = None,
+                                      fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """(구간, 스킬) 단위 group by 한 번으로 시계열을 집계합니다."""
+        where, params = _range_where(start_date, end_date, user_id)
+        sql = (
+            f"select {_BUCKET_EXPRESSIONS[bucket]} as bucket, skill, count(*) as total, "
+            f"sum(emotion = 'positive') as positive, sum(emotion = 'negative') as negative "
+            f"from feedbacks where {where} group by 1, 2"
+        )
+        rows = await self._run("feedbacks.timeseries", lambda: self.conn.execute(sql, params).fetchall())
+
+        points: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            point = points.setdefault(
+                row["bucket"], {"bucket": row["bucket"], "total": 0, "positive": 0, "negative": 0, "skills": {}}
+            )
+            point["total"] += row["total"]
+            point["positive"] += row["positive"] or 0
+            point["negative"] += row["negative"] or 0
+            if row["skill"]:
+                point["skills"][row["skill"]] = row["total"]
+
+        return build_series(points.values(), start_date, end_date, bucket, fill_gaps)
+
+    async def create_summary(self, user_id: Optional[str], input_text: str, summary: str) -> Optional[str]:
+        """요약 결과를 저장하고 생성된 요약 ID를 반환합니다."""
+        summary_id = str(uuid.uuid4())
+
+        def insert():
+            with self.conn:
+                self.conn.execute(
+                    "insert into summaries (id, user_id, input_text, summary, created_at) values (?, ?, ?, ?, ?)",
+                    (summary_id, user_id, input_text, summary, _ts(datetime.utcnow()))
+                )
+
+        await self._run("summaries.insert", insert)
+        return summary_id
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+from config.logger import logger
+
+# 진행 중인 기간(오늘 포함)은 짧게, 이미 지난 기간은 길게 보관 (초)
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "60"))
+STATS_CACHE_HISTORICAL_TTL = float(os.getenv("STATS_CACHE_HISTORICAL_TTL", "86400"))
+STATS_CACHE_MAX_ENTRIES = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "512"))
+
+# (start_date, end_date, user_id, keyword_k)
+StatsKey = Tuple[datetime, datetime, Optional[str], Optional[int]]
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """비교를 위해 UTC 기준 naive datetime 으로 맞춥니다 (created_at 은 utcnow 로 저장됨)."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def make_key(start_date: datetime,
+             end_date: datetime,
+             user_id: Optional[Any] = None,
+             keyword_k: Optional[int] = None) -> StatsKey:
+    return _utc_naive(start_date), _utc_naive(end_date), str(user_id) if user_id else None, keyword_k
+
+
+class CacheEntry:
+    """캐시된 통계 결과와 조건부 요청용 검증자 (ETag, Last-Modified)"""
+
+    __slots__ = ("value", "etag", "last_modified", "expires_at")
+
+    def __init__(self, value: Dict[str, Any], ttl: float, now: float):
+        self.value = value
+        body = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+        self.etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        self.last_modified = now
+        self.expires_at = now + ttl
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            # 브라우저는 캐시를 보관하되 매번 재검증 (304)
+            "Cache-Control": "private, no-cache",
+        }
+
+    def not_modified(self, request_headers: Mapping[str, str]) -> bool:
+        """If-None-Match / If-Modified-Since 조건으로 304 응답이 가능한지 판단합니다."""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.last_modified) <= since
+        return False
+
+
+class StatsCache:
+    """
+    피드백 통계 결과 캐시.
+
+    - 키: (start_date, end_date, user_id, keyword_k)
+    - 피드백이 저장되면 그 시각을 포함하는 기간(해당 사용자 또는 전체)의 항목만 무효화
+    - 같은 키를 동시에 요청하면 한 번만 계산하고 결과를 공유 (계산 중 무효화되면 저장하지 않음)
+    - 종료일이 지난 기간은 STATS_CACHE_HISTORICAL_TTL, 진행 중인 기간은 STATS_CACHE_TTL 동안 보관
+    """
+
+    def __init__(self,
+                 ttl: float = STATS_CACHE_TTL,
+                 historical_ttl: float = STATS_CACHE_HISTORICAL_TTL,
+                 max_entries: int = STATS_CACHE_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self.historical_ttl = historical_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[StatsKey, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[StatsKey, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _ttl_for(self, key: StatsKey, now: float) -> float:
+        end = key[1].replace(tzinfo=timezone.utc).timestamp()
+        return self.historical_ttl if end < now else self.ttl
+
+    def get(self, key: StatsKey) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: StatsKey, value: Dict[str, Any]) -> CacheEntry:
+        now = self._clock()
+        entry = CacheEntry(value, self._ttl_for(key, now), now)
+        previous = self._entries.get(key)
+        if previous is not None and previous.etag == entry.etag:
+            # 내용이 같으면 Last-Modified 를 유지해 조건부 요청이 계속 304 를 받도록 함
+            entry.last_modified = previous.last_modified
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def get_or_compute(self, key: StatsKey, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> CacheEntry:
+        """캐시된 항목을 반환하거나, 없으면 (동시 요청 중 한 번만) 계산해 저장합니다."""
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._on_computed(key, t))
+
+        # 먼저 요청한 쪽이 취소되어도 나머지 대기자를 위해 계산은 계속 진행
+        value = await asyncio.shield(task)
+        entry = self._entries.get(key)
+        if entry is not None and entry.value is value:
+            return entry
+        # 계산 도중 무효화된 결과: 저장하지 않고 이번 응답에만 사용
+        return CacheEntry(value, 0, self._clock())
+
+    def _on_computed(self, key: StatsKey, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(key, task.result())
+
+    def invalidate(self, created_at: datetime, user_id: Optional[Any] = None) -> int:
+        """created_at 시각의 피드백에 영향을 받는 캐시 항목(계산 중인 것 포함)을 제거합니다."""
+        return self.invalidate_many([(created_at, user_id)])
+
+    def invalidate_many(self, writes: Iterable[Tuple[datetime, Optional[Any]]]) -> int:
+        """여러 피드백 (created_at, user_id) 에 영향을 받는 항목을 한 번에 제거합니다 (일괄 저장용)."""
+        points = {(_utc_naive(created_at), str(user_id) if user_id else None) for created_at, user_id in writes}
+        if not points:
+            return 0
+
+        def affected(key: StatsKey) -> bool:
+            start, end, key_user, _ = key
+            return any(
+                start <= created_at <= end and (key_user is None or key_user == user)
+                for created_at, user in points
+            )
+
+        removed = [key for key in self._entries if affected(key)]
+        for key in removed:
+            del self._entries[key]
+        for key in [key for key in self._inflight if affected(key)]:
+            del self._inflight[key]
+
+        if removed:
+            self.invalidations += len(removed)
+            logger.debug("통계 캐시 %d건 무효화 (피드백 %d건)", len(removed), len(points))
+        return len(removed)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+# 전역 통계 캐시
+stats_cache = StatsCache()
@@ -0,0 +1,34 @@
+"""
+설정에 따른 전역 저장소 인스턴스.
+
+STORAGE_BACKEND 환경 변수로 구현을 고릅니다.
+
+- supabase (기본값): Supabase REST (db/supabase.py)
+- sqlite: 내장 SQLite 파일 (db/sqlite.py). Supabase 없이 테스트/부하 테스트를 돌릴 때 사용
+
+사용 예:
+    from db.storage import storage
+    await storage.create_feedback(feedback)
+"""
+import os
+from dotenv import load_dotenv
+from db.backend import StorageBackend
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """설정된 백엔드 인스턴스를 만듭니다. 선택하지 않은 백엔드의 설정/의존성은 요구하지 않습니다."""
+    if backend == "sqlite":
+        from db.sqlite import SQLiteStorage
+        return SQLiteStorage()
+    if backend == "supabase":
+        from db.supabase import SupabaseClient
+        return SupabaseClient()
+    raise ValueError(f"지원하지 않는 STORAGE_BACKEND 입니다: {backend}")
+
+
+# 전역 저장소
+storage = create_storage()
@@ -1,36 +1,148 @@
+import asyncio
+import heapq
 import os
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import time
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Set, Tuple
 from uuid import UUID
-from supabase import create_client, Client
 from dotenv import load_dotenv
-from config.logger import logger
+from config.logger import logger, throttled
+from core.deadline import DeadlineExceeded, deadline_scope, with_deadline
+from core.topk import SpaceSaving
+from core.tracing import start_span
+from db.backend import (
+    FEEDBACK_PAGE_MAX,
+    FEEDBACK_PAGE_SIZE,
+    KEYWORD_SKETCH_SIZE,
+    RECENT_FEEDBACK_LIMIT,
+    USER_NOT_FOUND,
+    StorageBackend,
+    build_stats,
+    feedback_row,
+    hide_cursor_columns,
+    list_columns,
+    sketch_size_for,
+)
+from db.pagination import decode_cursor, encode_cursor
+from db.postgrest import AsyncPostgrest, PostgrestError, quote
+from db.rollups import build_rollup_deltas, keyword_sketch, merge_aggregates, split_at_watermark, split_full_days
+from db.timeseries import bucket_feedbacks, build_series
 from models.feedback import FeedbackCreate, FeedbackInDB, UserCreate, UserInDB
 
 load_dotenv()
 
-class SupabaseClient:
+# REST 연결 풀/시간 제한 설정
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "3"))
+
+# 피드백 저장 시 사용자 확인 방식:
+#   cache (확인된 사용자 ID 캐시, 기본값) | fk (조회 없이 저장하고 외래 키 위반을 변환)
+# 두 방식 모두 db/sql/feedback_user_fk.sql 이 적용되어 있어야 함 (cache 모드에서 캐시에 남은
+# 삭제된 사용자의 피드백도 외래 키로 막음)
+USER_CHECK_MODE = os.getenv("USER_CHECK_MODE", "cache").lower()
+
+# PostgreSQL 외래 키 위반 오류 코드
+FOREIGN_KEY_VIOLATION = "23503"
+
+# 일괄 저장: 한 번에 insert 하는 행 수, 동시에 실행하는 insert 수, 사용자 조회 IN 목록 크기
+FEEDBACK_BULK_CHUNK_SIZE = int(os.getenv("FEEDBACK_BULK_CHUNK_SIZE", "500"))
+FEEDBACK_BULK_CONCURRENCY = int(os.getenv("FEEDBACK_BULK_CONCURRENCY", "4"))
+USER_LOOKUP_CHUNK_SIZE = 200
+
+# 일괄 저장 중 시간 초과/연결 오류로 중단된 항목의 오류 메시지
+NOT_ATTEMPTED = "앞선 저장 오류로 저장하지 않았습니다."
+
+# 통계 집계 방식:
+#   rpc (DB 함수에서 원본 집계, 기본값) | rollup (백필 워터마크 이후 날짜는 일별 롤업 합산)
+#   | scan (전체 조회 후 애플리케이션에서 집계)
+FEEDBACK_STATS_MODE = os.getenv("FEEDBACK_STATS_MODE", "rpc").lower()
+
+# 롤업 백필 워터마크(feedback_rollup_state) 재조회 간격 (초)
+ROLLUP_WATERMARK_TTL = 300
+
+# DB 함수가 없다는 응답(404, PGRST202)을 기억하는 시간 (초). 그동안은 호출하지 않고 바로 대체 경로로
+RPC_MISSING_RETRY = 300
+RPC_NOT_FOUND = "PGRST202"
+
+# 통계 응답의 최근 피드백, 전체 조회, 시계열 대체 집계에 쓰는 조회 컬럼
+RECENT_FEEDBACK_COLUMNS = "id,user_id,content,skill,emotion,keywords,created_at"
+SCAN_FEEDBACK_COLUMNS = RECENT_FEEDBACK_COLUMNS
+TIMESERIES_FEEDBACK_COLUMNS = "created_at,skill,emotion"
+
+def _unconfirmed_error(index: int, error: BaseException) -> Dict[str, Any]:
+    """응답을 받지 못한 저장 요청의 항목 오류 (요청이 DB 에 반영되었는지 알 수 없음)"""
+    return {"index": index, "error": f"저장 결과를 확인하지 못했습니다 ({type(error).__name__}): {error}"}
+
+class SupabaseClient(StorageBackend):
+    """Supabase REST(PostgREST) 저장소 백엔드"""
+
     def __init__(self):
+        super().__init__()
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_KEY")
         
         if not supabase_url or not supabase_key:
             raise ValueError("Supabase 환경 변수가 설정되지 않았습니다.")
         
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self.client = AsyncPostgrest(
+            supabase_url,
+            supabase_key,
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive=SUPABASE_MAX_KEEPALIVE,
+            timeout=SUPABASE_TIMEOUT,
+            connect_timeout=SUPABASE_CONNECT_TIMEOUT
+        )
+        # (조회 시각, 백필 워터마크)
+        self._rollup_watermark: Tuple[float, Optional[date]] = (float("-inf"), None)
+        # 없는 DB 함수 → 다시 호출해 볼 시각
+        self._missing_rpcs: Dict[str, float] = {}
         logger.info("Supabase 클라이언트 초기화 완료")
 
+    async def _execute(self, query, operation: str) -> Any:
+        """쿼리를 실행합니다. 요청의 남은 시간 예산이 지나면 HTTP 요청을 취소합니다."""
+        with start_span("db.supabase", operation=operation):
+            return await with_deadline(query.execute(), "supabase")
+
+    def _rpc_available(self, function: str) -> bool:
+        """최근에 없다는 응답을 받은 DB 함수가 아니면 True"""
+        retry_at = self._missing_rpcs.get(function)
+        return retry_at is None or time.monotonic() >= retry_at
+
+    async def _rpc(self, function: str, params: Dict[str, Any]) -> Any:
+        """
+        DB 함수를 호출합니다. 함수가 없다는 응답이면 RPC_MISSING_RETRY 초 동안 기억해
+        그동안은 요청을 보내지 않고 바로 PostgrestError 를 발생시킵니다.
+        """
+        if not self._rpc_available(function):
+            raise PostgrestError(404, RPC_NOT_FOUND, f"{function} 함수가 없습니다 (재시도 대기 중)")
+        try:
+            result = await self._execute(self.client.rpc(function, params), f"rpc.{function}")
+        except PostgrestError as e:
+            if e.status_code == 404 or e.code == RPC_NOT_FOUND:
+                self._missing_rpcs[function] = time.monotonic() + RPC_MISSING_RETRY
+                logger.warning("DB 함수 %s 가 없어 %d초 동안 대체 경로를 사용합니다: %s", function, RPC_MISSING_RETRY, e)
+            raise
+        self._missing_rpcs.pop(function, None)
+        return result
+
+    async def aclose(self) -> None:
+        """연결 풀을 닫습니다 (앱 종료 시)."""
+        await self.client.aclose()
+
     async def create_user(self, user: UserCreate) -> UserInDB:
         """새로운 사용자를 생성합니다."""
         try:
-            result = self.client.table("users").insert({
+            result = await self._execute(self.client.table("users").insert({
                 "name": user.name
-            }).execute()
+            }), "users.insert")
             
             if len(result.data) == 0:
                 raise Exception("사용자 생성 실패")
                 
-            logger.info(f"새로운 사용자 생성 완료: name={user.name}")
+            logger.info("새로운 사용자 생성 완료: name=%s", user.name)
+            self.known_users.add(result.data[0]["id"])
             return UserInDB(**result.data[0])
             
         except Exception as e:
@@ -40,115 +152,503 @@ class SupabaseClient:
     async def get_user(self, user_id: UUID) -> Optional[UserInDB]:
         """사용자 정보를 조회합니다."""
         try:
-            result = self.client.table("users").select("*").eq("id", str(user_id)).execute()
+            result = await self._execute(
+                self.client.table("users").select("*").eq("id", str(user_id)),
+                "users.select"
+            )
             
             if len(result.data) > 0:
+                self.known_users.add(user_id)
                 return UserInDB(**result.data[0])
+            self.known_users.discard(user_id)
             return None
             
         except Exception as e:
             logger.error(f"사용자 조회 중 오류 발생: {str(e)}")
             raise
 
+    async def _ensure_user(self, user_id: UUID) -> None:
+        """
+        피드백 저장 전 사용자 존재 여부를 확인합니다.
+
+        USER_CHECK_MODE=cache 이면 최근 확인된 사용자는 조회를 생략하고,
+        fk 이면 조회 없이 저장 시 외래 키 위반으로 판단합니다.
+        """
+        if USER_CHECK_MODE == "fk" or user_id in self.known_users:
+            return
+        result = await self._execute(
+            self.client.table("users").select("id").eq("id", str(user_id)).limit(1),
+            "users.exists"
+        )
+        if not result.data:
+            raise ValueError(USER_NOT_FOUND)
+        self.known_users.add(user_id)
+
     async def create_feedback(self, feedback: FeedbackCreate) -> FeedbackInDB:
         """새로운 피드백을 생성합니다."""
         try:
             # 사용자 존재 여부 확인
-            user = await self.get_user(feedback.user_id)
-            if not user:
-                raise ValueError("존재하지 않는 사용자입니다.")
+            await self._ensure_user(feedback.user_id)
 
             # 피드백 저장
-            data = {
-                "user_id": str(feedback.user_id),
-                "content": feedback.content,
-                "skill": feedback.skill,
-                "emotion": feedback.emotion,
-                "keywords": feedback.keywords,
-                "created_at": datetime.utcnow().isoformat()
-            }
+            created_at = datetime.utcnow()
+            data = feedback_row(feedback, created_at)
             
-            result = self.client.table("feedbacks").insert(data).execute()
+            try:
+                result = await self._execute(self.client.table("feedbacks").insert(data), "feedbacks.insert")
+            except PostgrestError as e:
+                # fk 모드이거나 캐시 확인 후 사용자가 삭제된 경우
+                if e.code == FOREIGN_KEY_VIOLATION:
+                    self.known_users.discard(feedback.user_id)
+                    raise ValueError(USER_NOT_FOUND) from e
+                raise
             
             if len(result.data) == 0:
                 raise Exception("피드백 저장 실패")
                 
-            logger.info(f"새로운 피드백 저장 완료: user_id={feedback.user_id}")
+            logger.info("새로운 피드백 저장 완료: user_id=%s", feedback.user_id, extra=throttled(20))
+            await self._after_feedbacks_saved(result.data, created_at)
             return FeedbackInDB(**result.data[0])
             
         except Exception as e:
             logger.error(f"피드백 저장 중 오류 발생: {str(e)}")
             raise
 
-    async def get_user_feedbacks(self, user_id: UUID) -> List[FeedbackInDB]:
-        """특정 사용자의 모든 피드백을 조회합니다."""
+    async def create_feedbacks(self, feedbacks: List[FeedbackCreate]) -> Dict[str, Any]:
+        """
+        여러 피드백을 한 번에 저장합니다.
+
+        참조하는 사용자는 IN 조회로 한꺼번에 확인하고, FEEDBACK_BULK_CHUNK_SIZE 행씩 묶어 저장합니다.
+        묶음 저장이 실패하면 그 묶음만 한 행씩 다시 저장해 실패한 항목을 찾아냅니다.
+        시간 초과/연결 오류로 실패한 묶음은 그 항목만 errors 로 반환하고, 다른 묶음의 저장 결과는 유지합니다.
+        롤업/통계 캐시/지표는 전체 저장 후 저장된 행만으로 한 번 갱신합니다.
+
+        Returns:
+            {"inserted": 저장된 수, "failed": 실패 수, "errors": [{"index": 입력 순서, "error": 사유}]}
+        """
         try:
-            result = self.client.table("feedbacks").select("*").eq("user_id", str(user_id)).order("created_at", desc=True).execute()
-            return [FeedbackInDB(**item) for item in result.data]
-            
+            created_at = datetime.utcnow()
+            existing = await self._existing_users({str(feedback.user_id) for feedback in feedbacks})
+
+            errors: List[Dict[str, Any]] = []
+            rows: List[Tuple[int, Dict[str, Any]]] = []
+            for index, feedback in enumerate(feedbacks):
+                if str(feedback.user_id) in existing:
+                    rows.append((index, feedback_row(feedback, created_at)))
+                else:
+                    errors.append({"index": index, "error": USER_NOT_FOUND})
+
+            semaphore = asyncio.Semaphore(FEEDBACK_BULK_CONCURRENCY)
+
+            async def insert(chunk: List[Tuple[int, Dict[str, Any]]]):
+                async with semaphore:
+                    return await self._insert_feedback_chunk(chunk)
+
+            chunks = [rows[i:i + FEEDBACK_BULK_CHUNK_SIZE] for i in range(0, len(rows), FEEDBACK_BULK_CHUNK_SIZE)]
+            # 한 묶음의 실패가 이미 저장된 다른 묶음의 결과를 지우지 않도록 예외도 결과로 받음
+            results = await asyncio.gather(*(insert(chunk) for chunk in chunks), return_exceptions=True)
+
+            inserted: List[Dict[str, Any]] = []
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, BaseException):
+                    logger.warning("피드백 묶음 저장 실패 (%d건): %s", len(chunk), result)
+                    errors.extend(_unconfirmed_error(index, result) for index, _ in chunk)
+                    continue
+                chunk_inserted, chunk_errors = result
+                inserted.extend(chunk_inserted)
+                errors.extend(chunk_errors)
+
+            if inserted:
+                # 저장된 행은 시간 예산을 넘겼더라도 롤업/통계 캐시에 반영
+                with deadline_scope(None):
+                    await self._after_feedbacks_saved(inserted, created_at)
+
+            errors.sort(key=lambda error: error["index"])
+            logger.info("피드백 일괄 저장 완료: 저장=%d, 실패=%d", len(inserted), len(errors))
+            return {"inserted": len(inserted), "failed": len(errors), "errors": errors}
+
+        except Exception as e:
+            logger.error(f"피드백 일괄 저장 중 오류 발생: {str(e)}")
+            raise
+
+    async def _existing_users(self, user_ids: Set[str]) -> Set[str]:
+        """주어진 사용자 ID 중 존재하는 ID 집합 (캐시에 없는 ID 만 IN 조회)"""
+        existing = {user_id for user_id in user_ids if user_id in self.known_users}
+        missing = list(user_ids - existing)
+
+        results = await asyncio.gather(*(
+            self._execute(
+                self.client.table("users").select("id").in_("id", missing[i:i + USER_LOOKUP_CHUNK_SIZE]),
+                "users.select_in"
+            )
+            for i in range(0, len(missing), USER_LOOKUP_CHUNK_SIZE)
+        ))
+        for result in results:
+            for row in result.data:
+                existing.add(row["id"])
+                self.known_users.add(row["id"])
+        return existing
+
+    async def _insert_feedback_chunk(self,
+                                     chunk: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """여러 행을 한 번에 저장하고, 실패하면 한 행씩 다시 저장해 (저장된 행, 실패 목록) 을 반환합니다."""
+        try:
+            result = await self._execute(
+                self.client.table("feedbacks").insert([row for _, row in chunk]),
+                "feedbacks.insert_bulk"
+            )
+            return result.data, []
+        except PostgrestError as e:
+            if len(chunk) > 1:
+                logger.warning("피드백 묶음 저장 실패, 한 행씩 다시 저장합니다: %s", e)
+            else:
+                return [], [self._insert_error(chunk[0], e)]
+
+        inserted, errors = [], []
+        for position, item in enumerate(chunk):
+            try:
+                result = await self._execute(self.client.table("feedbacks").insert(item[1]), "feedbacks.insert")
+                inserted.extend(result.data)
+            except PostgrestError as e:
+                errors.append(self._insert_error(item, e))
+            except Exception as e:
+                # 시간 초과/연결 오류: 남은 행은 시도하지 않고, 이미 저장한 행은 그대로 반환
+                errors.append(_unconfirmed_error(item[0], e))
+                errors.extend({"index": index, "error": NOT_ATTEMPTED} for index, _ in chunk[position + 1:])
+                break
+        return inserted, errors
+
+    def _insert_error(self, item: Tuple[int, Dict[str, Any]], error: PostgrestError) -> Dict[str, Any]:
+        """저장 실패 항목의 오류. 외래 키 위반이면 사용자 캐시에서도 제거합니다."""
+        index, row = item
+        if error.code == FOREIGN_KEY_VIOLATION:
+            self.known_users.discard(row["user_id"])
+            return {"index": index, "error": USER_NOT_FOUND}
+        return {"index": index, "error": error.message}
+
+    async def _after_feedbacks_saved(self, rows: List[Dict[str, Any]], created_at: datetime) -> None:
+        """저장된 피드백을 롤업에 반영한 뒤 통계 캐시, 알림 지표를 갱신합니다."""
+        await self._apply_rollups(rows)
+        await super()._after_feedbacks_saved(rows, created_at)
+
+    async def tag_feedback(self,
+                           feedback: FeedbackInDB,
+                           emotion: Optional[str] = None,
+                           keywords: Optional[List[str]] = None) -> None:
+        """저장된 피드백의 비어 있던 감정/키워드를 채웁니다 (롤업에는 건수 없이 새 태그만 더함)."""
+        values = {key: value for key, value in (("emotion", emotion), ("keywords", keywords)) if value is not None}
+        if not values:
+            return
+        await self._execute(
+            self.client.table("feedbacks").update(values, returning=False).eq("id", str(feedback.id)),
+            "feedbacks.update_tags"
+        )
+        await self._apply_rollups([{
+            "user_id": feedback.user_id,
+            "skill": feedback.skill,
+            "created_at": feedback.created_at,
+            **values,
+        }], count=False)
+        await self._after_feedback_tagged(feedback, emotion)
+
+    async def get_user_feedback_page(self,
+                                     user_id: UUID,
+                                     limit: int = FEEDBACK_PAGE_SIZE,
+                                     cursor: Optional[str] = None,
+                                     columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        사용자의 피드백을 최신순으로 한 페이지 조회합니다.
+
+        (created_at, id) 키셋 페이지네이션이므로 몇 번째 페이지든 조회 비용이 같습니다.
+        (db/sql/feedback_listing.sql 인덱스 사용)
+
+        Args:
+            user_id: 사용자 ID
+            limit: 페이지 크기 (최대 FEEDBACK_PAGE_MAX)
+            cursor: 이전 페이지 응답의 next_cursor (첫 페이지는 None)
+            columns: 조회할 컬럼 (LIST_FEEDBACK_COLUMNS 중, 기본값 전체)
+
+        Returns:
+            {"items": 행 목록, "next_cursor": 다음 페이지 커서 또는 None}
+
+        Raises:
+            ValueError: 커서나 컬럼이 잘못된 경우
+        """
+        limit = max(1, min(limit, FEEDBACK_PAGE_MAX))
+        after = decode_cursor(cursor)
+        selected = list_columns(columns)
+
+        try:
+            query = self.client.table("feedbacks").select(",".join(selected)).eq("user_id", str(user_id))
+            if after:
+                created_at, row_id = quote(after[0]), quote(after[1])
+                query = query.or_(f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{row_id})")
+            # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회
+            query = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+            result = await self._execute(query, "feedbacks.select_page")
+
         except Exception as e:
             logger.error(f"사용자 피드백 목록 조회 중 오류 발생: {str(e)}")
             raise
 
-    async def get_feedback_stats(self, 
-                               start_date: datetime, 
-                               end_date: datetime, 
-                               user_id: Optional[UUID] = None) -> Dict[str, Any]:
-        """주어진 기간 동안의 피드백 통계를 조회합니다."""
+        rows = result.data
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]) if has_more else None
+
+        return {"items": hide_cursor_columns(rows, columns), "next_cursor": next_cursor}
+
+    def _range_query(self,
+                     columns: str,
+                     start_date: datetime,
+                     end_date: datetime,
+                     user_id: Optional[UUID] = None):
+        """기간(및 사용자) 조건이 적용된 feedbacks 조회 쿼리를 만듭니다."""
+        query = self.client.table("feedbacks").select(columns)
+        
+        # 날짜 범위 필터 적용
+        query = query.gte("created_at", start_date.isoformat())
+        query = query.lte("created_at", end_date.isoformat())
+        
+        # 사용자 ID 필터 적용 (있는 경우)
+        if user_id:
+            query = query.eq("user_id", str(user_id))
+        return query
+
+    async def _compute_feedback_stats(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      user_id: Optional[UUID],
+                                      keyword_k: int) -> Dict[str, Any]:
+        """
+        주어진 기간 동안의 피드백 통계를 DB 에서 계산합니다.
+
+        FEEDBACK_STATS_MODE=rpc 이면 집계는 DB 함수(feedback_stats)에서,
+        최근 피드백은 정렬/제한/컬럼 지정 쿼리로 따로 가져와 두 요청을 동시에 실행합니다.
+        FEEDBACK_STATS_MODE=rollup 이면 백필 워터마크 이후의 온전한 날짜는 일별 롤업 행을 합산하고
+        워터마크 전 날짜와 하루가 안 되는 앞뒤 구간은 feedback_stats 로 원본에서 집계합니다.
+        DB 함수가 없거나 실패하면 전체 조회(scan) 방식으로 대체합니다
+        (없다는 응답은 잠시 기억해 그동안은 바로 전체 조회).
+        """
+        sketch_size = sketch_size_for(keyword_k)
         try:
-            # 기본 쿼리 설정
-            query = self.client.table("feedbacks").select("*")
-            
-            # 날짜 범위 필터 적용
-            query = query.gte("created_at", start_date.isoformat())
-            query = query.lte("created_at", end_date.isoformat())
-            
-            # 사용자 ID 필터 적용 (있는 경우)
-            if user_id:
-                query = query.eq("user_id", str(user_id))
-            
-            # 쿼리 실행
-            result = query.execute()
-            feedbacks = result.data
-            
-            # 통계 계산
-            total_count = len(feedbacks)
-            emotion_counts = {}
-            skill_counts = {}
-            keyword_counts = {}
-            
-            for feedback in feedbacks:
-                # 감정 집계
-                if feedback["emotion"]:
-                    emotion_counts[feedback["emotion"]] = emotion_counts.get(feedback["emotion"], 0) + 1
-                
-                # 스킬 집계
-                if feedback["skill"]:
-                    skill_counts[feedback["skill"]] = skill_counts.get(feedback["skill"], 0) + 1
-                
-                # 키워드 집계
-                if feedback["keywords"]:
-                    for keyword in feedback["keywords"]:
-                        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
-            
-            # 최근 피드백 5개 추출
-            recent_feedbacks = sorted(
-                feedbacks, 
-                key=lambda x: x["created_at"], 
-                reverse=True
-            )[:5]
-            
-            return {
-                "total_count": total_count,
-                "emotion_stats": emotion_counts,
-                "skill_stats": skill_counts,
-                "keyword_stats": keyword_counts,
-                "recent_feedbacks": recent_feedbacks
-            }
+            if FEEDBACK_STATS_MODE in ("rpc", "rollup") and self._rpc_available("feedback_stats"):
+                aggregate = self._aggregate_stats_rollup if FEEDBACK_STATS_MODE == "rollup" else self._aggregate_stats_rpc
+                try:
+                    aggregates, recent_feedbacks = await asyncio.gather(
+                        aggregate(start_date, end_date, user_id, sketch_size),
+                        self._get_recent_feedbacks(start_date, end_date, user_id)
+                    )
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    logger.warning("통계 집계(%s) 실패, 전체 조회로 대체합니다: %s", FEEDBACK_STATS_MODE, e,
+                                   extra=throttled(1))
+                    aggregates, recent_feedbacks = await self._aggregate_stats_scan(start_date, end_date, user_id, sketch_size)
+            else:
+                aggregates, recent_feedbacks = await self._aggregate_stats_scan(start_date, end_date, user_id, sketch_size)
+
+            return build_stats(aggregates, recent_feedbacks, keyword_sketch(aggregates, sketch_size), keyword_k)
             
         except Exception as e:
             logger.error(f"피드백 통계 조회 중 오류 발생: {str(e)}")
             raise
 
-# 전역 Supabase 클라이언트
-supabase = SupabaseClient()
+    async def _aggregate_stats_rpc(self,
+                                   start_date: datetime,
+                                   end_date: datetime,
+                                   user_id: Optional[UUID] = None,
+                                   keyword_limit: Optional[int] = None) -> Dict[str, Any]:
+        """DB 함수로 감정/스킬/키워드(상위 keyword_limit 개) 집계를 계산합니다 (db/sql/feedback_stats.sql)."""
+        result = await self._rpc("feedback_stats", {
+            "start_ts": start_date.isoformat(),
+            "end_ts": end_date.isoformat(),
+            "p_user_id": str(user_id) if user_id else None,
+            "p_keyword_limit": keyword_limit
+        })
+        return result.data or {}
+
+    async def _aggregate_stats_rollup(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      user_id: Optional[UUID] = None,
+                                      keyword_limit: int = KEYWORD_SKETCH_SIZE) -> Dict[str, Any]:
+        """
+        온전한 날짜는 일별 롤업(db/sql/feedback_rollups.sql)으로, 나머지 시간 구간은 원본으로 집계합니다.
+        백필 워터마크 전 날짜(또는 워터마크가 없으면 전체)는 롤업이 비어 있을 수 있으므로 원본으로 집계합니다.
+
+        구간마다 상위 keyword_limit 개 키워드만 받아 상위 K 요약으로 병합합니다.
+        """
+        full_days, edges = split_full_days(start_date, end_date)
+        if full_days:
+            full_days, raw_days = split_at_watermark(full_days, await self._rollup_complete_from(), start_date.tzinfo)
+            if raw_days:
+                edges.append(raw_days)
+
+        parts = [
+            self._aggregate_stats_rpc(edge_start, edge_end, user_id, keyword_limit)
+            for edge_start, edge_end in edges
+        ]
+        if full_days:
+            parts.append(self._sum_rollups(full_days[0], full_days[1], user_id, keyword_limit))
+        return merge_aggregates(await asyncio.gather(*parts), keyword_limit)
+
+    async def _rollup_complete_from(self) -> Optional[date]:
+        """롤업이 원본과 맞는 첫 날짜 (백필 워터마크, ROLLUP_WATERMARK_TTL 동안 재사용). 없으면 None"""
+        checked_at, complete_from = self._rollup_watermark
+        if time.monotonic() - checked_at < ROLLUP_WATERMARK_TTL:
+            return complete_from
+
+        try:
+            result = await self._execute(
+                self.client.table("feedback_rollup_state").select("complete_from").limit(1),
+                "rollups.watermark"
+            )
+            value = result.data[0]["complete_from"] if result.data else None
+            complete_from = date.fromisoformat(value) if value else None
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            # 테이블이 없으면(이전 버전 SQL) 롤업을 쓰지 않음
+            logger.warning("롤업 워터마크 조회 실패, 원본으로 집계합니다: %s", e, extra=throttled(1))
+            complete_from = None
+        if complete_from is None:
+            logger.warning("롤업 백필 워터마크가 없어 원본으로 집계합니다 (python -m db.rollups rebuild 필요)",
+                           extra=throttled(1))
+        self._rollup_watermark = (time.monotonic(), complete_from)
+        return complete_from
+
+    async def _sum_rollups(self,
+                           start_day: date,
+                           end_day: date,
+                           user_id: Optional[UUID] = None,
+                           keyword_limit: Optional[int] = None) -> Dict[str, Any]:
+        """기간(양 끝 날짜 포함)의 일별 롤업 행을 DB 에서 합산합니다."""
+        result = await self._rpc("feedback_rollup_stats", {
+            "start_day": start_day.isoformat(),
+            "end_day": end_day.isoformat(),
+            "p_user_id": str(user_id) if user_id else None,
+            "p_keyword_limit": keyword_limit
+        })
+        return result.data or {}
+
+    async def _apply_rollups(self, feedbacks: List[Dict[str, Any]], count: bool = True) -> None:
+        """
+        저장된 피드백을 일별 롤업에 증분 반영합니다 (count=False 이면 건수 없이 감정/키워드만).
+
+        실패해도 피드백 저장은 성공으로 처리하고 경고만 남깁니다
+        (어긋난 롤업은 `python -m db.rollups rebuild` 로 다시 계산).
+        """
+        try:
+            await self._execute(
+                self.client.rpc("apply_feedback_rollups", {"deltas": build_rollup_deltas(feedbacks, count)}),
+                "rpc.apply_feedback_rollups"
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning("피드백 롤업 반영 실패: %s", e, extra=throttled(1))
+
+    async def rebuild_rollups(self, start_day: date, end_day: date) -> int:
+        """기간(양 끝 날짜 포함)의 일별 롤업을 원본 피드백으로 다시 계산하고 생성된 행 수를 반환합니다."""
+        result = await self._execute(self.client.rpc("rebuild_feedback_rollups", {
+            "start_day": start_day.isoformat(),
+            "end_day": end_day.isoformat()
+        }), "rpc.rebuild_feedback_rollups")
+        return result.data or 0
+
+    async def _get_recent_feedbacks(self,
+                                    start_date: datetime,
+                                    end_date: datetime,
+                                    user_id: Optional[UUID] = None,
+                                    limit: int = RECENT_FEEDBACK_LIMIT) -> List[Dict[str, Any]]:
+        """기간 내 최근 피드백 N개만 필요한 컬럼으로 조회합니다."""
+        query = self._range_query(RECENT_FEEDBACK_COLUMNS, start_date, end_date, user_id)
+        query = query.order("created_at", desc=True).limit(limit)
+        result = await self._execute(query, "feedbacks.select_recent")
+        return result.data
+
+    async def _aggregate_stats_scan(self,
+                                    start_date: datetime,
+                                    end_date: datetime,
+                                    user_id: Optional[UUID] = None,
+                                    keyword_limit: int = KEYWORD_SKETCH_SIZE) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """기간 내 피드백을 모두 가져와 애플리케이션에서 집계합니다 (DB 함수가 없을 때)."""
+        query = self._range_query(SCAN_FEEDBACK_COLUMNS, start_date, end_date, user_id)
+        result = await self._execute(query, "feedbacks.select_range")
+        feedbacks = result.data
+        
+        # 통계 계산
+        emotion_counts = {}
+        skill_counts = {}
+        # 키워드는 고정 크기 상위 K 요약으로 (기간이 길어도 메모리 일정)
+        keywords = SpaceSaving(keyword_limit)
+        
+        for feedback in feedbacks:
+            # 감정 집계
+            if feedback["emotion"]:
+                emotion_counts[feedback["emotion"]] = emotion_counts.get(feedback["emotion"], 0) + 1
+            
+            # 스킬 집계
+            if feedback["skill"]:
+                skill_counts[feedback["skill"]] = skill_counts.get(feedback["skill"], 0) + 1
+            
+            # 키워드 집계
+            if feedback["keywords"]:
+                keywords.update(feedback["keywords"])
+        
+        # 최근 피드백 5개 추출 (전체 정렬 대신 heapq)
+        recent_feedbacks = heapq.nlargest(RECENT_FEEDBACK_LIMIT, feedbacks, key=lambda x: x["created_at"])
+
+        aggregates = {
+            "total_count": len(feedbacks),
+            "emotion_stats": emotion_counts,
+            "skill_stats": skill_counts,
+            "keyword_sketch": keywords
+        }
+        return aggregates, recent_feedbacks
+
+    async def get_feedback_timeseries(self,
+                                      start_date: datetime,
+                                      end_date: datetime,
+                                      bucket: str = "day",
+                                      user_id: Optional[UUID] = None,
+                                      fill_gaps: bool = True) -> List[Dict[str, Any]]:
+        """
+        기간을 hour/day/week 구간으로 나눈 피드백 건수, 긍정/부정 비율, 스킬별 건수를 조회합니다.
+
+        집계는 DB 함수(feedback_timeseries) 한 번으로 하고, 함수가 없거나 실패하면
+        필요한 컬럼만 조회해 한 번 훑어 집계합니다 (db/timeseries.py).
+        """
+        try:
+            result = await self._rpc("feedback_timeseries", {
+                "start_ts": start_date.isoformat(),
+                "end_ts": end_date.isoformat(),
+                "p_bucket": bucket,
+                "p_user_id": str(user_id) if user_id else None
+            })
+            points = result.data or []
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning("시계열 집계(rpc) 실패, 전체 조회로 대체합니다: %s", e, extra=throttled(1))
+            query = self._range_query(TIMESERIES_FEEDBACK_COLUMNS, start_date, end_date, user_id)
+            result = await self._execute(query, "feedbacks.select_range")
+            points = bucket_feedbacks(result.data, bucket)
+
+        return build_series(points, start_date, end_date, bucket, fill_gaps)
+
+    async def create_summary(self, user_id: Optional[str], input_text: str, summary: str) -> Optional[str]:
+        """요약 결과를 저장하고 생성된 요약 ID를 반환합니다."""
+        try:
+            result = await self._execute(self.client.table("summaries").insert({
+                "user_id": user_id,
+                "input_text": input_text,
+                "summary": summary,
+                "created_at": datetime.utcnow().isoformat()
+            }), "summaries.insert")
+            return result.data[0]["id"] if result.data else None
+
+        except Exception as e:
+            logger.error(f"요약 저장 중 오류 발생: {str(e)}")
+            raise
@@ -0,0 +1,120 @@
+"""
+피드백 시계열 통계 (/feedback/timeseries) 도우미.
+
+구간(bucket)별 건수, 긍정/부정 비율, 스킬별 건수를 만듭니다.
+DB 에서는 db/sql/feedback_timeseries.sql 의 feedback_timeseries 함수가 한 번의 group by 로
+집계하고, 함수가 없을 때는 bucket_feedbacks 로 조회 결과를 한 번 훑어 집계합니다.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List
+from models.feedback import EmotionEnum
+
+BUCKETS = ("hour", "day", "week")
+
+_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+# 초 단위 소수부. PostgREST 는 끝의 0 을 빼고 보내므로(예: .12345) 6자리로 맞춰야
+# Python 3.10 이하의 datetime.fromisoformat 이 읽을 수 있음
+_FRACTION = re.compile(r"(?<=:\d{2})\.(\d+)")
+
+
+def parse_timestamp(text: str) -> datetime:
+    """ISO 형식 시각 문자열 (Z, 6자리가 아닌 초 소수부 허용). 형식이 잘못되면 ValueError"""
+    text = _FRACTION.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), text.replace("Z", "+00:00"), count=1)
+    return datetime.fromisoformat(text)
+
+
+def _utc_naive(value: Any) -> datetime:
+    """created_at (ISO 문자열 또는 datetime) 을 UTC 기준 naive datetime 으로 맞춥니다."""
+    if not isinstance(value, datetime):
+        value = parse_timestamp(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def bucket_start(value: Any, bucket: str) -> datetime:
+    """value 가 속한 구간의 시작 시각 (UTC). 주 단위는 PostgreSQL date_trunc 처럼 월요일 시작"""
+    value = _utc_naive(value)
+    if bucket == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def bucket_count(start: datetime, end: datetime, bucket: str) -> int:
+    """[start, end] 기간을 덮는 구간 수"""
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    return int((last - first) / _STEPS[bucket]) + 1
+
+
+def _empty_point() -> Dict[str, Any]:
+    return {"total": 0, "positive": 0, "negative": 0, "skills": {}}
+
+
+def bucket_feedbacks(feedbacks: Iterable[Dict[str, Any]], bucket: str) -> List[Dict[str, Any]]:
+    """피드백 행(created_at, skill, emotion)을 한 번 훑어 feedback_timeseries 와 같은 형태로 집계합니다."""
+    points: Dict[datetime, Dict[str, Any]] = {}
+
+    for feedback in feedbacks:
+        key = bucket_start(feedback["created_at"], bucket)
+        point = points.get(key)
+        if point is None:
+            point = points[key] = _empty_point()
+
+        point["total"] += 1
+        emotion = feedback.get("emotion")
+        if emotion == EmotionEnum.POSITIVE.value:
+            point["positive"] += 1
+        elif emotion == EmotionEnum.NEGATIVE.value:
+            point["negative"] += 1
+        skill = feedback.get("skill")
+        if skill:
+            point["skills"][skill] = point["skills"].get(skill, 0) + 1
+
+    return [{"bucket": key.isoformat(), **point} for key, point in sorted(points.items())]
+
+
+def build_series(points: Iterable[Dict[str, Any]],
+                 start: datetime,
+                 end: datetime,
+                 bucket: str,
+                 fill_gaps: bool = True) -> List[Dict[str, Any]]:
+    """
+    구간별 집계에 비율을 붙이고 시간순으로 정렬합니다.
+
+    fill_gaps 이면 피드백이 없는 구간도 0 으로 채워 차트의 x 축이 끊기지 않게 합니다.
+    """
+    by_bucket = {bucket_start(point["bucket"], bucket): point for point in points}
+
+    if fill_gaps:
+        keys = []
+        current, last = bucket_start(start, bucket), bucket_start(end, bucket)
+        while current <= last:
+            keys.append(current)
+            current += _STEPS[bucket]
+    else:
+        keys = sorted(by_bucket)
+
+    series = []
+    for key in keys:
+        point = by_bucket.get(key) or _empty_point()
+        total = point.get("total") or 0
+        series.append({
+            "bucket": key.isoformat(),
+            "total": total,
+            "positive": point.get("positive") or 0,
+            "negative": point.get("negative") or 0,
+            "positive_rate": (point.get("positive") or 0) / total if total else 0.0,
+            "negative_rate": (point.get("negative") or 0) / total if total else 0.0,
+            "skills": point.get("skills") or {},
+        })
+    return series
@@ -0,0 +1,58 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+# 존재가 확인된 사용자 ID 를 기억하는 기간(초)과 최대 개수
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "600"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+class KnownUserCache:
+    """
+    존재가 확인된 사용자 ID 의 LRU/TTL 집합.
+
+    create_user / get_user 에서 채우고, 조회 결과 없거나 저장 시 외래 키 위반이 나면 제거합니다.
+    존재하지 않는 ID 는 저장하지 않으므로 새로 생성된 사용자를 놓치지 않습니다.
+    """
+
+    def __init__(self,
+                 max_entries: int = USER_CACHE_MAX_ENTRIES,
+                 ttl: float = USER_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, user_id: Any) -> None:
+        key = str(user_id)
+        self._expires[key] = self._clock() + self.ttl
+        self._expires.move_to_end(key)
+        while len(self._expires) > self.max_entries:
+            self._expires.popitem(last=False)
+
+    def discard(self, user_id: Any) -> None:
+        self._expires.pop(str(user_id), None)
+
+    def __contains__(self, user_id: Any) -> bool:
+        key = str(user_id)
+        expires_at = self._expires.get(key)
+        if expires_at is None or expires_at <= self._clock():
+            self._expires.pop(key, None)
+            self.misses += 1
+            return False
+        self._expires.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def clear(self) -> None:
+        self._expires.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"entries": len(self._expires), "hits": self.hits, "misses": self.misses}
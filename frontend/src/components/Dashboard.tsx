@@ -47,7 +47,8 @@ const Dashboard = () => {
           end_date: endDate
         })}`;
         
-      const res = await fetch(`${API_URL}${endpoint}`);
+      // 브라우저 캐시를 ETag 로 재검증 (변경이 없으면 서버가 304 를 반환하고 캐시된 응답을 사용)
+      const res = await fetch(`${API_URL}${endpoint}`, { cache: "no-cache" });
       
       if (!res.ok) {
         const error = await res.json();
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, validator
 
 class RecentFeedback(BaseModel):
@@ -38,3 +38,20 @@ class FeedbackStatsResponse(BaseModel):
                 "end_date": "2025-06-02"
             }
         }
+
+class TimeseriesPoint(BaseModel):
+    """시계열 구간 하나의 통계"""
+    bucket: datetime = Field(..., description="구간 시작 시각 (UTC)")
+    total: int = Field(..., description="피드백 수")
+    positive: int = Field(..., description="긍정 피드백 수")
+    negative: int = Field(..., description="부정 피드백 수")
+    positive_rate: float = Field(..., ge=0, le=1, description="긍정 비율")
+    negative_rate: float = Field(..., ge=0, le=1, description="부정 비율")
+    skills: Dict[str, int] = Field(default_factory=dict, description="스킬별 피드백 수")
+
+class FeedbackTimeseriesResponse(BaseModel):
+    """피드백 시계열 통계 응답 모델"""
+    bucket: str = Field(..., description="구간 단위 (hour/day/week)")
+    start_date: str = Field(..., description="조회 시작일")
+    end_date: str = Field(..., description="조회 종료일")
+    points: List[TimeseriesPoint] = Field(..., description="구간별 통계 (시간순)")
@@ -1,32 +1,51 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List
 from core.prompt_engine import PromptEngine
-from core.base_skill import BaseSkill
-import json
+from core.base_skill import BaseSkill, InvalidInput
+from core.json_stream import ANY_INDEX, JsonStreamParser
 from config.logger import logger
 
+STATUSES = ("완료", "미완료", "해당없음")
+PRIORITIES = ("상", "중", "하")
+
 class ChecklistExtractor(BaseSkill):
     skill_name = "checklist_extractor"
     
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         super().__init__()
-        self.prompt_engine = PromptEngine()
+        self.prompt_engine = args[0] if args else PromptEngine()
         
     async def validate_input(self, input_data: Dict[str, Any]) -> bool:
         if "content" not in input_data or not input_data["content"]:
-            logger.error("점검 내용이 없습니다")
-            return False
+            raise InvalidInput("점검 내용(content)이 없습니다")
         return True
         
     async def _process_internal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.process(input_data)
+
+    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """점검 내용을 체크리스트로 변환합니다 (stream 의 최종 결과만 반환)."""
+        result: Dict[str, Any] = {}
+        async for event in self.stream(input_data):
+            if event["event"] == "result":
+                result = event["result"]
+        return result
+
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
         """
-        점검 내용을 체크리스트로 변환
+        점검 내용을 체크리스트로 변환하면서 완성된 부분을 이벤트로 내보냅니다.
         
         Args:
             input_data: 변환할 점검 내용이 포함된 입력 데이터
             
-        Returns:
-            구조화된 체크리스트와 메타데이터
+        Yields:
+            {"event": "title", "title"}: 체크리스트 제목
+            {"event": "category", "index", "category"}: 완성된 카테고리 (응답 순서)
+            {"event": "result", "result": {...}}: 구조화된 체크리스트와 메타데이터 (process 결과와 같음)
+            
+        Raises:
+            InvalidInput: 점검 내용이 없는 경우
         """
+        await self.ensure_valid(input_data)
         content = input_data["content"]
         
         prompt = f"""
@@ -54,44 +73,79 @@ class ChecklistExtractor(BaseSkill):
         {content}
         """
         
-        response = await self.prompt_engine.run_prompt(
-            prompt=prompt,
-            temperature=0.3
+        parser = JsonStreamParser(watch=[("title",), ("categories", ANY_INDEX)])
+        categories: List[Dict[str, Any]] = []
+        title = None
+
+        # 응답을 받는 대로 카테고리 단위로 검증하고 내보냄 (형식이 틀리면 남은 응답을 기다리지 않고 중단)
+        chunks = self.prompt_engine.stream_prompt(prompt=prompt, temperature=0.3)
+        try:
+            async for chunk in chunks:
+                for path, value in parser.feed(chunk):
+                    if path == ("title",):
+                        title = value
+                        yield {"event": "title", "title": title}
+                    else:
+                        category = self._validate_category(value)
+                        categories.append(category)
+                        yield {"event": "category", "index": len(categories) - 1, "category": category}
+        finally:
+            await chunks.aclose()
+
+        # 끊기거나 형식이 조금 틀린 응답은 버리지 않고 복구
+        checklist = parser.finish()
+        if parser.repaired:
+            logger.warning("체크리스트 응답 JSON 을 복구했습니다")
+
+        # 필수 필드 검증
+        if not isinstance(checklist, dict) or not all(key in checklist for key in ["title", "categories"]):
+            raise ValueError("필수 필드가 누락되었습니다")
+        if not isinstance(checklist["categories"], list):
+            raise ValueError("categories 는 목록이어야 합니다")
+        if title is None:
+            yield {"event": "title", "title": checklist["title"]}
+        # 복구하면서 살아난 마지막 카테고리
+        for value in checklist["categories"][len(categories):]:
+            category = self._validate_category(value)
+            categories.append(category)
+            yield {"event": "category", "index": len(categories) - 1, "category": category}
+        checklist["categories"] = categories
+
+        # 메타데이터 계산
+        total_items = sum(len(category["items"]) for category in categories)
+        completed_items = sum(
+            sum(1 for item in category["items"] if item["status"] == "완료")
+            for category in categories
+        )
+        
+        high_priority_items = sum(
+            sum(1 for item in category["items"] if item["priority"] == "상")
+            for category in categories
         )
         
-        # JSON 파싱 및 검증
-        try:
-            checklist = json.loads(response)
-            
-            # 필수 필드 검증
-            if not all(key in checklist for key in ["title", "categories"]):
-                raise ValueError("필수 필드가 누락되었습니다")
-                
-            # 메타데이터 계산
-            total_items = sum(len(category["items"]) for category in checklist["categories"])
-            completed_items = sum(
-                sum(1 for item in category["items"] if item["status"] == "완료")
-                for category in checklist["categories"]
-            )
-            
-            high_priority_items = sum(
-                sum(1 for item in category["items"] if item["priority"] == "상")
-                for category in checklist["categories"]
-            )
-            
-            return {
-                "checklist": checklist,
-                "metadata": {
-                    "total_items": total_items,
-                    "completed_items": completed_items,
-                    "completion_rate": completed_items / total_items if total_items > 0 else 0,
-                    "high_priority_count": high_priority_items
-                }
+        yield {"event": "result", "result": {
+            "checklist": checklist,
+            "metadata": {
+                "total_items": total_items,
+                "completed_items": completed_items,
+                "completion_rate": completed_items / total_items if total_items > 0 else 0,
+                "high_priority_count": high_priority_items,
+                "repaired": parser.repaired
             }
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON 파싱 오류: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"체크리스트 처리 중 오류: {str(e)}")
-            raise
+        }}
+
+    @staticmethod
+    def _validate_category(category: Any) -> Dict[str, Any]:
+        """카테고리 형식을 검증하고, 빠진 상태/우선순위는 기본값으로 채웁니다."""
+        if not isinstance(category, dict) or not isinstance(category.get("items"), list):
+            raise ValueError(f"카테고리 형식이 올바르지 않습니다: {str(category)[:100]}")
+        items = []
+        for item in category["items"]:
+            if not isinstance(item, dict) or not item.get("text"):
+                raise ValueError(f"점검 항목 형식이 올바르지 않습니다: {str(item)[:100]}")
+            items.append({
+                **item,
+                "status": item.get("status") if item.get("status") in STATUSES else "미완료",
+                "priority": item.get("priority") if item.get("priority") in PRIORITIES else "중",
+            })
+        return {**category, "name": category.get("name") or "기타", "items": items}
@@ -1,7 +1,7 @@
 from typing import Dict, Any, Optional
 from core.base_skill import BaseSkill
 from datetime import datetime, timedelta
-from db.supabase import supabase
+from db.storage import storage
 from config.logger import logger
 
 class FeedbackStatsSkill(BaseSkill):
@@ -50,10 +50,11 @@ class FeedbackStatsSkill(BaseSkill):
         user_id = input_data.get("user_id")
         
         # Supabase에서 통계 조회
-        stats = await supabase.get_feedback_stats(
+        stats = await storage.get_feedback_stats(
             start_date=start_date,
             end_date=end_date,
-            user_id=user_id
+            user_id=user_id,
+            keyword_k=input_data.get("keyword_k")
         )
         
         # 추가 메타데이터 계산
@@ -67,6 +68,7 @@ class FeedbackStatsSkill(BaseSkill):
             "total_count": stats["total_count"],
             "positive_rate": stats["positive_rate"],
             "negative_rate": stats["negative_rate"],
+            "keyword_top": stats["keyword_top"],
             "recent_feedbacks": stats["recent_feedbacks"],
             "metadata": {
                 "period_days": period_days,
@@ -1,13 +1,32 @@
-from utils.sheet import save_to_sheet
+import asyncio
+from utils.sheet import append_summary, known_sheet_url, save_to_sheet
 from utils.slack import send_slack_notification
-from config.logger import logger
+from config.logger import logger, throttled
+from core.base_skill import BaseSkill
+from core.deadline import deadline_scope, with_deadline
+from core.tracing import start_span
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Set
 import openai
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 시트 저장/Slack 알림 기본 방식 (wait: 끝날 때까지 기다려 sheet_url 반환 | background: 요약만 바로 반환)
+LOGIS_DELIVERY = os.getenv("LOGIS_DELIVERY", "wait")
+DELIVERY_MODES = ("wait", "background")
+
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes text concisely in Korean."
+
+# 진행 중인 백그라운드 전달 작업 (가비지 컬렉션으로 사라지지 않도록 참조 유지)
+_background: Set[asyncio.Task] = set()
+
+def _messages(text: str):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"다음 텍스트를 한 문장으로 요약해주세요: {text}"}
+    ]
+
 def call_gpt_summary(text: str) -> str:
     """
     GPT API를 사용하여 텍스트를 요약합니다.
@@ -18,31 +37,131 @@ def call_gpt_summary(text: str) -> str:
     Returns:
         str: 요약된 텍스트
     """
-    logger.debug(f"GPT 요약 시작: {text[:100]}...")
+    logger.debug("GPT 요약 시작: %.100s...", text)
     openai.api_key = os.getenv("OPENAI_API_KEY")
     
     try:
         response = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes text concisely in Korean."},
-                {"role": "user", "content": f"다음 텍스트를 한 문장으로 요약해주세요: {text}"}
-            ],
+            messages=_messages(text),
             temperature=0.7,
             max_tokens=100
         )
         
         summary = response.choices[0].message.content.strip()
-        logger.debug(f"GPT 요약 완료: {summary}")
+        logger.debug("GPT 요약 완료: %s", summary)
         return summary
         
     except Exception as e:
         logger.error(f"GPT API 호출 중 오류 발생: {str(e)}")
         raise
 
+async def acall_gpt_summary(text: str) -> str:
+    """call_gpt_summary 의 비동기 버전 (이벤트 루프를 막지 않고, 요청 시간 예산 안에서만 기다림)"""
+    logger.debug("GPT 요약 시작: %.100s...", text)
+    openai.api_key = os.getenv("OPENAI_API_KEY")
+
+    try:
+        with start_span("llm.chat_completion", model="gpt-3.5-turbo", prompt_chars=len(text)):
+            response = await with_deadline(openai.ChatCompletion.acreate(
+                model="gpt-3.5-turbo",
+                messages=_messages(text),
+                temperature=0.7,
+                max_tokens=100
+            ), "llm.chat_completion")
+
+        summary = response.choices[0].message.content.strip()
+        logger.debug("GPT 요약 완료: %s", summary)
+        return summary
+
+    except Exception as e:
+        logger.error(f"GPT API 호출 중 오류 발생: {str(e)}")
+        raise
+
+
+class LogisSummarizer(BaseSkill):
+    """
+    물류 요약 스킬: GPT 요약 → Google Sheets 저장 + Slack 알림 (동시에)
+
+    delivery 입력(기본값 LOGIS_DELIVERY)으로 전달 방식을 고릅니다.
+    - wait: 시트 저장과 Slack 알림을 동시에 보내고 끝날 때까지 기다려 sheet_url 을 반환
+    - background: 요약만 바로 반환하고 시트/Slack 은 요청 시간 예산과 무관하게 백그라운드에서 전달
+      (sheet_url 은 이미 연 시트의 URL, 아직 열지 않았으면 None)
+    """
+    skill_name = "logis_summarizer"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+
+    async def validate_input(self, input_data: Dict[str, Any]) -> bool:
+        if not input_data.get("text"):
+            logger.error("요약할 텍스트가 없습니다")
+            return False
+        return True
+
+    async def _process_internal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.process(input_data)
+
+    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        텍스트를 요약하고 시트/Slack 으로 전달합니다.
+
+        Returns:
+            {"summary", "sheet_url"} (기존 execute 와 같은 형태)
+        """
+        text = input_data.get("text")
+        if not text:
+            raise ValueError("요약할 텍스트가 없습니다")
+        delivery = input_data.get("delivery") or LOGIS_DELIVERY
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(f"알 수 없는 전달 방식입니다: {delivery} ({', '.join(DELIVERY_MODES)})")
+        user_id = input_data.get("user_id")
+
+        logger.info("logis_summarizer 스킬 실행 시작 - user_id: %s", user_id, extra=throttled(20))
+        summary = await acall_gpt_summary(text)
+
+        if delivery == "background":
+            task = asyncio.ensure_future(self._deliver_in_background(user_id, text, summary))
+            _background.add(task)
+            task.add_done_callback(_background.discard)
+            sheet_url = known_sheet_url()
+        else:
+            sheet_url = await self._deliver(user_id, text, summary)
+
+        logger.info("logis_summarizer 스킬 실행 완료", extra=throttled(20))
+        return {
+            "summary": summary,
+            "sheet_url": sheet_url
+        }
+
+    async def _deliver(self, user_id: Optional[str], text: str, summary: str) -> str:
+        """시트 저장과 Slack 알림을 동시에 보냅니다 (Slack 실패는 로그만 남김)."""
+        sheet_url, _ = await asyncio.gather(
+            append_summary(user_id, text, summary),
+            self.slack.send_message(f"유저: {user_id}\n요약 결과: {summary}")
+        )
+        return sheet_url
+
+    async def _deliver_in_background(self, user_id: Optional[str], text: str, summary: str) -> None:
+        # 응답을 보낸 뒤에도 끝까지 전달하도록 요청의 시간 예산을 해제
+        with deadline_scope(None):
+            try:
+                await self._deliver(user_id, text, summary)
+            except Exception as e:
+                logger.error(f"logis_summarizer 백그라운드 전달 실패 - user_id: {user_id}, 오류: {str(e)}")
+
+
+async def drain_deliveries(timeout: float = 10.0) -> None:
+    """진행 중인 백그라운드 전달이 끝날 때까지 최대 timeout 초 기다립니다 (앱 종료 시)."""
+    if _background:
+        await asyncio.wait(set(_background), timeout=timeout)
+
+
 def execute(user_id: str, text: str) -> Dict[str, str]:
     """
-    스킬 실행 진입점: GPT 요약 → Google Sheets 저장 → Slack 알림 전송
+    동기 진입점 (스크립트/테스트용): GPT 요약 → Google Sheets 저장 → Slack 알림 전송
+
+    API 에서는 이벤트 루프를 막지 않는 LogisSummarizer 를 사용합니다.
     
     Args:
         user_id (str): 사용자 ID
@@ -51,7 +170,7 @@ def execute(user_id: str, text: str) -> Dict[str, str]:
     Returns:
         Dict[str, str]: summary와 sheet_url을 포함한 결과
     """
-    logger.info(f"logis_summarizer 스킬 실행 시작 - user_id: {user_id}")
+    logger.info("logis_summarizer 스킬 실행 시작 - user_id: %s", user_id, extra=throttled(20))
     
     # 1. GPT 요약
     summary = call_gpt_summary(text)
@@ -62,7 +181,7 @@ def execute(user_id: str, text: str) -> Dict[str, str]:
     # 3. Slack 알림 전송
     send_slack_notification(user_id, summary)
     
-    logger.info("logis_summarizer 스킬 실행 완료")
+    logger.info("logis_summarizer 스킬 실행 완료", extra=throttled(20))
     return {
         "summary": summary,
         "sheet_url": sheet_url
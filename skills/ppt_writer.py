@@ -1,38 +1,123 @@
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, AsyncIterator, List
 from core.prompt_engine import PromptEngine
-from core.base_skill import BaseSkill
-from pptx import Presentation
-from pptx.util import Inches
-import os
-import json
+from core.base_skill import BaseSkill, InvalidInput
+from core.ppt_render import DEFAULT_TEMPLATE, ppt_render_pool
+from core.artifact_store import artifact_key, artifact_store
+from core.json_stream import ANY_INDEX, JsonStreamParser
 from config.logger import logger
 
+# 슬라이드 구조화 프롬프트를 바꾸면 올려서 이전에 만든 PPT 를 재사용하지 않게 함
+PROMPT_VERSION = 1
+
 class PPTWriter(BaseSkill):
     skill_name = "ppt_writer"
     
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         super().__init__()
-        self.prompt_engine = PromptEngine()
+        self.prompt_engine = args[0] if args else PromptEngine()
+        # 렌더링은 템플릿을 미리 파싱해 둔 워커 프로세스에서 실행 (core/ppt_render.py)
+        self.renderer = ppt_render_pool
+        # 만든 PPT 는 내용·템플릿 해시로 저장해 같은 요청에 재사용 (core/artifact_store.py)
+        self.artifacts = artifact_store
         
     async def validate_input(self, input_data: Dict[str, Any]) -> bool:
         if "content" not in input_data or not input_data["content"]:
-            logger.error("내용이 없습니다")
-            return False
+            raise InvalidInput("PPT 로 변환할 내용(content)이 없습니다")
+        try:
+            self.renderer.check_template(input_data.get("template") or DEFAULT_TEMPLATE)
+        except ValueError as e:
+            raise InvalidInput(str(e))
         return True
         
     async def _process_internal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.process(input_data)
+
+    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """내용을 PPT로 변환합니다 (stream 의 최종 결과만 반환)."""
+        result: Dict[str, Any] = {}
+        async for event in self.stream(input_data):
+            if event["event"] == "result":
+                result = event["result"]
+        return result
+
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
         """
-        내용을 PPT로 변환
+        내용을 PPT로 변환하면서 완성된 슬라이드를 이벤트로 내보냅니다.
+        
+        같은 내용·템플릿(파일 내용 포함)으로 이미 만든 PPT 가 있으면 LLM 호출과 렌더링 없이 재사용합니다.
+        같은 PPT 를 다른 요청이 만들고 있으면 기다렸다가 결과만 받습니다 (slide 이벤트 없음).
         
         Args:
-            input_data: 변환할 내용이 포함된 입력 데이터
+            input_data: 변환할 내용이 포함된 입력 데이터 (template: PPT_TEMPLATE_DIR 의 회사 템플릿 이름, 선택)
+            
+        Yields:
+            {"event": "slide", "index", "slide"}: LLM 응답에서 완성된 슬라이드 (응답 순서)
+            {"event": "result", "result": {...}}: 생성된 PPT 파일 경로, 다운로드 주소와 메타데이터
             
-        Returns:
-            생성된 PPT 파일 경로와 메타데이터
+        Raises:
+            InvalidInput: 내용이 없거나 템플릿이 없는 경우
         """
+        await self.ensure_valid(input_data)
         content = input_data["content"]
+        template = input_data.get("template") or DEFAULT_TEMPLATE
+        artifact_id = artifact_key(
+            "ppt",
+            content=content,
+            template=template,
+            template_digest=self.renderer.template_digest(template),
+            prompt_version=PROMPT_VERSION
+        )
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def build(file_path: str) -> Dict[str, Any]:
+            slides = []
+            async for slide in self._structure(content):
+                slides.append(slide)
+                events.put_nowait({"event": "slide", "index": len(slides) - 1, "slide": slide})
+            if not slides:
+                raise ValueError("슬라이드가 없습니다")
+            # PPT 생성 및 저장 (python-pptx 는 GIL 을 오래 잡으므로 렌더링 워커 프로세스에서 실행)
+            await self.renderer.render({"slides": slides}, file_path, template)
+            return {
+                "template": template,
+                "slide_count": len(slides),
+                "metadata": {
+                    "titles": [slide["title"] for slide in slides],
+                    "total_bullets": sum(len(slide["bullets"]) for slide in slides)
+                }
+            }
+
+        task = asyncio.ensure_future(self.artifacts.get_or_create(artifact_id, ".pptx", build))
+        try:
+            # 만드는 동안 완성된 슬라이드를 바로 전달
+            while True:
+                getter = asyncio.ensure_future(events.get())
+                await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                yield getter.result()
+            while not events.empty():
+                yield events.get_nowait()
+            artifact, created = await task
+        finally:
+            # 만들기 자체는 저장소에서 계속 진행되므로 기다리는 쪽만 정리
+            task.cancel()
+
+        if not created:
+            logger.info("저장된 PPT 재사용: %s", artifact.id)
         
-        # 내용 구조화
+        yield {"event": "result", "result": {
+            "file_path": artifact.path,
+            "artifact_id": artifact.id,
+            "download_url": f"/artifacts/{artifact.id}",
+            "cached": not created,
+            **artifact.metadata
+        }}
+
+    async def _structure(self, content: str) -> AsyncIterator[Dict[str, Any]]:
+        """LLM 으로 내용을 슬라이드 구조로 정리하면서, 완성된 슬라이드를 검증해 바로 내보냅니다."""
         prompt = f"""
         다음 내용을 PPT 슬라이드 형식으로 구조화해주세요.
         각 슬라이드는 다음 JSON 형식으로 반환해주세요:
@@ -51,51 +136,39 @@ class PPTWriter(BaseSkill):
         {content}
         """
         
-        structured_content = await self.prompt_engine.run_prompt(
-            prompt=prompt,
-            temperature=0.7
-        )
-        
-        # JSON 파싱
-        slides_data = json.loads(structured_content)
-        
-        # PPT 생성
-        prs = Presentation()
-        for slide in slides_data["slides"]:
-            # 슬라이드 추가
-            layout = prs.slide_layouts[1]  # 제목과 내용 레이아웃
-            current_slide = prs.slides.add_slide(layout)
-            
-            # 제목 설정
-            if current_slide.shapes.title:
-                current_slide.shapes.title.text = slide["title"]
-            
-            # 내용 추가
-            if current_slide.shapes.placeholders[1]:
-                content_shape = current_slide.shapes.placeholders[1]
-                tf = content_shape.text_frame
-                
-                for bullet in slide["bullets"]:
-                    p = tf.add_paragraph()
-                    p.text = bullet
-                    p.level = 0
-            
-            # 노트 추가 (있는 경우)
-            if "notes" in slide and slide["notes"]:
-                notes_slide = current_slide.notes_slide
-                notes_slide.notes_text_frame.text = slide["notes"]
-        
-        # 파일 저장
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, f"presentation_{hash(content)}.pptx")
-        prs.save(file_path)
-        
+        # {"slides": [...]} 대신 슬라이드 목록만 오는 경우도 허용
+        parser = JsonStreamParser(watch=[("slides", ANY_INDEX), (ANY_INDEX,)])
+        emitted = 0
+        chunks = self.prompt_engine.stream_prompt(prompt=prompt, temperature=0.7)
+        try:
+            async for chunk in chunks:
+                for _, slide in parser.feed(chunk):
+                    emitted += 1
+                    yield self._validate_slide(slide)
+        finally:
+            await chunks.aclose()
+
+        # 끊기거나 형식이 조금 틀린 응답은 버리지 않고 복구
+        document = parser.finish()
+        if parser.repaired:
+            logger.warning("PPT 구조 응답 JSON 을 복구했습니다")
+        slides = document.get("slides") if isinstance(document, dict) else document
+        if not isinstance(slides, list):
+            raise ValueError("slides 목록이 없습니다")
+        # 복구하면서 살아난 마지막 슬라이드
+        for slide in slides[emitted:]:
+            yield self._validate_slide(slide)
+
+    @staticmethod
+    def _validate_slide(slide: Any) -> Dict[str, Any]:
+        """슬라이드 형식을 검증합니다 (제목 필수, 항목은 문자열 목록)."""
+        if not isinstance(slide, dict) or not isinstance(slide.get("title"), str):
+            raise ValueError(f"슬라이드 형식이 올바르지 않습니다: {str(slide)[:100]}")
+        bullets = slide.get("bullets") or []
+        if not isinstance(bullets, list):
+            bullets = [bullets]
         return {
-            "file_path": file_path,
-            "slide_count": len(slides_data["slides"]),
-            "metadata": {
-                "titles": [slide["title"] for slide in slides_data["slides"]],
-                "total_bullets": sum(len(slide["bullets"]) for slide in slides_data["slides"])
-            }
+            "title": slide["title"],
+            "bullets": [str(bullet) for bullet in bullets],
+            "notes": str(slide.get("notes") or "")
         }
@@ -1,15 +1,77 @@
-from typing import Dict, Any, List
-import openai
-import whisper
+import asyncio
+import os
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional
 from pathlib import Path
-import tempfile
 from core.base_skill import BaseSkill
+from core.prompt_engine import PromptEngine
+from core.tracing import start_span
+from core.audio_segments import SAMPLE_RATE, decode_audio, split_on_silence
+from core.transcript_cache import transcript_cache
+from core.transcription import TRANSCRIPTION_TIER_BY_DURATION, select_tier, stitch_segments, transcription_pool
+from utils.offload import run_blocking
+from utils.uploads import hash_file
+
+# 앞쪽 구간 전사가 이 글자 수만큼 모이면 마지막 구간을 기다리지 않고 부분 요약을 시작
+VOICE_SUMMARY_CHUNK_CHARS = int(os.getenv("VOICE_SUMMARY_CHUNK_CHARS", "4000"))
+
+DEFAULT_REQUIREMENTS = "간단명료하게 작성"
+
+
+class _PartialSummaries:
+    """
+    끝난 구간들이 앞에서부터 빈틈없이 이어지는 만큼 전사를 모아, 일정 길이마다 부분 요약을 미리 시작합니다.
+
+    구간은 끝나는 순서가 뒤섞여 들어오므로 순서가 맞을 때까지 잠시 보관합니다.
+    """
+
+    def __init__(self, summarize: Callable[[str], Awaitable[str]], chunk_chars: int):
+        self._summarize = summarize
+        self.chunk_chars = chunk_chars
+        self._waiting: Dict[int, str] = {}
+        self._next = 0
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self.tasks: List[asyncio.Future] = []
+
+    def add(self, index: int, text: str) -> None:
+        self._waiting[index] = text
+        while self._next in self._waiting:
+            text = self._waiting.pop(self._next)
+            self._next += 1
+            if text:
+                self._buffer.append(text)
+                self._buffered_chars += len(text)
+            if self._buffered_chars >= self.chunk_chars:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self.tasks.append(asyncio.ensure_future(self._summarize(" ".join(self._buffer))))
+            self._buffer, self._buffered_chars = [], 0
+
+    async def finish(self) -> List[str]:
+        """남은 전사까지 요약을 시작하고 모든 부분 요약을 순서대로 반환합니다."""
+        self._flush()
+        return list(await asyncio.gather(*self.tasks))
+
+    async def aclose(self) -> None:
+        """끝나지 않은 부분 요약을 취소합니다 (오류/연결 종료 시)."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
 
 
 class VoiceMemoSummarizer(BaseSkill):
-    def __init__(self, prompt_engine):
-        super().__init__(prompt_engine)
-        self.whisper_model = whisper.load_model("base")
+    skill_name = "voice_memo_summarizer"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.prompt_engine = args[0] if args else PromptEngine()
+        # 모델은 음성 인식 워커 프로세스에 올라가 있음 (core/transcription.py)
+        self.transcriber = transcription_pool
+        self.cache = transcript_cache
+        self.register_prompts()
 
     def register_prompts(self):
         summary_template = """다음 음성 메모 내용을 요약해주세요:
@@ -26,10 +88,54 @@ class VoiceMemoSummarizer(BaseSkill):
         self.prompt_engine.register_prompt(
             "summarize_voice_memo",
             summary_template,
-            {"additional_requirements": "간단명료하게 작성"}
+            {"additional_requirements": DEFAULT_REQUIREMENTS}
         )
 
+        combine_template = """다음은 긴 음성 메모를 앞에서부터 나눠 요약한 내용입니다. 하나의 요약으로 합쳐주세요:
+
+부분 요약:
+{partial_summaries}
+
+요약 요구사항:
+- 중복되는 내용은 한 번만 정리
+- 시간 순서대로 정리
+- 액션 아이템이 있다면 "액션 아이템" 제목 아래 별도로 모아서 표시
+- {additional_requirements}"""
+
+        self.prompt_engine.register_prompt(
+            "combine_voice_memo_summaries",
+            combine_template,
+            {"additional_requirements": DEFAULT_REQUIREMENTS}
+        )
+
+    async def validate_input(self, input_data: Dict[str, Any]) -> bool:
+        return bool(input_data.get("audio_path"))
+
+    async def _process_internal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.process(input_data)
+
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """음성 메모를 전사하고 요약합니다 (stream 의 최종 결과만 반환)."""
+        result: Dict[str, Any] = {}
+        async for event in self.stream(input_data):
+            if event["event"] == "result":
+                result = event["result"]
+        return result
+
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        음성 메모를 구간별로 병렬 전사하면서 진행 상황을 이벤트로 내보냅니다.
+
+        파형은 한 번만 디코딩해 무음 위치에서 나누고, 구간은 음성 인식 워커들에서 동시에 변환합니다.
+        앞쪽 구간의 전사가 충분히 모이면 나머지 구간을 기다리지 않고 부분 요약을 시작합니다.
+        같은 음성(SHA-256)·모델·언어의 전사가 캐시에 있으면 디코딩과 음성 인식 없이 바로 요약합니다.
+
+        Yields:
+            {"event": "segments", "count", "duration", "tier", "cached"}: 구간 분할 결과 (cached: 캐시된 전사 사용)
+            {"event": "segment", "index", "start", "end", "text", "language"}: 구간 전사 (끝나는 순서)
+            {"event": "transcribed", "rtf"}: 모든 구간 전사 완료 (캐시를 쓰면 없음)
+            {"event": "result", "result": {...}}: 전체 전사와 요약 (process 결과와 같음)
+        """
         audio_path = input_data.get("audio_path")
         if not audio_path:
             raise ValueError("No audio file provided for transcription")
@@ -37,37 +143,123 @@ class VoiceMemoSummarizer(BaseSkill):
         if not Path(audio_path).exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        # 음성을 텍스트로 변환
-        result = await self.whisper_model.transcribe(audio_path)
-        transcription = result["text"]
+        additional_requirements = input_data.get("additional_requirements", DEFAULT_REQUIREMENTS)
+        language = input_data.get("language")
+        # 요청한 등급이 있으면 먼저 확인 (없는 등급이면 UnknownTier)
+        tier = input_data.get("tier")
+        if tier:
+            self.transcriber.engine_for(tier)
+        # 업로드 시 계산한 해시가 없으면(/execute 로 경로만 받은 경우) 파일에서 계산
+        audio_sha256 = input_data.get("audio_sha256") or await run_blocking("uploads", hash_file, audio_path)
 
-        # 텍스트 요약
-        additional_requirements = input_data.get("additional_requirements", "간단명료하게 작성")
-        prompt = self.prompt_engine.generate_prompt(
-            "summarize_voice_memo",
-            {
-                "transcription": transcription,
+        async def summarize(text: str) -> str:
+            return await self._summarize("summarize_voice_memo", {
+                "transcription": text,
                 "additional_requirements": additional_requirements
-            }
-        )
+            })
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a professional voice memo summarizer."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        partials = _PartialSummaries(summarize, VOICE_SUMMARY_CHUNK_CHARS)
+        results: List[Dict[str, Any]] = []
+        info: Dict[str, Any] = {}
+        try:
+            async for event in self._transcribe(audio_path, audio_sha256, language, tier):
+                if event["event"] in ("segments", "transcribed"):
+                    info.update(event)
+                elif event["event"] == "segment":
+                    results.append(event)
+                    partials.add(event["index"], event["text"])
+                    event = {key: value for key, value in event.items() if key != "segments"}
+                yield event
 
-        summary = response.choices[0].message.content
+            transcript = stitch_segments(results)
+            if not partials.tasks:
+                # 짧은 메모는 전체를 한 번에 요약
+                summary = await summarize(transcript["text"])
+            else:
+                parts = await partials.finish()
+                summary = parts[0] if len(parts) == 1 else await self._summarize("combine_voice_memo_summaries", {
+                    "partial_summaries": "\n\n".join(f"[{i + 1}]\n{part}" for i, part in enumerate(parts)),
+                    "additional_requirements": additional_requirements
+                })
+        finally:
+            await partials.aclose()
 
-        return {
-            "transcription": transcription,
+        yield {"event": "result", "result": {
+            "transcription": transcript["text"],
             "summary": summary,
-            "duration": result.get("duration", 0),  # 음성 길이(초)
-            "language": result.get("language", "unknown"),  # 감지된 언어
+            "duration": transcript["duration"],  # 음성 길이(초)
+            "language": transcript["language"],  # 감지된 언어 (구간별 결과 중 가장 많은 것)
+            "tier": info["tier"],  # 사용한 음성 인식 등급
+            "rtf": info.get("rtf"),  # 음성 인식 소요 시간 / 음성 길이 (캐시 사용 시 None)
+            "segments": [
+                {key: r[key] for key in ("start", "end", "text")}
+                for r in sorted(results, key=lambda r: r["index"])
+            ],
             "action_items": self._extract_action_items(summary)
-        }
+        }}
+
+    async def _transcribe(self,
+                          audio_path: str,
+                          audio_sha256: str,
+                          language: Optional[str],
+                          tier: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        구간 분할 이벤트 뒤에 구간 전사 이벤트를 끝나는 순서대로 내보내고, 모두 끝나면 캐시에 저장합니다.
+
+        등급을 지정하지 않으면 디코딩한 음성 길이로 고릅니다 (select_tier). 이 경우 캐시는 길이 규칙에
+        나오는 등급들의 모델로 찾아보되, 저장된 길이로 다시 고른 등급의 모델과 같은 결과만 씁니다
+        (다른 등급을 지정해 만든 결과를 길이 규칙 요청에 돌려주지 않도록).
+        모든 구간이 끝나면 마지막으로 {"event": "transcribed", "rtf"} 를 내보냅니다.
+        """
+        pool = self.transcriber
+        if tier:
+            candidates = [tier]
+        else:
+            candidates = list(dict.fromkeys([t for _, t in TRANSCRIPTION_TIER_BY_DURATION] + [pool.default_tier]))
+        engines = dict.fromkeys(pool.engine_for(candidate) for candidate in candidates)
+        for engine in engines:
+            cached = await self.cache.get(audio_sha256, engine, language)
+            if cached is None:
+                continue
+            selected = select_tier(tier, cached["duration"], tiers=pool.tiers, default=pool.default_tier)
+            if pool.engine_for(selected) != engine:
+                continue
+            yield {"event": "segments", "count": len(cached["results"]), "duration": cached["duration"],
+                   "tier": selected, "cached": True}
+            for result in cached["results"]:
+                yield {"event": "segment", **result}
+            return
+
+        # 디코딩(ffmpeg)은 한 번만 하고, 워커에는 구간 파형만 보냄
+        with start_span("voice.decode"):
+            audio = await run_blocking("audio", decode_audio, audio_path)
+        spans = split_on_silence(audio)
+        if not spans:
+            raise ValueError("Audio file contains no samples")
+        duration = round(len(audio) / SAMPLE_RATE, 3)
+        tier = select_tier(tier, duration, tiers=pool.tiers, default=pool.default_tier)
+        yield {"event": "segments", "count": len(spans), "duration": duration, "tier": tier, "cached": False}
+
+        options = {"language": language} if language else {}
+        results = []
+        started = time.monotonic()
+        async for segment in pool.transcribe_segments(audio, spans, SAMPLE_RATE, tier=tier, **options):
+            results.append(segment)
+            yield {"event": "segment", **segment}
+        yield {"event": "transcribed", "rtf": round((time.monotonic() - started) / duration, 3) if duration else None}
+
+        # 모든 구간이 끝난 경우에만 저장 (whisper 세부 정보는 빼고 시각/텍스트만)
+        await self.cache.put(audio_sha256, pool.engine_for(tier), language, {
+            "results": [
+                {**r, "segments": [{key: seg[key] for key in ("start", "end", "text")} for seg in r["segments"]]}
+                for r in sorted(results, key=lambda r: r["index"])
+            ],
+            "duration": duration,
+        })
+
+    async def _summarize(self, prompt_name: str, params: Dict[str, Any]) -> str:
+        prompt = await self.prompt_engine.generate_prompt(prompt_name, params)
+        return await self.prompt_engine.run_prompt(prompt=prompt, temperature=0.3)
 
     def _extract_action_items(self, summary: str) -> List[str]:
         action_items = []
@@ -77,7 +269,7 @@ class VoiceMemoSummarizer(BaseSkill):
             if "액션 아이템" in line or "할 일" in line:
                 in_action_section = True
                 continue
-            
+
             if in_action_section and line.strip():
                 if line.startswith(("- ", "* ", "• ")):
                     action_items.append(line[2:].strip())
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import api.main as main
+import core.alert_engine as alert_module
+from core.alert_engine import AlertEngine
+from core.deadline import TIMEOUT_HEADER, with_deadline
+
+RULES = [{
+    "name": "too_few_items",
+    "skill": "fake_skill",
+    "kind": "value",
+    "field": "item_count",
+    "op": "<",
+    "threshold": 3,
+    "message": "항목이 너무 적습니다 ({value:.0f}개)",
+}]
+
+
+class FakeSkill:
+    async def ensure_valid(self, input_data):
+        return None
+
+    async def process(self, input_data):
+        return {"item_count": 1}
+
+    async def stream(self, input_data):
+        yield {"event": "item", "index": 0}
+        yield {"event": "result", "result": {"item_count": 1}}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_value_rule_fires_on_execute(monkeypatch, stream):
+    sent = []
+
+    async def send_message(text, **kwargs):
+        sent.append(text)
+
+    monkeypatch.setattr(main, "alert_engine", AlertEngine(rules=RULES))
+    monkeypatch.setattr(alert_module.slack, "send_message", send_message)
+    monkeypatch.setitem(main.skills, "fake_skill", FakeSkill())
+
+    response = TestClient(main.app).post(
+        "/execute", params={"stream": stream}, json={"skill": "fake_skill", "user_id": "u1"}
+    )
+
+    assert response.status_code == 200
+    assert len(sent) == 1 and "항목이 너무 적습니다 (1개)" in sent[0]
+
+
+class SlowVoiceMemo:
+    async def process(self, input_data):
+        await with_deadline(asyncio.sleep(5), "transcribe")
+
+    async def stream(self, input_data):
+        yield {"event": "segment", "index": 0}
+        await with_deadline(asyncio.sleep(5), "transcribe")
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_voice_memo_upload_respects_timeout(monkeypatch, stream):
+    engine = AlertEngine(rules=[{
+        "name": "high_timeout_rate", "skill": "*", "kind": "rate", "counter": "timeouts",
+        "window": 300, "op": ">", "threshold": 0.05, "min_events": 20, "message": "",
+    }])
+    monkeypatch.setattr(main, "alert_engine", engine)
+    monkeypatch.setattr(main, "_check_tier", lambda tier: None)
+    monkeypatch.setitem(main.skills, "voice_memo_summarizer", SlowVoiceMemo())
+
+    response = TestClient(main.app).post(
+        "/upload_voice_memo", params={"filename": "memo.m4a", "stream": stream},
+        content=b"audio", headers={"Content-Type": "audio/mp4", TIMEOUT_HEADER: "0.2"}
+    )
+
+    if stream:
+        assert response.status_code == 200
+        assert response.text.splitlines()[-1] == '{"event": "error", "detail": "Skill timed out after 0.2s"}'
+    else:
+        assert response.status_code == 504
+    assert engine.snapshot()["voice_memo_summarizer"]["300s"]["timeouts"] == 1
@@ -0,0 +1,57 @@
+import asyncio
+import os
+from core.artifact_store import ArtifactStore, artifact_key
+
+
+def test_same_input_is_built_once_and_reused(tmp_path):
+    store = ArtifactStore(directory=str(tmp_path), max_bytes=1000, max_age=3600)
+    builds = []
+
+    async def build(path):
+        builds.append(path)
+        await asyncio.sleep(0.01)
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        return {"slide_count": 3}
+
+    async def scenario():
+        key = artifact_key("ppt", content="회의록", template="default")
+        assert key == artifact_key("ppt", template="default", content="회의록")
+        # 동시에 같은 요청이 와도 한 번만 만듦
+        results = await asyncio.gather(*(store.get_or_create(key, ".pptx", build) for _ in range(3)))
+        again, created = await store.get_or_create(key, ".pptx", build)
+        return results, again, created
+
+    results, again, created = asyncio.run(scenario())
+    assert len(builds) == 1
+    assert [created for _, created in results].count(True) == 1
+    assert not created and again.metadata == {"slide_count": 3}
+    assert os.path.getsize(again.path) == 100
+
+    # 재시작 후에도 디스크의 결과물을 찾음
+    reloaded = asyncio.run(ArtifactStore(directory=str(tmp_path)).get(again.id))
+    assert reloaded is not None and reloaded.metadata == {"slide_count": 3}
+
+
+def test_evicts_least_recently_used_over_size_limit(tmp_path):
+    store = ArtifactStore(directory=str(tmp_path), max_bytes=250, max_age=3600)
+
+    def build(size):
+        async def write(path):
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+            return {}
+        return write
+
+    async def scenario():
+        first, _ = await store.get_or_create(artifact_key("ppt", content="a"), ".pptx", build(100))
+        second, _ = await store.get_or_create(artifact_key("ppt", content="b"), ".pptx", build(100))
+        await store.get(first.id)  # 첫 번째를 최근에 사용
+        await asyncio.sleep(0.01)
+        await store.get_or_create(artifact_key("ppt", content="c"), ".pptx", build(100))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert os.path.exists(first.path)
+    assert not os.path.exists(second.path)
+    assert store.total_bytes == 200 and store.evictions == 1
@@ -0,0 +1,33 @@
+import numpy as np
+from core.audio_segments import SAMPLE_RATE, split_on_silence
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_cuts_at_silence_within_max_length():
+    audio = np.concatenate([_tone(20), _silence(1), _tone(20), _silence(1), _tone(5)])
+    spans = split_on_silence(audio, max_seconds=30, min_seconds=10)
+
+    # 구간은 빈틈없이 이어지고 최대 길이를 넘지 않음
+    assert spans[0][0] == 0 and spans[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    assert all(end - start <= 30 * SAMPLE_RATE for start, end in spans)
+
+    # 첫 자르는 위치는 첫 번째 무음 안
+    assert 20 * SAMPLE_RATE <= spans[0][1] <= 21 * SAMPLE_RATE
+
+
+def test_hard_cut_without_silence_and_short_audio():
+    spans = split_on_silence(_tone(70), max_seconds=30)
+    assert len(spans) == 3
+    assert all(end - start <= 30 * SAMPLE_RATE for start, end in spans)
+
+    assert split_on_silence(_tone(5)) == [(0, 5 * SAMPLE_RATE)]
+    assert split_on_silence(_silence(0)) == []
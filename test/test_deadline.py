@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from core.deadline import (
+    ClientDisconnected, DeadlineExceeded, cancel_on_disconnect,
+    deadline_scope, remaining, resolve_timeout, with_deadline
+)
+from utils.offload import run_blocking
+
+
+def test_resolve_timeout_uses_header_or_skill_default():
+    assert resolve_timeout(None, "summarizer") == 30
+    assert resolve_timeout("5", "summarizer") == 5
+    assert resolve_timeout("abc", "summarizer") == 30
+    assert resolve_timeout("999999", "summarizer") <= 600
+
+
+def test_nested_scope_keeps_earlier_deadline():
+    assert remaining() is None
+    with deadline_scope(1):
+        with deadline_scope(100):
+            assert remaining() <= 1
+        with deadline_scope(None):
+            assert remaining() is None
+    assert remaining() is None
+
+
+def test_with_deadline_raises_when_budget_runs_out():
+    async def main():
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded) as exc:
+                await with_deadline(asyncio.sleep(1), "llm")
+            assert exc.value.operation == "llm"
+
+            # 예산을 다 쓴 뒤에는 오프로드 작업을 시작하지 않음
+            with pytest.raises(DeadlineExceeded):
+                await run_blocking("default", lambda: None)
+
+    asyncio.run(main())
+
+
+def test_cancel_on_disconnect_cancels_work():
+    class FakeRequest:
+        def __init__(self):
+            self.calls = 0
+
+        async def is_disconnected(self):
+            self.calls += 1
+            return self.calls >= 2
+
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        with pytest.raises(ClientDisconnected):
+            await cancel_on_disconnect(FakeRequest(), work(), poll_interval=0.01)
+
+    asyncio.run(main())
+    assert cancelled == [True]
@@ -49,7 +49,7 @@ def test_create_feedback_invalid_input():
 @pytest.mark.asyncio
 async def test_supabase_feedback_operations(sample_feedback):
     """Supabase 연동 테스트"""
-    from db.supabase import supabase
+    from db.storage import storage as supabase
     
     # 피드백 생성
     feedback = FeedbackCreate(**sample_feedback)
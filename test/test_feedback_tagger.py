@@ -0,0 +1,62 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core.feedback_tagger import FeedbackTagger, TagBatcher
+
+
+def test_emotion_and_keywords():
+    tagger = FeedbackTagger(max_keywords=3)
+    results = tagger.tag_batch([
+        "문서 요약이 정확하고 핵심을 잘 정리했어요",
+        "요약이 좋지 않아요. 변환 속도가 느려서 답답합니다",
+        "체크리스트 추출이 오류 없이 됩니다",
+        "그냥 그래요",
+    ])
+
+    assert [emotion for emotion, _ in results] == ["positive", "negative", "positive", "neutral"]
+    # 다른 피드백에도 나온 "요약" 은 배치 안 문서 빈도(IDF) 때문에 뒤로 밀림
+    assert results[0][1] == ["문서", "정확", "핵심"]
+    assert "좋지" not in results[1][1] and len(results[1][1]) <= 3
+    assert results[3][1] == []
+    assert tagger.tag("안 좋아요")[0] == "negative"
+
+
+def test_batcher_coalesces_single_requests():
+    tagger = FeedbackTagger()
+    batcher = TagBatcher(tagger, max_batch=100, max_wait=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.tag(f"PPT 생성이 빨라요 {i}") for i in range(20)))
+
+    results = asyncio.run(scenario())
+
+    assert all(emotion == "positive" and keywords == ["PPT", "생성"] for emotion, keywords in results)
+    assert tagger.tagged == 20 and tagger.batches == 1
+
+
+def test_single_submission_is_stored_then_tagged_in_background(monkeypatch):
+    import api.feedback as feedback_api
+    from db.sqlite import SQLiteStorage
+    from models.feedback import UserCreate
+
+    storage = SQLiteStorage(":memory:")
+    user = asyncio.run(storage.create_user(UserCreate(name="tester")))
+    inserted = []
+    create_feedback = storage.create_feedback
+
+    async def record_insert(feedback):
+        inserted.append((feedback.emotion, feedback.keywords))
+        return await create_feedback(feedback)
+
+    monkeypatch.setattr(storage, "create_feedback", record_insert)
+    monkeypatch.setattr(feedback_api, "storage", storage)
+    app = FastAPI()
+    app.include_router(feedback_api.router, prefix="/feedback")
+
+    response = TestClient(app).post("/feedback/submit", json={"user_id": str(user.id), "content": "PPT 생성이 빨라요"})
+
+    # 태그 없이 먼저 저장하고, 응답 후 백그라운드 작업에서 채움
+    assert response.status_code == 200
+    assert inserted == [(None, [])]
+    page = asyncio.run(storage.get_user_feedback_page(user.id, columns=["emotion", "keywords"]))
+    assert [(row["emotion"], row["keywords"]) for row in page["items"]] == [("positive", ["PPT", "생성"])]
@@ -0,0 +1,40 @@
+from core.json_stream import ANY_INDEX, JsonStreamParser, parse_json
+
+
+def test_emits_watched_values_as_soon_as_they_complete():
+    text = '설명\n```json\n{"title": "점검", "categories": [{"name": "A", "items": [{"text": "x"},]}, {"name": "B", "items": []}]}\n```'
+    parser = JsonStreamParser(watch=[("title",), ("categories", ANY_INDEX)])
+    events = []
+    for i in range(len(text)):
+        completed = parser.feed(text[i])
+        if completed:
+            events.append((i, completed))
+
+    assert [path for _, completed in events for path, _ in completed] == [("title",), ("categories", 0), ("categories", 1)]
+    # 첫 카테고리는 두 번째 카테고리가 오기 전에 나옴 (닫는 괄호 앞 쉼표도 정리)
+    assert events[1][1][0][1] == {"name": "A", "items": [{"text": "x"}]}
+    assert events[1][0] < text.index('"B"')
+    assert parser.finish()["categories"][1] == {"name": "B", "items": []}
+    assert parser.repaired
+
+
+def test_repairs_truncated_response():
+    assert parse_json('{"slides": [{"title": "a", "bullets": ["1"]}, {"title": "b", "bullets": ["2", "셋') == {
+        "slides": [{"title": "a", "bullets": ["1"]}, {"title": "b", "bullets": ["2", "셋"]}]
+    }
+    # 끊긴 키/값은 버리고 마지막으로 완성된 값까지 살림
+    assert parse_json('{"slides": [{"title": "a", "n": tr') == {"slides": [{"title": "a"}]}
+    assert parse_json('[1, 2, {"a": [3,') == [1, 2, {"a": [3]}]
+
+
+def test_skips_brackets_in_leading_prose():
+    assert parse_json('[참고] 아래는 JSON 입니다\n{"a": 1}') == {"a": 1}
+    assert parse_json('결과 {요약} 입니다:\n```json\n[{"a": [1, 2,]}]\n```') == [{"a": [1, 2]}]
+    assert parse_json('항목 [1번 참고\n{"a": 1, "b": {"c": "끊') == {"a": 1, "b": {"c": "끊"}}
+
+    # 스트리밍 중에도 설명 문장의 괄호는 건너뛰고 실제 루트의 값만 돌려줌
+    parser = JsonStreamParser(watch=[("slides", ANY_INDEX)])
+    text = '[참고] {slides} 형식:\n{"slides": [{"title": "a"}]}'
+    events = [event for ch in text for event in parser.feed(ch)]
+    assert events == [(("slides", 0), {"title": "a"})]
+    assert parser.finish() == {"slides": [{"title": "a"}]}
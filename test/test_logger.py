@@ -0,0 +1,32 @@
+import json
+import logging
+from config.logger import JsonFormatter, SamplingFilter, sampled, throttled
+
+
+def _record(msg="메시지 %s", args=("값",), lineno=10, **extra):
+    record = logging.LogRecord("standard-ai", logging.INFO, "/app/x.py", lineno, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = JsonFormatter().format(_record(skill="summarizer", **sampled(1.0)))
+    payload = json.loads(line)
+    assert payload["message"] == "메시지 값"
+    assert payload["skill"] == "summarizer"
+    assert "sample_rate" not in payload
+
+
+def test_sampling_filter_drops_everything_at_zero_rate():
+    sampling = SamplingFilter()
+    assert not any(sampling.filter(_record(**sampled(0.0))) for _ in range(100))
+    assert all(sampling.filter(_record()) for _ in range(100))
+
+
+def test_rate_limit_is_per_call_site():
+    sampling = SamplingFilter()
+    passed = sum(sampling.filter(_record(lineno=1, **throttled(5))) for _ in range(100))
+    assert passed == 5
+    # 다른 줄의 호출 위치는 별도 버킷
+    assert sampling.filter(_record(lineno=2, **throttled(5)))
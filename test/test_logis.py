@@ -1,4 +1,8 @@
+import asyncio
 import pytest
+import core.base_skill
+import skills.logis_summarizer as logis
+import utils.sheet as sheet
 from skills.logis_summarizer import call_gpt_summary, execute
 from utils.sheet import save_to_sheet
 from utils.slack import send_slack_notification
@@ -59,3 +63,111 @@ def test_execute_endpoint(client, monkeypatch, dummy_text):
     assert response.status_code == 200
     assert response.json()["summary"] == "샘플"
     assert response.json()["sheet_url"] == "url"
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    # 실제 인증 없이 스킬을 만들고 GPT 요약은 고정값으로 대체
+    async def summary(text):
+        return "샘플 요약"
+
+    monkeypatch.setattr(core.base_skill, "SheetWriter", lambda: None)
+    monkeypatch.setattr(logis, "acall_gpt_summary", summary)
+    return logis.LogisSummarizer()
+
+
+def test_deliver_wait_sends_sheet_and_slack_concurrently(monkeypatch, summarizer, dummy_text):
+    async def scenario():
+        sheet_started, slack_started = asyncio.Event(), asyncio.Event()
+
+        # 서로 상대가 시작되기를 기다리므로 순서대로 실행하면 시간 초과
+        async def append_summary(user_id, text, summary):
+            sheet_started.set()
+            await asyncio.wait_for(slack_started.wait(), 1)
+            return "https://docs.google.com/dummy"
+
+        async def send_message(message):
+            slack_started.set()
+            await asyncio.wait_for(sheet_started.wait(), 1)
+            assert message == "유저: user1\n요약 결과: 샘플 요약"
+
+        monkeypatch.setattr(logis, "append_summary", append_summary)
+        monkeypatch.setattr(summarizer.slack, "send_message", send_message)
+        return await summarizer.process({"text": dummy_text, "user_id": "user1", "delivery": "wait"})
+
+    assert asyncio.run(scenario()) == {"summary": "샘플 요약", "sheet_url": "https://docs.google.com/dummy"}
+
+
+def test_deliver_background_returns_before_delivery(monkeypatch, summarizer, dummy_text):
+    delivered = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def append_summary(user_id, text, summary):
+            await release.wait()
+            delivered.append("sheet")
+            return "https://docs.google.com/dummy"
+
+        async def send_message(message):
+            await release.wait()
+            delivered.append("slack")
+
+        monkeypatch.setattr(logis, "append_summary", append_summary)
+        monkeypatch.setattr(logis, "known_sheet_url", lambda: None)
+        monkeypatch.setattr(summarizer.slack, "send_message", send_message)
+
+        result = await summarizer.process({"text": dummy_text, "user_id": "user1", "delivery": "background"})
+        assert result == {"summary": "샘플 요약", "sheet_url": None}
+        assert delivered == [] and len(logis._background) == 1
+
+        release.set()
+        await logis.drain_deliveries(timeout=1)
+        assert not logis._background
+
+    asyncio.run(scenario())
+    assert sorted(delivered) == ["sheet", "slack"]
+
+
+def test_unknown_delivery_mode(summarizer, dummy_text):
+    with pytest.raises(ValueError):
+        asyncio.run(summarizer.process({"text": dummy_text, "delivery": "later"}))
+
+
+def test_sheet_reuses_worksheet_and_reopens_after_failure(monkeypatch, dummy_text):
+    opened = []
+
+    class DummyWorksheet:
+        def __init__(self):
+            self.rows = []
+            self.fail = False
+        def row_values(self, row): return ["Timestamp"]
+        def append_row(self, row):
+            if self.fail:
+                raise RuntimeError("시트 삭제됨")
+            self.rows.append(row)
+
+    class DummySheet:
+        url = "https://docs.google.com/dummy"
+        def get_worksheet(self, idx):
+            opened.append(DummyWorksheet())
+            return opened[-1]
+
+    class DummyClient:
+        def open_by_key(self, key): return DummySheet()
+
+    monkeypatch.setattr(sheet, "_worksheet", None)
+    monkeypatch.setattr(sheet, "_sheet_url", None)
+    monkeypatch.setattr(sheet.Credentials, "from_service_account_file", lambda *args, **kwargs: None)
+    monkeypatch.setattr(sheet.gspread, "authorize", lambda creds: DummyClient())
+
+    assert save_to_sheet("user1", dummy_text, "요약 1") == "https://docs.google.com/dummy"
+    save_to_sheet("user1", dummy_text, "요약 2")
+    assert len(opened) == 1 and len(opened[0].rows) == 2
+
+    # 추가에 실패하면 다음 호출에서 시트를 다시 엶
+    opened[0].fail = True
+    with pytest.raises(RuntimeError):
+        save_to_sheet("user1", dummy_text, "요약 3")
+    save_to_sheet("user1", dummy_text, "요약 4")
+    assert len(opened) == 2 and opened[1].rows[0][3] == "요약 4"
@@ -0,0 +1,24 @@
+import asyncio
+import time
+from core.loop_monitor import LoopMonitor
+
+
+def test_blocking_call_is_recorded_with_its_call_site():
+    monitor = LoopMonitor(interval=0.02, threshold=0.05)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)  # 루프를 막는 동기 호출
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(scenario())
+
+    (stall,) = [stall for stall in snapshot["stalls"] if stall["call_site"] != "unknown"]
+    # 감시 스레드가 막힌 동안 잡은 스택의 가장 안쪽 프로젝트 프레임
+    assert stall["call_site"].startswith("test/test_loop_monitor.py:")
+    assert stall["call_site"].endswith("in scenario")
+    assert stall["duration"] >= 0.2
+    assert snapshot["max_lag"] >= 0.2 and not snapshot["blocked_now"]
@@ -0,0 +1,75 @@
+import pytest
+from core.metrics_window import CountWindow, RollingWindow, SkillMetrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_rolling_window_expires_old_slots(clock):
+    window = RollingWindow(60, clock)
+    for _ in range(10):
+        window.add("events")
+    window.add("errors", 2)
+    assert window.rate("errors") == pytest.approx(0.2)
+
+    # 30초 후 이벤트 추가 → 아직 창 안
+    clock.now += 30
+    for _ in range(10):
+        window.add("events")
+    assert window.total("events") == 20
+    assert window.rate("errors") == pytest.approx(0.1)
+
+    # 처음 기록한 슬롯이 창 밖으로 밀려남
+    clock.now += 31
+    assert window.total("events") == 10
+    assert window.total("errors") == 0
+
+    # 창 크기보다 오래 지나면 전부 비워짐
+    clock.now += 600
+    assert window.total("events") == 0
+    assert window.rate("errors") is None
+
+
+def test_rolling_window_percentile(clock):
+    window = RollingWindow(300, clock)
+    for _ in range(95):
+        window.observe_duration(1.0)
+    for _ in range(5):
+        window.observe_duration(30.0)
+
+    p50 = window.percentile(0.5)
+    p99 = window.percentile(0.99)
+    # 버킷 상한 기준이므로 실제 값 이상, 약 1.42배 이하
+    assert 1.0 <= p50 <= 1.42
+    assert 30.0 <= p99 <= 30.0 * 1.42
+    assert window.sample_count() == 100
+
+
+def test_count_window_keeps_last_n():
+    window = CountWindow(3)
+    assert window.mean() is None
+    for value in (1, 1, 0, 0):
+        window.add(value)
+    assert len(window) == 3
+    assert window.mean() == pytest.approx(1 / 3)
+
+
+def test_skill_metrics_snapshot(clock):
+    metrics = SkillMetrics([60, 300], [("positive", 2)], clock)
+    metrics.record(success=True, duration=0.5, values={"positive": 1})
+    metrics.record(success=False, values={"positive": 0})
+
+    snapshot = metrics.snapshot()
+    assert snapshot["60s"]["events"] == 2
+    assert snapshot["300s"]["error_rate"] == pytest.approx(0.5)
+    assert snapshot["last_2_positive"]["mean"] == pytest.approx(0.5)
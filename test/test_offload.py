@@ -0,0 +1,68 @@
+import asyncio
+import contextvars
+import threading
+import time
+import pytest
+import utils.offload as offload
+from core.deadline import DeadlineExceeded, deadline_scope
+from utils.offload import get_pool, run_blocking
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_pools(monkeypatch):
+    monkeypatch.setattr(offload, "_pools", {})
+    monkeypatch.setattr(offload, "_inflight", {})
+    yield
+    offload.shutdown_pools()
+
+
+def test_pool_sizes_from_env(monkeypatch):
+    monkeypatch.setenv("OFFLOAD_POOL_SIZES", "sheets=8, slack=0,broken,reports=3")
+    sizes = offload._load_pool_sizes()
+
+    assert sizes["sheets"] == 8
+    assert sizes["slack"] == 1  # 최소 1
+    assert sizes["reports"] == 3
+    assert sizes["sqlite"] == offload.DEFAULT_POOL_SIZES["sqlite"]
+    assert "broken" not in sizes
+
+    monkeypatch.setattr(offload, "POOL_SIZES", sizes)
+    assert get_pool("reports")._max_workers == 3
+    assert get_pool("unlisted")._max_workers == sizes["default"]
+    assert offload.pool_stats()["reports"] == {"max_workers": 3, "inflight": 0}
+
+
+def test_run_blocking_copies_context_and_uses_named_pool():
+    def work():
+        return request_id.get(), threading.current_thread().name
+
+    async def scenario():
+        request_id.set("req-1")
+        return await run_blocking("sheets", work)
+
+    value, thread_name = asyncio.run(scenario())
+    assert value == "req-1"
+    assert thread_name.startswith("offload-sheets")
+
+
+def test_run_blocking_respects_deadline():
+    calls = []
+
+    async def scenario():
+        # 예산을 이미 다 썼으면 스레드에 보내지 않음
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                await run_blocking("default", calls.append, 1)
+        # 예산이 끝나면 작업을 더 기다리지 않음
+        started = time.monotonic()
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await run_blocking("default", time.sleep, 0.5)
+        return time.monotonic() - started
+
+    waited = asyncio.run(scenario())
+    assert calls == []
+    assert waited < 0.4
+    assert offload.pool_stats()["default"]["inflight"] == 0
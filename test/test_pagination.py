@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from db.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    row = {"id": "00000001-0000-0000-0000-000000000000", "created_at": "2025-03-01T09:00:00.123456+00:00"}
+    assert decode_cursor(encode_cursor(row)) == (row["created_at"], row["id"])
+    assert decode_cursor(None) is None
+    # PostgREST 는 초 소수부 끝의 0 을 빼고 보냄
+    trimmed = {"id": row["id"], "created_at": "2025-03-01T09:00:00.12345+00:00"}
+    assert decode_cursor(encode_cursor(trimmed)) == (trimmed["created_at"], trimmed["id"])
+
+
+@pytest.mark.parametrize("cursor", [
+    "zz", "bm90IGpzb24", "WzFd",
+    encode_cursor({"id": "00000001-0000-0000-0000-000000000000", "created_at": "어제"}),
+    encode_cursor({"id": "1 or 1=1", "created_at": "2025-03-01T09:00:00+00:00"}),
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_invalid_cursor_is_a_bad_request(monkeypatch):
+    import api.feedback as feedback_api
+    from db.sqlite import SQLiteStorage
+    from models.feedback import UserCreate
+
+    storage = SQLiteStorage(":memory:")
+    user = asyncio.run(storage.create_user(UserCreate(name="tester")))
+    monkeypatch.setattr(feedback_api, "storage", storage)
+    app = FastAPI()
+    app.include_router(feedback_api.router, prefix="/feedback")
+
+    cursor = encode_cursor({"id": "abc", "created_at": "def"})
+    response = TestClient(app).get(f"/feedback/users/{user.id}", params={"cursor": cursor})
+    assert response.status_code == 400
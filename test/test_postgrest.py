@@ -0,0 +1,58 @@
+import asyncio
+import json
+import httpx
+import pytest
+from db.postgrest import AsyncPostgrest, PostgrestError
+
+
+def make_client(handler):
+    return AsyncPostgrest("https://example.supabase.co", "key", transport=httpx.MockTransport(handler))
+
+
+def test_select_builds_postgrest_query():
+    seen = {}
+
+    def handler(request):
+        seen["url"] = request.url
+        seen["apikey"] = request.headers["apikey"]
+        return httpx.Response(200, json=[{"id": 1}])
+
+    async def scenario():
+        client = make_client(handler)
+        query = (client.table("feedbacks").select("id,created_at")
+                 .gte("created_at", "2025-03-01").lte("created_at", "2025-03-31")
+                 .in_("user_id", ["a", "b"]).order("created_at", desc=True).limit(5))
+        result = await query.execute()
+        await client.aclose()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result.data == [{"id": 1}]
+    assert seen["url"].path == "/rest/v1/feedbacks"
+    params = seen["url"].params
+    assert params.get_list("created_at") == ["gte.2025-03-01", "lte.2025-03-31"]
+    assert params["user_id"] == 'in.("a","b")'
+    assert params["order"] == "created_at.desc"
+    assert params["limit"] == "5"
+    assert seen["apikey"] == "key"
+
+
+def test_insert_and_rpc_errors():
+    def handler(request):
+        if request.url.path.endswith("/rpc/feedback_stats"):
+            assert json.loads(request.content) == {"start_ts": "x"}
+            return httpx.Response(404, json={"code": "PGRST202", "message": "function not found"})
+        assert request.headers["Prefer"] == "return=representation"
+        return httpx.Response(201, json=json.loads(request.content))
+
+    async def scenario():
+        client = make_client(handler)
+        inserted = await client.table("users").insert([{"name": "a"}]).execute()
+        with pytest.raises(PostgrestError) as error:
+            await client.rpc("feedback_stats", {"start_ts": "x"}).execute()
+        await client.aclose()
+        return inserted, error.value
+
+    inserted, error = asyncio.run(scenario())
+    assert inserted.data == [{"name": "a"}]
+    assert error.status_code == 404 and error.code == "PGRST202"
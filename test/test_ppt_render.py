@@ -0,0 +1,27 @@
+import pytest
+from pptx import Presentation
+from core.ppt_render import DEFAULT_TEMPLATE, render_deck, template_path
+
+
+def _deck(*titles):
+    return {"slides": [{"title": title, "bullets": ["첫 항목", "둘째 항목"], "notes": ""} for title in titles]}
+
+
+def test_render_reuses_template_without_leftover_slides(tmp_path):
+    first, second = tmp_path / "first.pptx", tmp_path / "second.pptx"
+    render_deck(_deck("A", "B", "C"), str(first), DEFAULT_TEMPLATE)
+    render_deck(_deck("D"), str(second), DEFAULT_TEMPLATE)
+
+    assert [s.shapes.title.text for s in Presentation(str(first)).slides] == ["A", "B", "C"]
+    slides = list(Presentation(str(second)).slides)
+    assert [s.shapes.title.text for s in slides] == ["D"]
+    # 첫 항목이 빈 문단 뒤가 아니라 맨 앞에 들어감
+    assert [p.text for p in slides[0].placeholders[1].text_frame.paragraphs] == ["첫 항목", "둘째 항목"]
+
+
+def test_template_path_rejects_unknown_names(tmp_path):
+    assert template_path(DEFAULT_TEMPLATE, str(tmp_path)) is None
+    with pytest.raises(ValueError):
+        template_path("../secret", str(tmp_path))
+    with pytest.raises(ValueError):
+        template_path("corporate", str(tmp_path))
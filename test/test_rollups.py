@@ -0,0 +1,63 @@
+from datetime import date, datetime, time
+from db.rollups import build_rollup_deltas, day_chunks, merge_aggregates, split_at_watermark, split_full_days
+
+
+def test_build_rollup_deltas_groups_by_day_user_skill():
+    feedbacks = [
+        {"user_id": "u1", "skill": "summarizer", "emotion": "positive", "keywords": ["속도"], "created_at": "2025-03-01T09:00:00"},
+        {"user_id": "u1", "skill": "summarizer", "emotion": "negative", "keywords": ["속도", "정확도"], "created_at": "2025-03-01T18:00:00"},
+        {"user_id": "u1", "skill": None, "emotion": None, "keywords": None, "created_at": "2025-03-02T01:00:00"},
+    ]
+    deltas = {(d["day"], d["skill"]): d for d in build_rollup_deltas(feedbacks)}
+
+    first = deltas[("2025-03-01", "summarizer")]
+    assert first["total"] == 2
+    assert first["positive"] == 1 and first["negative"] == 1
+    assert first["keyword_counts"] == {"속도": 2, "정확도": 1}
+
+    second = deltas[("2025-03-02", "")]
+    assert second["total"] == 1
+    assert second["emotion_counts"] == {}
+
+    # 저장 후 태그만 채운 경우: 건수 없이 감정/키워드만 더함
+    (tagged,) = build_rollup_deltas([{**feedbacks[0], "keywords": []}], count=False)
+    assert (tagged["total"], tagged["positive"], tagged["emotion_counts"]) == (0, 1, {"positive": 1})
+
+
+def test_split_full_days_keeps_partial_edges_on_raw_rows():
+    # 날짜만 지정한 조회: 종료일 0시까지 → 종료일 당일은 원본 구간
+    full_days, edges = split_full_days(datetime(2025, 3, 1), datetime(2025, 3, 31))
+    assert full_days == (date(2025, 3, 1), date(2025, 3, 30))
+    assert edges == [(datetime(2025, 3, 31), datetime(2025, 3, 31))]
+
+    full_days, edges = split_full_days(datetime(2025, 3, 1, 12), datetime.combine(date(2025, 3, 3), time.max))
+    assert full_days == (date(2025, 3, 2), date(2025, 3, 3))
+    assert edges[0][0] == datetime(2025, 3, 1, 12)
+
+    full_days, edges = split_full_days(datetime(2025, 3, 1, 8), datetime(2025, 3, 1, 20))
+    assert full_days is None
+    assert edges == [(datetime(2025, 3, 1, 8), datetime(2025, 3, 1, 20))]
+
+
+def test_split_at_watermark_sends_days_before_backfill_to_raw_rows():
+    days = (date(2025, 3, 1), date(2025, 3, 30))
+    assert split_at_watermark(days, None) == (None, (datetime(2025, 3, 1), datetime.combine(date(2025, 3, 30), time.max)))
+    assert split_at_watermark(days, date(2025, 2, 1)) == (days, None)
+    assert split_at_watermark(days, date(2025, 3, 10)) == (
+        (date(2025, 3, 10), date(2025, 3, 30)),
+        (datetime(2025, 3, 1), datetime.combine(date(2025, 3, 9), time.max)),
+    )
+
+
+def test_merge_aggregates_and_day_chunks():
+    merged = merge_aggregates([
+        {"total_count": 2, "emotion_stats": {"positive": 2}, "skill_stats": {}, "keyword_stats": {"a": 1}},
+        {"total_count": 1, "emotion_stats": {"positive": 1}, "keyword_stats": {"a": 1, "b": 1}},
+    ], keyword_limit=10)
+    assert merged["total_count"] == 3
+    assert merged["emotion_stats"] == {"positive": 3}
+    assert [(item, count) for item, count, _ in merged["keyword_sketch"].top()] == [("a", 2), ("b", 1)]
+
+    chunks = day_chunks(date(2025, 1, 1), date(2025, 3, 5), days=31)
+    assert chunks[0] == (date(2025, 1, 1), date(2025, 1, 31))
+    assert chunks[-1][1] == date(2025, 3, 5)
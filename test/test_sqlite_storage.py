@@ -0,0 +1,61 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from db.sqlite import SQLiteStorage
+from models.feedback import FeedbackCreate, UserCreate
+
+
+def test_feedback_roundtrip_pages_and_stats():
+    async def scenario():
+        storage = SQLiteStorage(":memory:")
+        user = await storage.create_user(UserCreate(name="tester"))
+        feedbacks = [
+            FeedbackCreate(user_id=user.id, content=f"피드백 {i}", skill="ppt",
+                           emotion="positive" if i % 3 else "negative", keywords=["속도", f"k{i % 2}"])
+            for i in range(7)
+        ]
+        feedbacks.append(FeedbackCreate(user_id=uuid.uuid4(), content="모르는 사용자"))
+        result = await storage.create_feedbacks(feedbacks)
+
+        pages, cursor = [], None
+        while True:
+            page = await storage.get_user_feedback_page(user.id, limit=3, cursor=cursor, columns=["content"])
+            pages.append(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        now = datetime.utcnow()
+        stats = await storage.get_feedback_stats(now - timedelta(days=1), now + timedelta(days=1), user.id)
+        series = await storage.get_feedback_timeseries(now - timedelta(days=1), now + timedelta(days=1), "day")
+        await storage.aclose()
+        return result, pages, stats, series
+
+    result, pages, stats, series = asyncio.run(scenario())
+
+    assert result["inserted"] == 7
+    assert result["errors"] == [{"index": 7, "error": "존재하지 않는 사용자입니다."}]
+    assert [len(items) for items in pages] == [3, 3, 1]
+    assert pages[0][0].keys() == {"content"}
+
+    assert stats["total_count"] == 7
+    assert stats["emotion_stats"] == {"positive": 4, "negative": 3}
+    assert stats["keyword_top"][0] == {"keyword": "속도", "count": 7, "error": 0}
+    assert len(stats["recent_feedbacks"]) == 5
+    assert [point["total"] for point in series] == [0, 7, 0]
+
+
+def test_unknown_user_is_rejected():
+    async def scenario():
+        storage = SQLiteStorage(":memory:")
+        try:
+            await storage.create_feedback(FeedbackCreate(user_id=uuid.uuid4(), content="x"))
+        finally:
+            await storage.aclose()
+
+    try:
+        asyncio.run(scenario())
+    except ValueError as e:
+        assert "존재하지 않는 사용자" in str(e)
+    else:
+        raise AssertionError("ValueError 가 발생해야 합니다")
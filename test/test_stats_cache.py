@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime
+from db.stats_cache import StatsCache, make_key
+
+
+def test_concurrent_misses_compute_once():
+    cache = StatsCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"total_count": 3}
+
+    async def scenario():
+        key = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31))
+        entries = await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(10)))
+        again = await cache.get_or_compute(key, compute)
+        return entries, again
+
+    entries, again = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(entry.value == {"total_count": 3} for entry in entries)
+    assert again.etag == entries[0].etag
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_invalidate_only_covering_ranges():
+    cache = StatsCache()
+
+    async def compute():
+        return {"total_count": 1}
+
+    march_all = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31))
+    march_u1 = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31), "u1")
+    march_u2 = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31), "u2")
+    april_all = make_key(datetime(2025, 4, 1), datetime(2025, 4, 30))
+
+    async def fill():
+        for key in (march_all, march_u1, march_u2, april_all):
+            await cache.get_or_compute(key, compute)
+
+    asyncio.run(fill())
+    assert cache.invalidate(datetime(2025, 3, 15, 12), "u1") == 2
+    assert cache.get(march_all) is None
+    assert cache.get(march_u1) is None
+    assert cache.get(march_u2) is not None
+    assert cache.get(april_all) is not None
+
+
+def test_not_modified_by_etag_and_date():
+    cache = StatsCache()
+
+    async def compute():
+        return {"total_count": 1}
+
+    entry = asyncio.run(cache.get_or_compute(make_key(datetime(2025, 3, 1), datetime(2025, 3, 2)), compute))
+    headers = entry.headers()
+
+    assert entry.not_modified({"if-none-match": headers["ETag"]})
+    assert not entry.not_modified({"if-none-match": '"stale"'})
+    assert entry.not_modified({"if-modified-since": headers["Last-Modified"]})
+    assert not entry.not_modified({})
+
+
+def test_invalidate_many_scans_once_for_batch():
+    cache = StatsCache()
+
+    async def compute():
+        return {"total_count": 1}
+
+    u1 = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31), "u1")
+    u2 = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31), "u2")
+    u3 = make_key(datetime(2025, 3, 1), datetime(2025, 3, 31), "u3")
+
+    async def fill():
+        for key in (u1, u2, u3):
+            await cache.get_or_compute(key, compute)
+
+    asyncio.run(fill())
+    written = datetime(2025, 3, 10)
+    assert cache.invalidate_many([(written, "u1"), (written, "u2"), (written, "u1")]) == 2
+    assert cache.get(u3) is not None
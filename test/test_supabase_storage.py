@@ -0,0 +1,167 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+import httpx
+from db.postgrest import AsyncPostgrest
+from db.supabase import SupabaseClient
+from models.feedback import FeedbackCreate
+
+
+def test_bulk_insert_keeps_committed_chunks_when_one_chunk_times_out(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+    monkeypatch.setattr("db.supabase.FEEDBACK_BULK_CHUNK_SIZE", 2)
+    user_id = str(uuid.uuid4())
+    rollups = []
+
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/users"):
+            return httpx.Response(200, json=[{"id": user_id}])
+        if path.endswith("/rpc/apply_feedback_rollups"):
+            rollups.append(json.loads(request.content)["deltas"])
+            return httpx.Response(200, json=None)
+        rows = json.loads(request.content)
+        rows = rows if isinstance(rows, list) else [rows]
+        if any(row["content"] == "timeout" for row in rows):
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(201, json=rows)
+
+    async def scenario():
+        storage = SupabaseClient()
+        await storage.client.aclose()
+        storage.client = AsyncPostgrest("https://example.supabase.co", "key", transport=httpx.MockTransport(handler))
+        feedbacks = [
+            FeedbackCreate(user_id=user_id, content=content, emotion="positive")
+            for content in ["a", "b", "c", "timeout"]
+        ]
+        result = await storage.create_feedbacks(feedbacks)
+        await storage.aclose()
+        return result
+
+    result = asyncio.run(scenario())
+
+    assert result["inserted"] == 2
+    assert [error["index"] for error in result["errors"]] == [2, 3]
+    # 저장된 첫 묶음은 롤업에 반영
+    assert sum(delta["total"] for delta in rollups[0]) == 2
+
+
+def test_rollup_stats_use_raw_rows_before_the_backfill_watermark(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+    monkeypatch.setattr("db.supabase.FEEDBACK_STATS_MODE", "rollup")
+    watermark = [{"complete_from": None}]
+    calls = []
+
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/feedback_rollup_state"):
+            return httpx.Response(200, json=watermark)
+        if path.endswith("/feedbacks"):
+            return httpx.Response(200, json=[])
+        params = json.loads(request.content)
+        calls.append((path.rsplit("/", 1)[-1], params.get("start_day") or params["start_ts"]))
+        return httpx.Response(200, json={"total_count": 1, "emotion_stats": {"positive": 1}})
+
+    async def scenario():
+        storage = SupabaseClient()
+        await storage.client.aclose()
+        storage.client = AsyncPostgrest("https://example.supabase.co", "key", transport=httpx.MockTransport(handler))
+        results = []
+        for complete_from in (None, "2025-03-10"):
+            watermark[0]["complete_from"] = complete_from
+            storage._rollup_watermark = (float("-inf"), None)
+            calls.clear()
+            stats = await storage._compute_feedback_stats(datetime(2025, 3, 1), datetime(2025, 3, 31), None, 20)
+            results.append((stats["total_count"], sorted(calls)))
+        await storage.aclose()
+        return results
+
+    without_watermark, with_watermark = asyncio.run(scenario())
+
+    # 백필 전: 롤업을 쓰지 않고 원본에서만 집계
+    assert without_watermark == (2, [("feedback_stats", "2025-03-01T00:00:00"), ("feedback_stats", "2025-03-31T00:00:00")])
+    # 워터마크 이후 날짜만 롤업 합산
+    assert with_watermark == (3, [
+        ("feedback_rollup_stats", "2025-03-10"),
+        ("feedback_stats", "2025-03-01T00:00:00"),
+        ("feedback_stats", "2025-03-31T00:00:00"),
+    ])
+
+
+def _stats_storage(monkeypatch, handler):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+    monkeypatch.setattr("db.supabase.FEEDBACK_STATS_MODE", "rpc")
+    storage = SupabaseClient()
+    asyncio.run(storage.client.aclose())
+    storage.client = AsyncPostgrest("https://example.supabase.co", "key", transport=httpx.MockTransport(handler))
+    return storage
+
+
+def test_stats_rpc_path(monkeypatch):
+    requests = []
+    recent = [{"id": "1", "user_id": "u", "content": "좋아요", "skill": "ppt", "emotion": "positive",
+               "keywords": ["속도"], "created_at": "2025-03-02T10:00:00"}]
+
+    def handler(request):
+        requests.append((request.url.path, request.url.params.get("order")))
+        if request.url.path.endswith("/rpc/feedback_stats"):
+            assert json.loads(request.content)["p_keyword_limit"] >= 20
+            return httpx.Response(200, json={
+                "total_count": 4, "emotion_stats": {"positive": 3, "negative": 1},
+                "skill_stats": {"ppt": 4}, "keyword_stats": {"속도": 3, "정확도": 1},
+            })
+        return httpx.Response(200, json=recent)
+
+    storage = _stats_storage(monkeypatch, handler)
+
+    async def scenario():
+        stats = await storage._compute_feedback_stats(datetime(2025, 3, 1), datetime(2025, 3, 31), None, 20)
+        await storage.aclose()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    # 집계는 DB 함수, 최근 피드백은 정렬/제한 쿼리 하나
+    assert sorted(requests) == [("/rest/v1/feedbacks", "created_at.desc"), ("/rest/v1/rpc/feedback_stats", None)]
+    assert stats["total_count"] == 4 and stats["positive_rate"] == 0.75
+    assert stats["keyword_stats"] == {"속도": 3, "정확도": 1}
+    assert stats["recent_feedbacks"] == recent
+
+
+def test_stats_fall_back_to_scan_and_remember_missing_rpc(monkeypatch):
+    requests = []
+    rows = [
+        {"id": str(i), "user_id": "u", "content": "c", "skill": "ppt", "emotion": emotion,
+         "keywords": ["속도"], "created_at": f"2025-03-0{i + 1}T10:00:00"}
+        for i, emotion in enumerate(["positive", "negative", "positive", None])
+    ]
+
+    def handler(request):
+        requests.append(request.url.path)
+        if "/rpc/" in request.url.path:
+            return httpx.Response(404, json={"code": "PGRST202", "message": "Could not find the function"})
+        return httpx.Response(200, json=rows)
+
+    storage = _stats_storage(monkeypatch, handler)
+
+    async def scenario():
+        first = await storage._compute_feedback_stats(datetime(2025, 3, 1), datetime(2025, 3, 31), None, 20)
+        calls = len(requests)
+        second = await storage._compute_feedback_stats(datetime(2025, 3, 1), datetime(2025, 3, 31), None, 20)
+        await storage.aclose()
+        return first, second, calls
+
+    first, second, first_calls = asyncio.run(scenario())
+
+    assert requests[:first_calls].count("/rest/v1/rpc/feedback_stats") == 1
+    # 두 번째 조회는 없는 함수를 다시 부르지 않고 바로 전체 조회
+    assert requests[first_calls:] == ["/rest/v1/feedbacks"]
+    for stats in (first, second):
+        assert stats["total_count"] == 4
+        assert stats["emotion_stats"] == {"positive": 2, "negative": 1}
+        assert stats["keyword_stats"] == {"속도": 4}
+        assert [row["id"] for row in stats["recent_feedbacks"]] == ["3", "2", "1", "0"]
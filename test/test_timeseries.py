@@ -0,0 +1,31 @@
+from datetime import datetime
+from db.timeseries import bucket_count, bucket_feedbacks, bucket_start, build_series
+
+
+def test_bucket_start_and_count():
+    assert bucket_start("2025-03-05T13:45:00+00:00", "hour") == datetime(2025, 3, 5, 13)
+    assert bucket_start(datetime(2025, 3, 5, 13, 45), "day") == datetime(2025, 3, 5)
+    # 2025-03-05 는 수요일 → 월요일 3월 3일
+    assert bucket_start(datetime(2025, 3, 5, 13, 45), "week") == datetime(2025, 3, 3)
+    assert bucket_count(datetime(2025, 3, 1), datetime(2025, 3, 31, 23), "day") == 31
+    # PostgREST 는 소수부 끝의 0 을 빼고 보냄 (Python 3.9 fromisoformat 은 3/6자리만 허용)
+    assert bucket_start("2025-03-05T23:59:59.12345+09:00", "hour") == datetime(2025, 3, 5, 14)
+    assert bucket_start("2025-03-05T13:45:00.1Z", "day") == datetime(2025, 3, 5)
+
+
+def test_single_pass_buckets_with_zero_fill():
+    rows = [
+        {"created_at": "2025-03-01T09:00:00", "skill": "summarize", "emotion": "positive"},
+        {"created_at": "2025-03-01T18:00:00", "skill": "summarize", "emotion": "negative"},
+        {"created_at": "2025-03-03T10:00:00", "skill": None, "emotion": "positive"},
+    ]
+    points = bucket_feedbacks(rows, "day")
+    series = build_series(points, datetime(2025, 3, 1), datetime(2025, 3, 3, 23, 59), "day")
+
+    assert [point["total"] for point in series] == [2, 0, 1]
+    assert series[0]["positive_rate"] == 0.5
+    assert series[0]["skills"] == {"summarize": 2}
+    assert series[1]["bucket"] == "2025-03-02T00:00:00"
+
+    sparse = build_series(points, datetime(2025, 3, 1), datetime(2025, 3, 3), "day", fill_gaps=False)
+    assert [point["total"] for point in sparse] == [2, 1]
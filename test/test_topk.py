@@ -0,0 +1,44 @@
+import random
+from collections import Counter
+from core.topk import SpaceSaving
+
+
+def _stream(n, seed):
+    rng = random.Random(seed)
+    # 소수의 인기 키워드 + 긴 꼬리
+    return [f"hot{rng.randint(0, 4)}" if rng.random() < 0.5 else f"tail{rng.randint(0, 500)}" for _ in range(n)]
+
+
+def test_counts_stay_within_error_bounds():
+    items = _stream(5000, seed=1)
+    truth = Counter(items)
+    sketch = SpaceSaving(50)
+    sketch.update(items)
+
+    assert len(sketch) <= 50
+    for item, count, error in sketch.top():
+        assert count - error <= truth[item] <= count
+    assert {item for item, _, _ in sketch.top(5)} == {f"hot{i}" for i in range(5)}
+
+
+def test_merge_of_truncated_parts_keeps_bounds():
+    parts = [_stream(2000, seed=s) for s in range(4)]
+    truth = Counter(item for part in parts for item in part)
+
+    merged = SpaceSaving(40)
+    for part in parts:
+        counts = dict(Counter(part).most_common(40))
+        merged.merge(SpaceSaving.from_counts(counts, capacity=40, truncated=True))
+
+    for item, count, error in merged.top():
+        assert count - error <= truth[item] <= count
+    assert merged.total <= sum(truth.values())
+    assert {item for item, _, _ in merged.top(5)} == {f"hot{i}" for i in range(5)}
+
+
+def test_dict_round_trip():
+    sketch = SpaceSaving(3)
+    sketch.update(["a", "a", "b", "c", "d", "a"])
+    restored = SpaceSaving.from_dict(sketch.to_dict())
+    assert restored.top() == sketch.top()
+    assert restored.bound() == sketch.bound()
@@ -0,0 +1,121 @@
+import asyncio
+import contextvars
+import pytest
+import core.tracing as tracing
+from core.tracing import current_trace_id, start_span
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.exported = []
+
+    def export(self, spans):
+        self.exported.append(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = RecordingExporter()
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(tracing, "TRACE_TAIL_LATENCY_MS", 60_000)
+    return exporter
+
+
+def test_nested_spans_share_the_trace(exporter):
+    with start_span("root", trace_id="a" * 32) as root:
+        with start_span("child", step=1) as child:
+            with start_span("grandchild") as grandchild:
+                assert current_trace_id() == "a" * 32
+        assert tracing.current_span() is root
+    assert tracing.current_span() is None
+
+    assert exporter.exported == [[root, child, grandchild]]
+    assert root.parent_id is None
+    assert child.parent_id == root.span_id and grandchild.parent_id == child.span_id
+    assert {span.trace_id for span in (root, child, grandchild)} == {"a" * 32}
+
+
+def test_head_and_tail_sampling(exporter, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 0.0)
+    with start_span("dropped"):
+        pass
+    assert exporter.exported == []
+
+    # 헤드 샘플링에서 빠져도 오류가 난 트레이스는 보관
+    with pytest.raises(RuntimeError):
+        with start_span("failed"):
+            with start_span("step"):
+                raise RuntimeError("boom")
+    # 느린 트레이스도 보관
+    monkeypatch.setattr(tracing, "TRACE_TAIL_LATENCY_MS", 0)
+    with start_span("slow"):
+        pass
+
+    assert [[span.name for span in spans] for spans in exporter.exported] == [["failed", "step"], ["slow"]]
+    assert exporter.exported[0][1].error == "RuntimeError: boom"
+
+
+def test_detached_and_late_spans(exporter):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def body():
+            # 스트리밍 응답 본문처럼 루트 스팬이 끝난 뒤에도 이어지는 작업
+            with start_span("body"):
+                await release.wait()
+                with start_span("after_root"):
+                    pass
+
+        with start_span("root") as root:
+            task = asyncio.ensure_future(body())
+            context = contextvars.copy_context()
+            await asyncio.sleep(0)
+        # 끝나지 않은 스팬은 빼고 내보냄
+        assert [[span.name for span in spans] for spans in exporter.exported] == [["root"]]
+
+        # 끝난 루트 아래에서 새로 시작한 스팬은 같은 트레이스 ID 로 따로 모아 끝날 때 내보냄
+        def detached():
+            with start_span("detached") as span:
+                with start_span("inner"):
+                    pass
+            return span
+
+        span = context.run(detached)
+        assert span.trace_id == root.trace_id and span.parent_id == root.span_id
+
+        release.set()
+        await task
+        return root
+
+    root = asyncio.run(scenario())
+
+    names = [[span.name for span in spans] for spans in exporter.exported]
+    assert names == [["root"], ["detached", "inner"], ["after_root"], ["body"]]
+    assert all(span.trace_id == root.trace_id and span.end_ns for spans in exporter.exported for span in spans)
+
+
+def test_otlp_payload_shape(exporter):
+    with start_span("root", trace_id="b" * 32, count=3, ratio=0.5, ok=True, label="x"):
+        with pytest.raises(ValueError):
+            with start_span("child"):
+                raise ValueError("bad")
+
+    payload = tracing._otlp_payload(exporter.exported[0])
+    (resource_spans,) = payload["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": tracing.SERVICE_NAME}}
+    ]
+    root, child = resource_spans["scopeSpans"][0]["spans"]
+    assert root["traceId"] == "b" * 32 and "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+    assert root["attributes"] == [
+        {"key": "count", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "label", "value": {"stringValue": "x"}},
+    ]
+    assert root["status"] == {"code": 1}
+    assert child["status"] == {"code": 2, "message": "ValueError: bad"}
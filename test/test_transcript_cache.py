@@ -0,0 +1,30 @@
+import asyncio
+from core.transcript_cache import TranscriptCache
+
+
+def test_hit_by_hash_model_language_and_size_eviction(tmp_path):
+    cache = TranscriptCache(path=str(tmp_path / "transcripts.db"), max_bytes=300)
+    value = {"results": [{"index": 0, "text": "가" * 20}], "duration": 3.0}
+
+    async def scenario():
+        await cache.put("a" * 64, "base", None, value)
+        assert await cache.get("a" * 64, "base", None) == value
+        # 모델이나 언어가 다르면 다른 항목
+        assert await cache.get("a" * 64, "small", None) is None
+        assert await cache.get("a" * 64, "base", "ko") is None
+
+        # 크기 제한을 넘으면 가장 오래 안 쓴 항목부터 삭제
+        await cache.put("b" * 64, "base", None, value)
+        await cache.get("a" * 64, "base", None)
+        await cache.put("c" * 64, "base", None, value)
+        return [await cache.get(h * 64, "base", None) is not None for h in "abc"]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.evictions == 1
+    cache.close()
+
+    # 다시 열어도 남아 있음
+    reopened = TranscriptCache(path=str(tmp_path / "transcripts.db"), max_bytes=300)
+    assert asyncio.run(reopened.get("c" * 64, "base", None)) == value
+    reopened.close()
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import core.transcription as transcription
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.transcription import TranscriptionBusy, TranscriptionPool, UnknownTier, select_tier
+from core.transcription_eval import character_error_rate, word_error_rate
+
+
+def test_rejects_when_queue_is_full():
+    pool = TranscriptionPool(workers=1, queue_size=1)
+    # 워커 프로세스를 띄우지 않고 대기열이 찬 상태만 만듦
+    pool.inflight = pool.capacity
+
+    with pytest.raises(TranscriptionBusy):
+        asyncio.run(pool.transcribe("memo.wav"))
+    assert pool.rejected == 1
+    assert pool._executor is None
+
+
+def test_timed_out_job_holds_its_slot_until_the_worker_finishes(monkeypatch):
+    pool = TranscriptionPool(workers=1, queue_size=0)
+    release = threading.Event()
+    # 프로세스 대신 스레드 풀로, 풀려날 때까지 끝나지 않는 워커를 흉내냄
+    monkeypatch.setattr(transcription, "_transcribe", lambda *args: release.wait(5) and {"segments": []})
+    monkeypatch.setattr(pool, "_get_executor", lambda: ThreadPoolExecutor(1))
+
+    async def scenario():
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await pool.transcribe("memo.wav")
+        # 기다리기만 그만뒀을 뿐 워커는 아직 돌고 있으므로 자리를 차지함
+        assert pool.inflight == 1
+        with pytest.raises(TranscriptionBusy):
+            await pool.transcribe("memo.wav")
+        release.set()
+        for _ in range(100):
+            if pool.inflight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_select_tier_prefers_request_then_duration_rules():
+    tiers = {"tiny": "whisper:tiny", "base": "whisper:base", "small-int8": "faster-whisper:small:int8"}
+    rules = [(120, "small-int8"), (float("inf"), "tiny")]
+
+    assert select_tier("base", 30, tiers, rules, "base") == "base"
+    assert select_tier(None, 30, tiers, rules, "base") == "small-int8"
+    assert select_tier(None, 3600, tiers, rules, "base") == "tiny"
+    assert select_tier(None, None, tiers, rules, "base") == "base"
+    with pytest.raises(UnknownTier):
+        select_tier("large", 30, tiers, rules, "base")
+
+
+def test_word_error_rate():
+    assert word_error_rate("오늘 회의는 세 시에 시작합니다", "오늘 회의는 세시에 시작합니다.") == 0.4
+    assert character_error_rate("오늘 회의는 세 시에 시작합니다", "오늘 회의는 세시에 시작합니다.") == 0.0
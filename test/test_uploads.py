@@ -0,0 +1,77 @@
+import asyncio
+import hashlib
+import pytest
+from utils.uploads import (
+    MalformedUpload, UploadOffsetMismatch, UploadSessions, UploadTooLarge, open_multipart_file, safe_suffix, spool_stream
+)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_resumable_upload_keeps_offset_and_hash(tmp_path):
+    sessions = UploadSessions(directory=str(tmp_path), max_bytes=100)
+
+    async def scenario():
+        upload_id = sessions.create("memo.M4A", length=10)
+        assert await sessions.append(upload_id, 0, _chunks(b"hello")) == 5
+
+        # 위치가 어긋난 조각은 거절하고 현재 위치를 알려 줌
+        with pytest.raises(UploadOffsetMismatch) as exc:
+            await sessions.append(upload_id, 0, _chunks(b"hello"))
+        assert exc.value.offset == 5
+
+        # 선언한 크기를 넘는 조각은 버리고 위치는 그대로
+        with pytest.raises(UploadTooLarge):
+            await sessions.append(upload_id, 5, _chunks(b"world!"))
+        assert sessions.status(upload_id)["offset"] == 5
+
+        await sessions.append(upload_id, 5, _chunks(b"wor", b"ld"))
+        return await sessions.complete(upload_id)
+
+    upload = asyncio.run(scenario())
+    assert upload.size == 10
+    assert upload.sha256 == hashlib.sha256(b"helloworld").hexdigest()
+    assert upload.path.endswith(".m4a")
+    upload.cleanup()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spool_rejects_oversized_stream_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.uploads.UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("utils.uploads.upload_sessions", UploadSessions(directory=str(tmp_path)))
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_stream(_chunks(b"a" * 6, b"b" * 6), ".wav", max_bytes=10))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_multipart_file_is_streamed_without_buffering(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.uploads.UPLOAD_DIR", str(tmp_path))
+    boundary = "xyz"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"user\"\r\n\r\nu1\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"memo.wav\"\r\n"
+        f"Content-Type: audio/wav\r\n\r\n"
+    ).encode() + b"RIFF" * 1000 + f"\r\n--{boundary}--\r\n".encode()
+    content_type = f"multipart/form-data; boundary={boundary}"
+
+    async def scenario():
+        # 작은 조각으로 나눠 보내도 경계/헤더가 조각 사이에 걸쳐 있어도 처리
+        filename, chunks = await open_multipart_file(_chunks(*(body[i:i + 7] for i in range(0, len(body), 7))), content_type)
+        upload = await spool_stream(chunks, safe_suffix(filename))
+
+        # 받는 도중에 크기 제한으로 거절 (Content-Length 없음)
+        with pytest.raises(UploadTooLarge):
+            _, chunks = await open_multipart_file(_chunks(body), content_type, max_bytes=10)
+            await spool_stream(chunks, max_bytes=10)
+        with pytest.raises(MalformedUpload):
+            await open_multipart_file(_chunks(body.replace(b'name="file"', b'name="other"')), content_type)
+        return filename, upload
+
+    filename, upload = asyncio.run(scenario())
+    assert filename == "memo.wav" and upload.path.endswith(".wav")
+    assert open(upload.path, "rb").read() == b"RIFF" * 1000
+    assert upload.sha256 == hashlib.sha256(b"RIFF" * 1000).hexdigest()
@@ -0,0 +1,35 @@
+from db.user_cache import KnownUserCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_known_users_expire_and_evict():
+    clock = FakeClock()
+    cache = KnownUserCache(max_entries=2, ttl=10, clock=clock)
+    cache.add("a")
+    cache.add("b")
+    assert "a" in cache
+
+    # a 를 최근 사용했으므로 b 가 밀려남
+    cache.add("c")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+    clock.now += 11
+    assert "a" not in cache
+    assert len(cache) == 1
+
+
+def test_discard_removes_deleted_user():
+    cache = KnownUserCache()
+    cache.add("a")
+    cache.discard("a")
+    cache.discard("missing")
+    assert "a" not in cache
+    assert cache.snapshot()["misses"] == 1
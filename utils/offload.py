@@ -0,0 +1,101 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+from config.logger import logger
+from core.deadline import check_deadline, with_deadline
+
+T = TypeVar("T")
+
+# 연동 대상별 기본 스레드 풀 크기. 느린 연동이 다른 연동의 스레드를 잡아먹지 않도록 분리
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    "sheets": 4,
+    "slack": 4,
+    "sqlite": 1,
+    "audio": 2,
+    "uploads": 4,
+    "transcripts": 1,
+    "artifacts": 2,
+    "tagging": 1,
+    "default": 8,
+}
+
+
+def _load_pool_sizes() -> Dict[str, int]:
+    """OFFLOAD_POOL_SIZES="sheets=8,slack=2" 형식의 환경 변수로 기본값을 덮어씁니다."""
+    sizes = dict(DEFAULT_POOL_SIZES)
+    raw = os.getenv("OFFLOAD_POOL_SIZES", "")
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        try:
+            name, size = item.split("=", 1)
+            sizes[name.strip()] = max(1, int(size))
+        except ValueError:
+            logger.warning("잘못된 OFFLOAD_POOL_SIZES 항목 무시: %s", item)
+    return sizes
+
+
+POOL_SIZES = _load_pool_sizes()
+
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_inflight: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def get_pool(name: str) -> ThreadPoolExecutor:
+    """이름에 해당하는 스레드 풀을 반환합니다 (처음 사용할 때 생성)."""
+    pool = _pools.get(name)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(name)
+            if pool is None:
+                size = POOL_SIZES.get(name, POOL_SIZES["default"])
+                pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"offload-{name}")
+                _pools[name] = pool
+                _inflight[name] = 0
+    return pool
+
+
+async def run_blocking(pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    동기(블로킹) 함수를 연동별 스레드 풀에서 실행하고 결과를 기다립니다.
+
+    호출 시점의 contextvars 를 그대로 복사해 전달하므로 요청 단위 상태가 유지됩니다.
+    요청의 남은 시간 예산이 지나면 결과를 더 기다리지 않고 DeadlineExceeded 를 발생시킵니다
+    (이미 시작된 스레드 작업 자체는 중단되지 않습니다).
+
+    Args:
+        pool: 스레드 풀 이름 (sheets, slack, sqlite, audio ...)
+        func: 실행할 동기 함수
+    """
+    check_deadline(pool)
+
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+
+    executor = get_pool(pool)
+    _inflight[pool] += 1
+    try:
+        return await with_deadline(loop.run_in_executor(executor, call), pool)
+    finally:
+        _inflight[pool] -= 1
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """풀별 크기와 실행/대기 중인 작업 수"""
+    return {
+        name: {"max_workers": POOL_SIZES.get(name, POOL_SIZES["default"]), "inflight": _inflight.get(name, 0)}
+        for name in _pools
+    }
+
+
+def shutdown_pools(wait: bool = False) -> None:
+    """모든 스레드 풀을 종료합니다 (앱 종료 시)."""
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        _pools.clear()
+        _inflight.clear()
@@ -1,15 +1,74 @@
 import os
+import threading
+from typing import Optional
 import gspread
 from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
 from datetime import datetime
 from config.logger import logger
+from core.tracing import start_span
+from utils.offload import run_blocking
 
 load_dotenv()
 
+# 인증한 시트/워크시트를 재사용 (매 호출마다 인증하고 헤더 행을 읽지 않도록)
+_lock = threading.Lock()
+_worksheet = None
+_sheet_url: Optional[str] = None
+
+
+def _open_worksheet():
+    """요약 결과 워크시트를 반환합니다 (처음 호출 시 인증하고 시트를 열거나 만듦, 블로킹)."""
+    global _worksheet, _sheet_url
+    with _lock:
+        if _worksheet is not None:
+            return _worksheet
+
+        SCOPES = [
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+        
+        creds = Credentials.from_service_account_file(
+            os.getenv('GOOGLE_SERVICE_ACCOUNT_PATH'),
+            scopes=SCOPES
+        )
+        
+        client = gspread.authorize(creds)
+        
+        SHEET_KEY = os.getenv('GOOGLE_SHEET_KEY')
+        try:
+            sheet = client.open_by_key(SHEET_KEY)
+            logger.debug("기존 시트 열기 성공: %s", SHEET_KEY)
+        except Exception:
+            logger.info("기존 시트가 없어 새로 생성합니다")
+            sheet = client.create('Text Summary Results')
+            sheet.share('anyone', perm_type='user', role='reader')
+        
+        worksheet = sheet.get_worksheet(0) or sheet.add_worksheet('Summaries', 1000, 4)
+        
+        if worksheet.row_values(1) == []:
+            logger.debug("헤더 행 추가")
+            worksheet.append_row(['Timestamp', 'User ID', 'Original Text', 'Summary'])
+
+        _worksheet, _sheet_url = worksheet, sheet.url
+        return worksheet
+
+
+def _reset() -> None:
+    global _worksheet
+    with _lock:
+        _worksheet = None
+
+
+def known_sheet_url() -> Optional[str]:
+    """이미 연 시트의 URL (아직 열지 않았으면 None)"""
+    return _sheet_url
+
+
 def save_to_sheet(user_id: str, text: str, summary: str) -> str:
     """
-    텍스트 요약 결과를 Google Sheet에 저장합니다.
+    텍스트 요약 결과를 Google Sheet에 저장합니다 (블로킹).
     
     Args:
         user_id (str): 사용자 ID
@@ -20,36 +79,21 @@ def save_to_sheet(user_id: str, text: str, summary: str) -> str:
         str: 저장된 Google Sheet의 URL
     """
     logger.debug("Google Sheets 저장 시작")
+    worksheet = _open_worksheet()
     
-    SCOPES = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    
-    creds = Credentials.from_service_account_file(
-        os.getenv('GOOGLE_SERVICE_ACCOUNT_PATH'),
-        scopes=SCOPES
-    )
-    
-    client = gspread.authorize(creds)
-    
-    SHEET_KEY = os.getenv('GOOGLE_SHEET_KEY')
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     try:
-        sheet = client.open_by_key(SHEET_KEY)
-        logger.debug(f"기존 시트 열기 성공: {SHEET_KEY}")
+        worksheet.append_row([timestamp, user_id, text, summary])
     except Exception:
-        logger.info("기존 시트가 없어 새로 생성합니다")
-        sheet = client.create('Text Summary Results')
-        sheet.share('anyone', perm_type='user', role='reader')
+        # 인증 만료/시트 삭제 등일 수 있으므로 다음 호출에서 다시 염 (중복 기록을 피해 재시도는 하지 않음)
+        _reset()
+        raise
+    logger.debug("새로운 행 추가 완료: %s", user_id)
     
-    worksheet = sheet.get_worksheet(0) or sheet.add_worksheet('Summaries', 1000, 4)
-    
-    if worksheet.row_values(1) == []:
-        logger.debug("헤더 행 추가")
-        worksheet.append_row(['Timestamp', 'User ID', 'Original Text', 'Summary'])
-    
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    worksheet.append_row([timestamp, user_id, text, summary])
-    logger.debug(f"새로운 행 추가 완료: {user_id}")
-    
-    return sheet.url
+    return _sheet_url
+
+
+async def append_summary(user_id: str, text: str, summary: str) -> str:
+    """save_to_sheet 를 sheets 스레드 풀에서 실행합니다."""
+    with start_span("sheets.append_row", skill="logis_summarizer"):
+        return await run_blocking("sheets", save_to_sheet, user_id, text, summary)
@@ -3,7 +3,9 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from config.logger import logger
+from config.logger import logger, throttled
+from core.tracing import start_span
+from utils.offload import run_blocking
 
 class SheetWriter:
     def __init__(self):
@@ -39,7 +41,7 @@ class SheetWriter:
         try:
             # 기존 워크시트 찾기
             worksheet = self.spreadsheet.worksheet(skill_name)
-            logger.info(f"기존 워크시트 사용: {skill_name}")
+            logger.debug("기존 워크시트 사용: %s", skill_name)
             return worksheet
         except gspread.WorksheetNotFound:
             # 새 워크시트 생성
@@ -59,9 +61,26 @@ class SheetWriter:
                 "Error (if any)"
             ]
             worksheet.append_row(headers)
-            logger.info(f"새 워크시트 생성 완료: {skill_name}")
+            logger.info("새 워크시트 생성 완료: %s", skill_name)
             return worksheet
 
+    async def write_result(
+        self,
+        skill_name: str,
+        start_time: datetime,
+        result: Any,
+        user_id: Optional[str] = None
+    ):
+        """BaseSkill 실행 완료 결과를 시트에 기록"""
+        input_text = result.get("original_text", "") if isinstance(result, dict) else ""
+        await self.write_result_to_sheet(
+            skill_name=skill_name,
+            input_text=input_text or "",
+            output=result,
+            user_id=user_id,
+            duration=(datetime.utcnow() - start_time).total_seconds()
+        )
+
     async def write_result_to_sheet(
         self,
         skill_name: str,
@@ -73,8 +92,6 @@ class SheetWriter:
     ):
         """스킬 실행 결과를 시트에 기록"""
         try:
-            worksheet = self._get_or_create_worksheet(skill_name)
-            
             # 결과를 문자열로 변환
             if isinstance(output, (dict, list)):
                 output_str = str(output)
@@ -92,14 +109,20 @@ class SheetWriter:
                 str(error) if error else ""         # Error message
             ]
             
-            # 데이터 추가
-            worksheet.append_row(row_data)
-            logger.info(f"결과 기록 완료 - skill: {skill_name}, user: {user_id}")
+            # 데이터 추가 (gspread 호출은 sheets 스레드 풀에서 실행)
+            with start_span("sheets.append_row", skill=skill_name):
+                await run_blocking("sheets", self._append_row, skill_name, row_data)
+            logger.info("결과 기록 완료 - skill: %s, user: %s", skill_name, user_id, extra=throttled(20))
             
         except Exception as e:
             logger.error(f"결과 기록 중 오류 발생: {str(e)}")
             # 시트 기록 실패는 크리티컬하지 않으므로 예외를 전파하지 않음
-            
+
+    def _append_row(self, skill_name: str, row_data: List[str]) -> None:
+        """워크시트를 찾아 행을 추가합니다 (블로킹)."""
+        worksheet = self._get_or_create_worksheet(skill_name)
+        worksheet.append_row(row_data)
+
     async def get_skill_stats(
         self,
         skill_name: str,
@@ -108,10 +131,8 @@ class SheetWriter:
     ) -> Dict[str, Any]:
         """특정 스킬의 실행 통계를 조회"""
         try:
-            worksheet = self._get_or_create_worksheet(skill_name)
-            
             # 모든 데이터 가져오기
-            all_data = worksheet.get_all_records()
+            all_data = await run_blocking("sheets", self._get_all_records, skill_name)
             
             # 날짜 범위에 해당하는 데이터 필터링
             filtered_data = [
@@ -146,6 +167,10 @@ class SheetWriter:
             logger.error(f"통계 조회 중 오류 발생: {str(e)}")
             raise
 
+    def _get_all_records(self, skill_name: str) -> List[Dict[str, Any]]:
+        """워크시트의 전체 레코드를 읽습니다 (블로킹)."""
+        return self._get_or_create_worksheet(skill_name).get_all_records()
+
 # 전역 SheetWriter 인스턴스
 sheet_writer = None
 try:
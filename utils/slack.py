@@ -1,19 +1,73 @@
 import os
 import json
 import requests
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 from config.logger import logger
+from core.deadline import remaining
+from core.tracing import start_span
+from utils.offload import run_blocking
 
 load_dotenv()
 
-# ── SlackNotifier Stub ─────────────────────────────────────────────
 class SlackNotifier:
-    def __init__(self, *args, **kwargs):
-        pass
+    """Slack 웹후크 알림 전송기. HTTP 호출은 slack 전용 스레드 풀에서 실행합니다."""
 
-    def send(self, *args, **kwargs):
-        pass
-# ─────────────────────────────────────────────────────────────────────
+    def __init__(self, webhook_url: Optional[str] = None, *args, **kwargs):
+        self.webhook_url = webhook_url or os.getenv('SLACK_WEBHOOK_URL')
+
+    def send(self, payload: Dict[str, Any]) -> bool:
+        """페이로드를 동기 방식으로 전송합니다 (블로킹)."""
+        if not self.webhook_url:
+            logger.debug("SLACK_WEBHOOK_URL이 설정되지 않아 알림을 전송하지 않습니다")
+            return False
+
+        # 요청의 남은 시간 예산이 더 짧으면 그 안에서만 기다림
+        timeout = 10.0
+        left = remaining()
+        if left is not None:
+            timeout = max(min(timeout, left), 0.1)
+
+        try:
+            response = requests.post(
+                self.webhook_url,
+                data=json.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=timeout
+            )
+            if response.status_code != 200:
+                logger.error(f"Slack 전송 오류: {response.status_code}, 응답: {response.text}")
+                return False
+            return True
+        except Exception as e:
+            logger.error(f"Slack 전송 중 예외 발생: {str(e)}")
+            return False
+
+    async def send_message(self,
+                           text: str,
+                           channel: Optional[str] = None,
+                           username: Optional[str] = None,
+                           emoji: Optional[str] = None) -> bool:
+        """메시지를 전송합니다."""
+        payload: Dict[str, Any] = {"text": text}
+        if channel:
+            payload["channel"] = channel
+        if username:
+            payload["username"] = username
+        if emoji:
+            payload["icon_emoji"] = emoji
+        with start_span("slack.send_message", channel=channel or "default"):
+            return await run_blocking("slack", self.send, payload)
+
+    async def send_error_notification(self,
+                                      skill_name: str,
+                                      error_message: str,
+                                      context: Optional[Dict[str, Any]] = None) -> bool:
+        """스킬 오류 알림을 전송합니다."""
+        text = f"❌ *{skill_name}* 실행 실패\n```{error_message[:500]}```"
+        if context:
+            text += f"\n컨텍스트:\n```{str(context)[:500]}```"
+        return await self.send_message(text)
 
 
 def send_slack_notification(user_id: str, summary: str) -> None:
@@ -29,7 +83,7 @@ def send_slack_notification(user_id: str, summary: str) -> None:
         logger.warning("SLACK_WEBHOOK_URL이 설정되지 않아 알림을 전송하지 않습니다")
         return
 
-    logger.debug(f"Slack 알림 전송 시작 - user_id: {user_id}")
+    logger.debug("Slack 알림 전송 시작 - user_id: %s", user_id)
     payload = {"text": f"유저: {user_id}\n요약 결과: {summary}"}
     headers = {"Content-Type": "application/json"}
     
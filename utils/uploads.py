@@ -0,0 +1,422 @@
+"""
+업로드 파일을 메모리에 모으지 않고 디스크로 바로 받는 도구.
+
+- spool_stream: 청크 스트림을 임시 파일에 쓰면서 크기 제한과 SHA-256 을 함께 처리
+- open_multipart_file: multipart/form-data 본문을 받는 대로 파싱해 파일 필드의 바이트만 꺼냄
+- UploadSessions: 끊겨도 이어서 올릴 수 있는 분할 업로드 (모바일에서 긴 녹음 업로드용)
+
+분할 업로드 순서 (tus 프로토콜을 단순화한 형태):
+    1. 세션 생성 → upload_id
+    2. 현재 위치(offset)부터 조각 추가 (위치가 어긋나면 서버의 현재 위치를 돌려줌)
+    3. 연결이 끊기면 현재 위치를 조회해 그 지점부터 다시 보냄
+    4. 완료 → SpooledUpload (이후 처리는 일반 업로드와 같음)
+
+임시 파일과 세션은 UPLOAD_DIR 아래에 두고, UPLOAD_SESSION_TTL 이 지난 파일은
+주기적으로 지웁니다 (처리 도중 프로세스가 죽어 남은 파일 포함).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from config.logger import logger
+from utils.offload import run_blocking
+
+VOICE_UPLOAD_MAX_BYTES = int(os.getenv("VOICE_UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_DIR = os.getenv("UPLOAD_DIR") or os.path.join(tempfile.gettempdir(), "standard_ai_uploads")
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", "86400"))
+
+_PURGE_INTERVAL = 600  # 오래된 파일 정리 최소 간격 (초)
+_SUFFIX_PATTERN = re.compile(r"^\.[a-z0-9]{1,10}$")
+_SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기가 제한을 넘었을 때 발생합니다."""
+
+
+class MalformedUpload(ValueError):
+    """multipart 본문 형식이 잘못되었거나 파일 필드가 없을 때 발생합니다."""
+
+
+class UploadNotFound(LookupError):
+    """분할 업로드 세션이 없거나 만료되었을 때 발생합니다."""
+
+
+class UploadOffsetMismatch(Exception):
+    """분할 업로드 조각의 시작 위치가 서버에 저장된 위치와 다를 때 발생합니다."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"업로드 위치가 맞지 않습니다 (현재 위치: {offset}).")
+        self.offset = offset
+
+
+class SpooledUpload:
+    """디스크에 받아 둔 업로드 파일 (경로, 크기, SHA-256)"""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def cleanup(self) -> None:
+        Path(self.path).unlink(missing_ok=True)
+
+
+def safe_suffix(filename: Optional[str]) -> str:
+    """파일 이름에서 확장자만 꺼냅니다 (ffmpeg 형식 추정용, 경로 조작 방지를 위해 영숫자만 허용)."""
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if _SUFFIX_PATTERN.match(suffix) else ""
+
+
+async def _write_chunks(f, chunks: AsyncIterator[bytes], limit: int, hasher) -> int:
+    """청크를 파일에 쓰고 쓴 바이트 수를 반환합니다. limit 을 넘는 순간 UploadTooLarge."""
+    written = 0
+    async for chunk in chunks:
+        written += len(chunk)
+        if written > limit:
+            raise UploadTooLarge("업로드 크기 제한을 초과했습니다.")
+        await run_blocking("uploads", f.write, chunk)
+        hasher.update(chunk)
+    return written
+
+
+async def spool_stream(chunks: AsyncIterator[bytes],
+                       suffix: str = "",
+                       max_bytes: int = VOICE_UPLOAD_MAX_BYTES) -> SpooledUpload:
+    """
+    청크 스트림을 임시 파일로 받습니다. 실패하거나 크기를 넘으면 임시 파일을 지우고 예외를 다시 발생시킵니다.
+
+    Raises:
+        UploadTooLarge: max_bytes 를 넘은 경우 (넘는 순간 중단)
+    """
+    upload_sessions.purge_expired()
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=UPLOAD_DIR)
+    hasher = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            size = await _write_chunks(f, chunks, max_bytes, hasher)
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path, size, hasher.hexdigest())
+
+
+# multipart 경계/헤더와 다른 필드 몫으로 파일 크기 제한에 더 허용하는 본문 크기
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class _MultipartFileReader:
+    """
+    multipart/form-data 본문 스트림에서 파일 필드 하나를 찾아 그 내용만 조각으로 꺼냅니다.
+
+    본문은 받는 만큼만 파서에 넣으므로 전체를 메모리나 임시 파일에 모으지 않습니다.
+    다른 필드의 내용은 버리고, 본문 전체가 max_bytes 를 넘으면 UploadTooLarge 를 발생시킵니다.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], content_type: str, field: str, max_bytes: int):
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise MalformedUpload("multipart 경계(boundary)가 없습니다.")
+        self._chunks = chunks.__aiter__()
+        self._field = field.encode()
+        self._max_bytes = max_bytes
+        self._received = 0
+        self._finished = False
+        # 파서 콜백이 쌓는 이벤트: ("file", 파일 이름) / ("data", 바이트) / ("end", None)
+        self._events: Deque[Tuple[str, Any]] = deque()
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+        self._found = False
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if not self._found and options.get(b"name") == self._field and b"filename" in options:
+            self._found = self._in_file = True
+            self._events.append(("file", options[b"filename"].decode("utf-8", "replace")))
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._events.append(("data", data[start:end]))
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._events.append(("end", None))
+
+    async def _next_event(self) -> Optional[Tuple[str, Any]]:
+        """다음 이벤트 (본문이 끝났으면 None)"""
+        while not self._events:
+            if self._finished:
+                return None
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._finished = True
+                self._parser.finalize()
+                continue
+            self._received += len(chunk)
+            if self._received > self._max_bytes:
+                raise UploadTooLarge("업로드 크기 제한을 초과했습니다.")
+            try:
+                self._parser.write(chunk)
+            except MultipartParseError as e:
+                raise MalformedUpload(f"multipart 본문 형식이 잘못되었습니다: {e}")
+        return self._events.popleft()
+
+    async def find_file(self) -> str:
+        """파일 필드의 헤더까지 읽고 파일 이름을 반환합니다."""
+        while True:
+            event = await self._next_event()
+            if event is None:
+                raise MalformedUpload(f"{self._field.decode()} 필드가 필요합니다.")
+            if event[0] == "file":
+                return event[1]
+
+    async def file_chunks(self) -> AsyncIterator[bytes]:
+        """파일 필드의 내용 (find_file 이후)"""
+        while True:
+            event = await self._next_event()
+            if event is None:
+                raise MalformedUpload("multipart 본문이 파일 중간에서 끝났습니다.")
+            if event[0] == "end":
+                return
+            if event[1]:
+                yield event[1]
+
+
+async def open_multipart_file(chunks: AsyncIterator[bytes],
+                              content_type: str,
+                              field: str = "file",
+                              max_bytes: int = VOICE_UPLOAD_MAX_BYTES) -> Tuple[str, AsyncIterator[bytes]]:
+    """
+    multipart/form-data 본문 스트림에서 파일 필드를 찾아 (파일 이름, 내용 조각 스트림) 을 반환합니다.
+
+    Content-Length 없이(chunked) 보내도 받는 동안 크기 제한을 적용합니다.
+
+    사용 예:
+        filename, file_chunks = await open_multipart_file(request.stream(), content_type)
+        upload = await spool_stream(file_chunks, safe_suffix(filename))
+
+    Raises:
+        MalformedUpload: 경계가 없거나 형식이 잘못되었거나 파일 필드가 없는 경우
+        UploadTooLarge: 본문이 max_bytes + MULTIPART_OVERHEAD 를 넘은 경우
+    """
+    reader = _MultipartFileReader(chunks, content_type, field, max_bytes + MULTIPART_OVERHEAD)
+    filename = await reader.find_file()
+    return filename, reader.file_chunks()
+
+
+class UploadSessions:
+    """
+    디스크 기반 분할 업로드 세션.
+
+    세션마다 {id}.json (확장자, 선언된 전체 크기)과 {id}.part (지금까지 받은 바이트)를 두므로
+    현재 위치는 .part 파일 크기이고, 서버가 재시작되어도 이어서 올릴 수 있습니다.
+    SHA-256 은 조각을 받으면서 이어서 계산하고, 중간 상태가 없으면 완료 시 파일에서 다시 계산합니다.
+
+    Args:
+        directory: 세션 파일을 둘 디렉터리
+        max_bytes: 업로드 하나의 최대 크기
+        ttl: 마지막 조각 이후 이 시간(초)이 지난 세션은 삭제
+    """
+
+    def __init__(self,
+                 directory: str = UPLOAD_DIR,
+                 max_bytes: int = VOICE_UPLOAD_MAX_BYTES,
+                 ttl: int = UPLOAD_SESSION_TTL):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._hashers: Dict[str, Tuple[int, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_purge = 0.0
+
+    def _paths(self, upload_id: str) -> Tuple[Path, Path]:
+        if not _SESSION_ID_PATTERN.match(upload_id):
+            raise UploadNotFound(upload_id)
+        return self.directory / f"{upload_id}.json", self.directory / f"{upload_id}.part"
+
+    def _meta(self, upload_id: str) -> Tuple[Dict, Path]:
+        meta_path, part_path = self._paths(upload_id)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (FileNotFoundError, ValueError):
+            raise UploadNotFound(upload_id)
+        return meta, part_path
+
+    def create(self, filename: Optional[str] = None, length: Optional[int] = None) -> str:
+        """
+        새 분할 업로드 세션을 만들고 upload_id 를 반환합니다.
+
+        Raises:
+            UploadTooLarge: 선언한 전체 크기(length)가 제한을 넘는 경우
+        """
+        if length is not None and length > self.max_bytes:
+            raise UploadTooLarge(f"업로드 크기 제한({self.max_bytes} bytes)을 초과했습니다.")
+        self.purge_expired()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        upload_id = uuid.uuid4().hex
+        meta_path, part_path = self._paths(upload_id)
+        part_path.touch()
+        meta_path.write_text(json.dumps({"suffix": safe_suffix(filename), "length": length}))
+        self._hashers[upload_id] = (0, hashlib.sha256())
+        return upload_id
+
+    def status(self, upload_id: str) -> Dict[str, Optional[int]]:
+        """현재 받은 위치(offset)와 선언된 전체 크기(length)"""
+        meta, part_path = self._meta(upload_id)
+        return {"offset": part_path.stat().st_size, "length": meta.get("length")}
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        offset 위치부터 조각을 이어 붙이고 새 위치를 반환합니다.
+
+        조각 도중 연결이 끊기면 받은 만큼은 남겨 두므로, 클라이언트는 status 로 위치를 확인해 이어서 보내면 됩니다.
+
+        Raises:
+            UploadNotFound: 세션이 없는 경우
+            UploadOffsetMismatch: offset 이 현재 위치와 다른 경우
+            UploadTooLarge: 제한(또는 선언한 전체 크기)을 넘는 경우 (이번 조각은 버림)
+        """
+        meta, part_path = self._meta(upload_id)
+        lock = self._locks.setdefault(upload_id, asyncio.Lock())
+        async with lock:
+            current = part_path.stat().st_size
+            if offset != current:
+                raise UploadOffsetMismatch(current)
+
+            limit = min(self.max_bytes, meta["length"] if meta.get("length") is not None else self.max_bytes)
+            hashed_offset, hasher = self._hashers.pop(upload_id, (None, None))
+            if hashed_offset != current:
+                hasher = None  # 재시작 등으로 중간 상태가 없으면 완료 시 다시 계산
+            try:
+                with open(part_path, "ab") as f:
+                    await _write_chunks(f, chunks, limit - current, hasher or _NullHash())
+            except UploadTooLarge:
+                os.truncate(part_path, current)
+                raise
+
+            # 중간에 끊긴 경우엔 해시 상태를 버리고(위에서 pop) 완료 시 파일에서 다시 계산
+            position = part_path.stat().st_size
+            self._paths(upload_id)[0].touch()  # 만료 시각 연장
+            if hasher is not None:
+                self._hashers[upload_id] = (position, hasher)
+            return position
+
+    async def complete(self, upload_id: str) -> SpooledUpload:
+        """
+        업로드를 마치고 받은 파일을 SpooledUpload 로 넘깁니다 (세션은 삭제, 파일 정리는 호출한 쪽 책임).
+
+        Raises:
+            UploadNotFound: 세션이 없는 경우
+            UploadOffsetMismatch: 선언한 전체 크기만큼 받지 못한 경우
+        """
+        meta, part_path = self._meta(upload_id)
+        async with self._locks.setdefault(upload_id, asyncio.Lock()):
+            size = part_path.stat().st_size
+            if meta.get("length") is not None and size != meta["length"]:
+                raise UploadOffsetMismatch(size)
+
+            hashed_offset, hasher = self._hashers.pop(upload_id, (None, None))
+            if hashed_offset == size:
+                sha256 = hasher.hexdigest()
+            else:
+                sha256 = await run_blocking("uploads", hash_file, part_path)
+
+            final_path = part_path.with_suffix(meta.get("suffix") or ".bin")
+            part_path.rename(final_path)
+            self._paths(upload_id)[0].unlink(missing_ok=True)
+        self._locks.pop(upload_id, None)
+        return SpooledUpload(str(final_path), size, sha256)
+
+    def delete(self, upload_id: str) -> None:
+        """세션과 받은 조각을 삭제합니다."""
+        meta_path, part_path = self._paths(upload_id)
+        if not meta_path.exists():
+            raise UploadNotFound(upload_id)
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        self._hashers.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
+
+    def purge_expired(self, force: bool = False) -> int:
+        """
+        ttl 이 지난 세션과 남은 임시 파일을 지웁니다 (최소 간격 안에 다시 부르면 건너뜀).
+
+        Returns:
+            지운 파일 수
+        """
+        now = time.time()
+        if not force and now - self._last_purge < _PURGE_INTERVAL:
+            return 0
+        self._last_purge = now
+        if not self.directory.exists():
+            return 0
+
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                if now - path.stat().st_mtime > self.ttl:
+                    path.unlink()
+                    self._hashers.pop(path.stem, None)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        if removed:
+            logger.info("오래된 업로드 파일 %d개 삭제", removed)
+        return removed
+
+
+class _NullHash:
+    def update(self, data: bytes) -> None:
+        pass
+
+
+def hash_file(path: Path) -> str:
+    """파일의 SHA-256 (블로킹, 청크 단위로 읽음)"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# 전역 분할 업로드 세션 저장소
+upload_sessions = UploadSessions()